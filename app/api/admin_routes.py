@@ -4,15 +4,18 @@
 import logging
 logger = logging.getLogger(__name__)
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from collections import defaultdict
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 import uuid
 from datetime import datetime
 
+from ..core.jobs import serialize_job
 from ..core.models import (
     User,
     Rank,
@@ -27,11 +30,26 @@ from ..core.models import (
     GuildRequest,
     AICommander,
     Preference,
-    get_db,
+    get_async_db,
+    get_async_primary_db,
     create_tables,
 )
 from .routes import get_current_user, verify_token
-from .utils import has_super_admin_access
+from .utils import (
+    PageParams,
+    create_guild_from_template,
+    delete_guild_memberships,
+    guild_deletion_status,
+    get_effective_permissions,
+    has_super_admin_access,
+    load_categories,
+    load_objectives,
+    objective_query,
+    publish_event,
+    publish_objective_event,
+    serialize_objective_summary,
+    start_guild_deletion,
+)
 
 router = APIRouter()
 security = HTTPBearer()
@@ -118,69 +136,34 @@ class ObjectiveCategoryUpdate(BaseModel):
     description: Optional[str] = None
 
 # RBAC Helper Functions
-def check_admin_access(user: User, db: Session) -> bool:
-    """Check if user has admin access for their guild from both rank and user_access table"""
-    # Check rank-based admin access
-    rank_has_admin = False
-    if user.rank:
-        rank = db.query(Rank).filter(Rank.id == user.rank).first()
-        if rank:
-            admin_actions = ["manage_users", "manage_ranks", "manage_objectives", "manage_tasks", "manage_squads", "manage_guilds", "view_guilds"]
-            rank_has_admin = any(action in rank.access_levels for action in admin_actions)
-
-    # Check user_access table for admin permissions
-    user_access_actions = set()
-    user_access_levels = db.query(UserAccess).filter(UserAccess.user_id == user.id).all()
-    for ua in user_access_levels:
-        access_level = db.query(AccessLevel).filter(AccessLevel.id == ua.access_level_id).first()
-        if access_level:
-            user_access_actions.update(access_level.user_actions)
-
-    user_has_admin = any(action in user_access_actions for action in ["manage_users", "manage_ranks", "manage_objectives", "manage_tasks", "manage_squads", "manage_guilds", "view_guilds"])
-
-    # User has admin access if either rank OR user_access grants admin permissions
-    return rank_has_admin or user_has_admin
-
-def check_access_level(user: User, required_actions: List[str], db: Session) -> bool:
-    """Check if user has required access levels from both rank and user_access table"""
-    user_access_levels = db.query(UserAccess).filter(UserAccess.user_id == user.id).all()
-
-    if has_super_admin_access(user, db, user_access_levels):
-        return True
-
-    # Check rank-based access levels
-    rank_has_access = False
-    if user.rank:
-        rank = db.query(Rank).filter(Rank.id == user.rank).first()
-        if rank:
-            rank_has_access = all(action in rank.access_levels for action in required_actions)
+ADMIN_ACTIONS = ["manage_users", "manage_ranks", "manage_objectives", "manage_tasks", "manage_squads", "manage_guilds", "view_guilds"]
 
-    # Check user_access table for additional permissions
-    user_access_actions = set()
-    for ua in user_access_levels:
-        access_level = db.query(AccessLevel).filter(AccessLevel.id == ua.access_level_id).first()
-        if access_level:
-            user_access_actions.update(access_level.user_actions)
-
-    user_has_access = all(action in user_access_actions for action in required_actions)
+async def check_admin_access(user: User, db: AsyncSession) -> bool:
+    """Check if user has admin access for their guild from both rank and user_access table"""
+    return (await get_effective_permissions(user, db)).grants_any(ADMIN_ACTIONS)
 
-    # User has access if either rank OR user_access grants the required actions
-    return rank_has_access or user_has_access
+async def check_access_level(user: User, required_actions: List[str], db: AsyncSession) -> bool:
+    """Check if user has required access levels from both rank and user_access table"""
+    return (await get_effective_permissions(user, db)).allows_all(required_actions)
 
 
-def require_admin_access(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def require_admin_access(user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     """Dependency to require admin access"""
-    if not check_admin_access(user, db):
+    if not await check_admin_access(user, db):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
         )
     return user
 
-def require_access_level(required_actions: List[str]):
-    """Dependency factory for specific access levels"""
-    def dependency(user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-        if not check_access_level(user, required_actions, db):
+def require_access_level(required_actions: List[str], get_db=get_async_db):
+    """Dependency factory for specific access levels
+
+    Pass the route's own session dependency as ``get_db`` when it is not
+    ``get_async_db``, so the check and the route share one session.
+    """
+    async def dependency(user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+        if not await check_access_level(user, required_actions, db):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied. Required actions: {', '.join(required_actions)}"
@@ -191,15 +174,17 @@ def require_access_level(required_actions: List[str]):
 # User Management Endpoints
 @router.get("/users")
 async def get_users(
+    response: Response,
     guild_id: str = Query(..., description="Guild ID for filtering"),
     preference_ids: Optional[List[str]] = Query(None, description="Filter by preference IDs"),
+    page: PageParams = Depends(),
     current_user: User = Depends(require_access_level(["view_users"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all users for a guild (admin only)."""
+    """Get a page of users for a guild (admin only)."""
     try:
         # Verify user belongs to the guild unless super_admin
-        if str(current_user.guild_id) != guild_id and not has_super_admin_access(current_user, db):
+        if str(current_user.guild_id) != guild_id and not await has_super_admin_access(current_user, db):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied: User does not belong to this guild"
@@ -207,32 +192,26 @@ async def get_users(
 
         guild_uuid = uuid.UUID(guild_id)
 
-        approved_requests = db.query(GuildRequest).filter(
-            GuildRequest.guild_id == guild_uuid,
-            GuildRequest.status == "approved"
-        ).all()
-
-        user_ids = [req.user_id for req in approved_requests]
-        if not user_ids:
-            return []
-
         try:
             preference_uuid_filter = {uuid.UUID(pref_id) for pref_id in preference_ids} if preference_ids else set()
         except ValueError:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid preference ID format")
 
-        users = (
-            db.query(User)
-            .options(joinedload(User.preferences))
-            .filter(User.id.in_(user_ids))
-            .all()
+        approved_user_ids = select(GuildRequest.user_id).where(
+            GuildRequest.guild_id == guild_uuid,
+            GuildRequest.status == "approved"
+        )
+        query = (
+            select(User)
+            .options(selectinload(User.preferences))
+            .where(User.id.in_(approved_user_ids))
         )
 
-        if preference_uuid_filter:
-            users = [
-                user for user in users
-                if preference_uuid_filter.issubset({pref.id for pref in user.preferences})
-            ]
+        # Users must hold every requested preference
+        for preference_uuid in preference_uuid_filter:
+            query = query.where(User.preferences.any(Preference.id == preference_uuid))
+
+        users = page.finish((await db.scalars(page.apply(query, User.id))).all(), response)
 
         if not users:
             return []
@@ -240,11 +219,12 @@ async def get_users(
         user_uuid_list = [user.id for user in users]
 
         access_rows = (
-            db.query(UserAccess, AccessLevel)
-            .join(AccessLevel, AccessLevel.id == UserAccess.access_level_id)
-            .filter(UserAccess.user_id.in_(user_uuid_list))
-            .all()
-        )
+            await db.execute(
+                select(UserAccess, AccessLevel)
+                .join(AccessLevel, AccessLevel.id == UserAccess.access_level_id)
+                .where(UserAccess.user_id.in_(user_uuid_list))
+            )
+        ).all()
 
         access_map: Dict[str, List[Dict[str, str]]] = defaultdict(list)
         for user_access, access_level in access_rows:
@@ -304,12 +284,16 @@ async def update_user_guild_state(
     user_id: str,
     user_data: UserGuildUpdate,
     current_user: User = Depends(require_access_level(["manage_users"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update guild-scoped attributes for a user (admin only)."""
     try:
         user_uuid = uuid.UUID(user_id)
-        user = db.query(User).filter(User.id == user_uuid).first()
+        user = await db.scalar(
+            select(User)
+            .options(selectinload(User.preferences))
+            .where(User.id == user_uuid)
+        )
 
         if not user:
             raise HTTPException(
@@ -327,7 +311,7 @@ async def update_user_guild_state(
                 detail="Invalid guild context for user"
             )
 
-        if str(current_user.guild_id) != target_guild_id and not has_super_admin_access(current_user, db):
+        if str(current_user.guild_id) != target_guild_id and not await has_super_admin_access(current_user, db):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied: User does not belong to your guild"
@@ -342,7 +326,7 @@ async def update_user_guild_state(
                 except ValueError:
                     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid rank ID format")
 
-                rank = db.query(Rank).filter(Rank.id == rank_uuid).first()
+                rank = await db.scalar(select(Rank).where(Rank.id == rank_uuid))
                 if not rank or str(rank.guild_id) != target_guild_id:
                     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Rank does not belong to this guild")
                 user.rank = rank_uuid
@@ -356,7 +340,7 @@ async def update_user_guild_state(
                 except ValueError:
                     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid squad ID format")
 
-                squad = db.query(Squad).filter(Squad.id == squad_uuid).first()
+                squad = await db.scalar(select(Squad).where(Squad.id == squad_uuid))
                 if not squad or str(squad.guild_id) != target_guild_id:
                     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Squad does not belong to this guild")
                 user.squad_id = squad_uuid
@@ -369,20 +353,21 @@ async def update_user_guild_state(
                 except ValueError:
                     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid access level ID format")
 
-                access_level = db.query(AccessLevel).filter(AccessLevel.id == access_uuid).first()
+                access_level = await db.scalar(select(AccessLevel).where(AccessLevel.id == access_uuid))
                 if not access_level or str(access_level.guild_id) != target_guild_id:
                     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Access level does not belong to this guild")
                 desired_access_ids.append(access_uuid)
 
             existing_access_entries = (
-                db.query(UserAccess)
-                .join(AccessLevel, AccessLevel.id == UserAccess.access_level_id)
-                .filter(
-                    UserAccess.user_id == user_uuid,
-                    AccessLevel.guild_id == target_guild_uuid,
+                await db.scalars(
+                    select(UserAccess)
+                    .join(AccessLevel, AccessLevel.id == UserAccess.access_level_id)
+                    .where(
+                        UserAccess.user_id == user_uuid,
+                        AccessLevel.guild_id == target_guild_uuid,
+                    )
                 )
-                .all()
-            )
+            ).all()
             existing_ids = {entry.access_level_id for entry in existing_access_entries}
             desired_set = set(desired_access_ids)
 
@@ -392,24 +377,23 @@ async def update_user_guild_state(
             for access_uuid in to_add:
                 db.add(UserAccess(id=uuid.uuid4(), user_id=user_uuid, access_level_id=access_uuid))
 
-            if to_remove:
-                db.query(UserAccess).filter(
-                    UserAccess.user_id == user_uuid,
-                    UserAccess.access_level_id.in_(list(to_remove))
-                ).delete(synchronize_session=False)
+            # Delete through the session so the permission version of the guild is bumped
+            for entry in existing_access_entries:
+                if entry.access_level_id in to_remove:
+                    await db.delete(entry)
 
-        db.commit()
-        db.refresh(user)
+        await db.commit()
 
         access_levels = (
-            db.query(UserAccess, AccessLevel)
-            .join(AccessLevel, AccessLevel.id == UserAccess.access_level_id)
-            .filter(
-                UserAccess.user_id == user_uuid,
-                AccessLevel.guild_id == target_guild_uuid,
+            await db.execute(
+                select(UserAccess, AccessLevel)
+                .join(AccessLevel, AccessLevel.id == UserAccess.access_level_id)
+                .where(
+                    UserAccess.user_id == user_uuid,
+                    AccessLevel.guild_id == target_guild_uuid,
+                )
             )
-            .all()
-        )
+        ).all()
 
         preferences = [
             {
@@ -448,7 +432,7 @@ async def update_user_guild_state(
     except HTTPException:
         raise
     except Exception:
-        db.rollback()
+        await db.rollback()
         logger.exception("Admin API: unable to update user")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -458,11 +442,13 @@ async def update_user_guild_state(
 # Rank Management Endpoints
 @router.get("/ranks")
 async def get_ranks(
+    response: Response,
     guild_id: str = Query(..., description="Guild ID for filtering"),
+    page: PageParams = Depends(),
     current_user: User = Depends(require_access_level(["view_ranks"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all ranks for a guild"""
+    """Get a page of ranks for a guild"""
     try:
         if str(current_user.guild_id) != guild_id:
             raise HTTPException(
@@ -470,7 +456,8 @@ async def get_ranks(
                 detail="Access denied: User does not belong to this guild"
             )
 
-        ranks = db.query(Rank).filter(Rank.guild_id == uuid.UUID(guild_id)).all()
+        query = page.apply(select(Rank).where(Rank.guild_id == uuid.UUID(guild_id)), Rank.id)
+        ranks = page.finish((await db.scalars(query)).all(), response)
 
         return [
             {
@@ -495,7 +482,7 @@ async def get_ranks(
 async def create_rank(
     rank_data: RankCreate,
     current_user: User = Depends(require_access_level(["manage_ranks"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new rank (admin only)"""
     try:
@@ -515,7 +502,7 @@ async def create_rank(
         )
 
         db.add(new_rank)
-        db.commit()
+        await db.commit()
 
         return {
             "message": f"Rank '{rank_data.name}' created successfully",
@@ -524,7 +511,7 @@ async def create_rank(
     except HTTPException:
         raise
     except Exception:
-        db.rollback()
+        await db.rollback()
         logger.exception("Admin API: unable to create rank")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -536,12 +523,12 @@ async def update_rank(
     rank_id: str,
     rank_data: RankUpdate,
     current_user: User = Depends(require_access_level(["manage_ranks"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a rank (admin only)"""
     try:
         rank_uuid = uuid.UUID(rank_id)
-        rank = db.query(Rank).filter(Rank.id == rank_uuid).first()
+        rank = await db.scalar(select(Rank).where(Rank.id == rank_uuid))
 
         if not rank:
             raise HTTPException(
@@ -565,7 +552,7 @@ async def update_rank(
             rank.access_levels = rank_data.access_levels
         # Note: hierarchy_level is not updatable for existing ranks to maintain data integrity
 
-        db.commit()
+        await db.commit()
 
         return {
             "message": "Rank updated successfully",
@@ -574,7 +561,7 @@ async def update_rank(
     except HTTPException:
         raise
     except Exception:
-        db.rollback()
+        await db.rollback()
         logger.exception("Admin API: unable to update rank")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -585,12 +572,12 @@ async def update_rank(
 async def delete_rank(
     rank_id: str,
     current_user: User = Depends(require_access_level(["manage_ranks"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a rank (admin only)"""
     try:
         rank_uuid = uuid.UUID(rank_id)
-        rank = db.query(Rank).filter(Rank.id == rank_uuid).first()
+        rank = await db.scalar(select(Rank).where(Rank.id == rank_uuid))
 
         if not rank:
             raise HTTPException(
@@ -606,7 +593,7 @@ async def delete_rank(
             )
 
         # Check if rank is assigned to any users
-        users_with_rank = db.query(User).filter(User.rank == rank_uuid).count()
+        users_with_rank = await db.scalar(select(func.count()).select_from(User).where(User.rank == rank_uuid))
         if users_with_rank > 0:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -621,11 +608,11 @@ async def delete_rank(
             SET allowed_ranks = array_remove(allowed_ranks, :rank_id)
             WHERE guild_id = :guild_id AND :rank_id = ANY(allowed_ranks)
         """)
-        db.execute(cleanup_sql, {"rank_id": rank_uuid, "guild_id": rank.guild_id})
+        await db.execute(cleanup_sql, {"rank_id": rank_uuid, "guild_id": rank.guild_id})
 
         # Delete the rank
-        db.delete(rank)
-        db.commit()
+        await db.delete(rank)
+        await db.commit()
 
         return {
             "message": "Rank deleted successfully"
@@ -633,7 +620,7 @@ async def delete_rank(
     except HTTPException:
         raise
     except Exception:
-        db.rollback()
+        await db.rollback()
         logger.exception("Admin API: unable to delete rank")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -645,7 +632,7 @@ async def delete_rank(
 async def get_objectives(
     guild_id: str = Query(..., description="Guild ID for filtering"),
     current_user: User = Depends(require_access_level(["view_objectives"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all objectives for a guild"""
     try:
@@ -655,28 +642,11 @@ async def get_objectives(
                 detail="Access denied: User does not belong to this guild"
             )
 
-        objectives = db.query(Objective).filter(Objective.guild_id == uuid.UUID(guild_id)).all()
-
-        # Get all existing ranks for this guild for name resolution and sanitization
-        existing_ranks = db.query(Rank).filter(Rank.guild_id == uuid.UUID(guild_id)).all()
-        existing_rank_ids = {str(rank.id) for rank in existing_ranks}
-        rank_id_to_name = {str(rank.id): rank.name for rank in existing_ranks}
+        objectives, rank_names = await load_objectives(
+            db, objective_query(Objective.guild_id == uuid.UUID(guild_id))
+        )
 
-        return [
-            {
-                "id": str(obj.id),
-                "name": obj.name,
-                "description": obj.description,
-                "categories": obj.categories,
-                "priority": obj.priority,
-                "progress": obj.progress,
-                "allowed_ranks": [rank_id_to_name.get(rank_id, rank_id) for rank_id in obj.allowed_ranks if rank_id in existing_rank_ids],
-                "allowed_rank_ids": [rank_id for rank_id in obj.allowed_ranks if rank_id in existing_rank_ids],
-                "squad_id": str(obj.squad_id) if obj.squad_id else None,
-                "lead_id": str(obj.lead_id) if obj.lead_id else None
-            }
-            for obj in objectives
-        ]
+        return [serialize_objective_summary(obj, rank_names) for obj in objectives]
     except HTTPException:
         raise
     except Exception:
@@ -690,7 +660,7 @@ async def get_objectives(
 async def create_objective(
     objective_data: ObjectiveCreate,
     current_user: User = Depends(require_access_level(["manage_objectives"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new objective (admin only)"""
     try:
@@ -701,19 +671,21 @@ async def create_objective(
             )
 
         obj_id = uuid.uuid4()
+        guild_uuid = uuid.UUID(objective_data.guild_id)
         new_objective = Objective(
             id=obj_id,
-            guild_id=uuid.UUID(objective_data.guild_id),
+            guild_id=guild_uuid,
             name=objective_data.name,
             description=objective_data.description,
-            categories=objective_data.categories,
+            categories=await load_categories(db, guild_uuid, objective_data.categories),
             priority=objective_data.priority,
             allowed_ranks=objective_data.allowed_ranks,
             squad_id=uuid.UUID(objective_data.squad_id) if objective_data.squad_id else None
         )
 
         db.add(new_objective)
-        db.commit()
+        publish_objective_event(db, "objective.created", new_objective)
+        await db.commit()
 
         return {
             "message": f"Objective '{objective_data.name}' created successfully",
@@ -722,7 +694,7 @@ async def create_objective(
     except HTTPException:
         raise
     except Exception:
-        db.rollback()
+        await db.rollback()
         logger.exception("Admin API: unable to create objective")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -734,7 +706,7 @@ async def create_objective(
 async def get_tasks(
     guild_id: str = Query(..., description="Guild ID for filtering"),
     current_user: User = Depends(require_access_level(["view_tasks"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all tasks for a guild"""
     try:
@@ -744,7 +716,7 @@ async def get_tasks(
                 detail="Access denied: User does not belong to this guild"
             )
 
-        tasks = db.query(Task).filter(Task.guild_id == uuid.UUID(guild_id)).all()
+        tasks = (await db.scalars(select(Task).where(Task.guild_id == uuid.UUID(guild_id)))).all()
 
         return [
             {
@@ -776,7 +748,7 @@ async def get_tasks(
 async def create_task(
     task_data: TaskCreate,
     current_user: User = Depends(require_access_level(["manage_tasks"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new task (admin only)"""
     try:
@@ -800,7 +772,7 @@ async def create_task(
         )
 
         db.add(new_task)
-        db.commit()
+        await db.commit()
 
         return {
             "message": f"Task '{task_data.name}' created successfully",
@@ -809,7 +781,7 @@ async def create_task(
     except HTTPException:
         raise
     except Exception:
-        db.rollback()
+        await db.rollback()
         logger.exception("Admin API: unable to create task")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -821,7 +793,7 @@ async def create_task(
 async def get_squads(
     guild_id: str = Query(..., description="Guild ID for filtering"),
     current_user: User = Depends(require_access_level(["view_squads"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all squads for a guild"""
     try:
@@ -831,7 +803,7 @@ async def get_squads(
                 detail="Access denied: User does not belong to this guild"
             )
 
-        squads = db.query(Squad).filter(Squad.guild_id == uuid.UUID(guild_id)).all()
+        squads = (await db.scalars(select(Squad).where(Squad.guild_id == uuid.UUID(guild_id)))).all()
 
         return [
             {
@@ -854,7 +826,7 @@ async def get_squads(
 async def create_squad(
     squad_data: SquadCreate,
     current_user: User = Depends(require_access_level(["manage_squads"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new squad (admin only)"""
     try:
@@ -873,7 +845,7 @@ async def create_squad(
         )
 
         db.add(new_squad)
-        db.commit()
+        await db.commit()
 
         return {
             "message": f"Squad '{squad_data.name}' created successfully",
@@ -882,7 +854,7 @@ async def create_squad(
     except HTTPException:
         raise
     except Exception:
-        db.rollback()
+        await db.rollback()
         logger.exception("Admin API: unable to create squad")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -894,7 +866,7 @@ async def create_squad(
 async def get_access_levels(
     guild_id: str = Query(..., description="Guild ID for filtering"),
     current_user: User = Depends(require_access_level(["manage_rbac"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all access levels for a guild"""
     try:
@@ -904,7 +876,7 @@ async def get_access_levels(
                 detail="Access denied: User does not belong to this guild"
             )
 
-        access_levels = db.query(AccessLevel).filter(AccessLevel.guild_id == uuid.UUID(guild_id)).all()
+        access_levels = (await db.scalars(select(AccessLevel).where(AccessLevel.guild_id == uuid.UUID(guild_id)))).all()
 
         return [
             {
@@ -927,7 +899,7 @@ async def get_access_levels(
 async def create_access_level(
     access_level_data: AccessLevelCreate,
     current_user: User = Depends(require_access_level(["manage_rbac"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new access level (admin only)"""
     try:
@@ -945,7 +917,7 @@ async def create_access_level(
         )
 
         db.add(new_access_level)
-        db.commit()
+        await db.commit()
 
         return {
             "message": f"Access level '{access_level_data.name}' created successfully",
@@ -954,7 +926,7 @@ async def create_access_level(
     except HTTPException:
         raise
     except Exception:
-        db.rollback()
+        await db.rollback()
         logger.exception("Admin API: unable to create access level")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -966,12 +938,12 @@ async def update_access_level(
     access_level_id: str,
     access_level_data: AccessLevelUpdate,
     current_user: User = Depends(require_access_level(["manage_rbac"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update an access level (admin only)"""
     try:
         access_level_uuid = uuid.UUID(access_level_id)
-        access_level = db.query(AccessLevel).filter(AccessLevel.id == access_level_uuid).first()
+        access_level = await db.scalar(select(AccessLevel).where(AccessLevel.id == access_level_uuid))
 
         if not access_level:
             raise HTTPException(
@@ -1006,7 +978,7 @@ async def update_access_level(
         if access_level_data.user_actions is not None:
             access_level.user_actions = access_level_data.user_actions
 
-        db.commit()
+        await db.commit()
 
         return {
             "message": "Access level updated successfully",
@@ -1015,7 +987,7 @@ async def update_access_level(
     except HTTPException:
         raise
     except Exception:
-        db.rollback()
+        await db.rollback()
         logger.exception("Admin API: unable to update access level")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1026,12 +998,12 @@ async def update_access_level(
 async def delete_access_level(
     access_level_id: str,
     current_user: User = Depends(require_access_level(["manage_rbac"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete an access level (admin only)"""
     try:
         access_level_uuid = uuid.UUID(access_level_id)
-        access_level = db.query(AccessLevel).filter(AccessLevel.id == access_level_uuid).first()
+        access_level = await db.scalar(select(AccessLevel).where(AccessLevel.id == access_level_uuid))
 
         if not access_level:
             raise HTTPException(
@@ -1046,8 +1018,8 @@ async def delete_access_level(
                 detail="Access denied: Access level does not belong to your guild"
             )
 
-        db.delete(access_level)
-        db.commit()
+        await db.delete(access_level)
+        await db.commit()
 
         return {
             "message": "Access level deleted successfully"
@@ -1055,7 +1027,7 @@ async def delete_access_level(
     except HTTPException:
         raise
     except Exception:
-        db.rollback()
+        await db.rollback()
         logger.exception("Admin API: unable to delete access level")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1067,7 +1039,7 @@ async def delete_access_level(
 async def get_objective_categories(
     guild_id: str = Query(..., description="Guild ID for filtering"),
     current_user: User = Depends(require_access_level(["view_categories"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all objective categories for a guild"""
     try:
@@ -1077,7 +1049,7 @@ async def get_objective_categories(
                 detail="Access denied: User does not belong to this guild"
             )
 
-        categories = db.query(ObjectiveCategory).filter(ObjectiveCategory.guild_id == uuid.UUID(guild_id)).all()
+        categories = (await db.scalars(select(ObjectiveCategory).where(ObjectiveCategory.guild_id == uuid.UUID(guild_id)))).all()
 
         return [
             {
@@ -1100,7 +1072,7 @@ async def get_objective_categories(
 async def create_objective_category(
     category_data: ObjectiveCategoryCreate,
     current_user: User = Depends(require_access_level(["manage_categories"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new objective category (admin only)"""
     try:
@@ -1119,7 +1091,7 @@ async def create_objective_category(
         )
 
         db.add(new_category)
-        db.commit()
+        await db.commit()
 
         return {
             "message": f"Objective category '{category_data.name}' created successfully",
@@ -1128,7 +1100,7 @@ async def create_objective_category(
     except HTTPException:
         raise
     except Exception:
-        db.rollback()
+        await db.rollback()
         logger.exception("Admin API: unable to create objective category")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1140,7 +1112,7 @@ async def create_objective_category(
 async def create_guild(
     guild_data: dict,
     current_user: User = Depends(require_access_level(["manage_guilds"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new guild (admin only)"""
     try:
@@ -1155,13 +1127,13 @@ async def create_guild(
         user_uuid = current_user.id
 
         # Get user's personal guild (created by user)
-        personal_guild = db.query(Guild).filter(Guild.creator_id == user_uuid).first()
+        personal_guild = await db.scalar(select(Guild).where(Guild.creator_id == user_uuid))
 
         # Get guilds where user has approved guild requests
-        approved_requests = db.query(GuildRequest).filter(
+        approved_requests = (await db.scalars(select(GuildRequest).where(
             GuildRequest.user_id == user_uuid,
             GuildRequest.status == "approved"
-        ).all()
+        ))).all()
 
         guild_ids = set()
         if personal_guild:
@@ -1178,32 +1150,22 @@ async def create_guild(
                 detail=f"Maximum guild limit of {current_user.max_guilds} reached. You currently belong to {user_guild_count} guild(s)."
             )
 
-        # Create guild
+        # Create guild with the template's access levels, ranks and AI commander;
+        # the creator is granted super_admin and an approved membership
         guild_id = uuid.uuid4()
-        new_guild = Guild(
-            id=guild_id,
-            name=name,
-            creator_id=current_user.id,
-            member_limit=2,  # Free tier default
-            billing_tier="free",
-            is_solo=False,
-            is_active=True,
-            is_deletable=True,
-            type="game_star_citizen"
-        )
-
-        db.add(new_guild)
-
-        # Create approved GuildRequest for creator
-        creator_request = GuildRequest(
-            id=uuid.uuid4(),
-            user_id=current_user.id,
-            guild_id=guild_id,
-            status="approved"
-        )
-        db.add(creator_request)
-
-        db.commit()
+        await create_guild_from_template(db, {
+            "id": guild_id,
+            "name": name,
+            "creator_id": current_user.id,
+            "member_limit": 2,  # Free tier default
+            "billing_tier": "free",
+            "is_solo": False,
+            "is_active": True,
+            "is_deletable": True,
+            "type": "game_star_citizen"
+        }, creator_id=current_user.id)
+
+        await db.commit()
 
         return {
             "message": f"Guild '{name}' created successfully",
@@ -1212,7 +1174,7 @@ async def create_guild(
     except HTTPException:
         raise
     except Exception:
-        db.rollback()
+        await db.rollback()
         logger.exception("Admin API: unable to create guild")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1222,18 +1184,18 @@ async def create_guild(
 @router.get("/guilds")
 async def get_guilds(
     current_user: User = Depends(require_access_level(["manage_guilds"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user's guilds (admin only with manage_guilds permission)"""
     try:
         # Get user's personal guild
-        personal_guild = db.query(Guild).filter(Guild.creator_id == current_user.id).first()
+        personal_guild = await db.scalar(select(Guild).where(Guild.creator_id == current_user.id))
 
         # Get guilds where user has approved guild requests
-        approved_requests = db.query(GuildRequest).filter(
+        approved_requests = (await db.scalars(select(GuildRequest).where(
             GuildRequest.user_id == current_user.id,
             GuildRequest.status == "approved"
-        ).all()
+        ))).all()
 
         guild_ids = set()
         if personal_guild:
@@ -1243,7 +1205,7 @@ async def get_guilds(
             guild_ids.add(request.guild_id)
 
         # Get all guilds user has access to
-        guilds = db.query(Guild).filter(Guild.id.in_(guild_ids)).all()
+        guilds = (await db.scalars(select(Guild).where(Guild.id.in_(guild_ids), Guild.is_active == True))).all()
 
         return [
             {
@@ -1272,12 +1234,12 @@ async def kick_user(
     user_id: str,
     kick_data: dict,
     current_user: User = Depends(require_access_level(["manage_users"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Kick a user from their current guild (admin only)"""
     try:
         user_uuid = uuid.UUID(user_id)
-        user_to_kick = db.query(User).filter(User.id == user_uuid).first()
+        user_to_kick = await db.scalar(select(User).where(User.id == user_uuid))
 
         if not user_to_kick:
             raise HTTPException(
@@ -1293,10 +1255,10 @@ async def kick_user(
             )
 
         # Find user's personal guild
-        personal_guild = db.query(Guild).filter(
+        personal_guild = await db.scalar(select(Guild).where(
             Guild.creator_id == user_to_kick.id,
             Guild.is_solo == True
-        ).first()
+        ))
 
         if not personal_guild:
             raise HTTPException(
@@ -1304,10 +1266,34 @@ async def kick_user(
                 detail="User's personal guild not found"
             )
 
-        # Switch kicked user to their personal guild
-        user_to_kick.current_guild_id = str(personal_guild.id)
+        # Admins can only kick members of the guild they are working in
+        admin_guild_id = uuid.UUID(str(current_user.current_guild_id)) if current_user.current_guild_id else None
+        if not admin_guild_id or str(admin_guild_id) == str(personal_guild.id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied: User is not a member of your guild"
+            )
+
+        memberships = (await db.scalars(select(GuildRequest).where(
+            GuildRequest.user_id == user_to_kick.id,
+            GuildRequest.guild_id == admin_guild_id,
+            GuildRequest.status == "approved"
+        ))).all()
+        if not memberships:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied: User is not a member of your guild"
+            )
+
+        # Revoke the membership (member counters follow on flush)
+        for membership in memberships:
+            await db.delete(membership)
 
-        db.commit()
+        # Switch kicked user to their personal guild if they were working in this one
+        if str(user_to_kick.current_guild_id) == str(admin_guild_id):
+            user_to_kick.current_guild_id = str(personal_guild.id)
+
+        await db.commit()
 
         return {
             "message": f"User kicked and switched to personal guild: {personal_guild.name}",
@@ -1319,23 +1305,28 @@ async def kick_user(
     except HTTPException:
         raise
     except Exception:
-        db.rollback()
+        await db.rollback()
         logger.exception("Admin API: unable to kick user")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Unable to kick user"
         )
 
-@router.delete("/guilds/{guild_id}")
+@router.delete("/guilds/{guild_id}", status_code=status.HTTP_202_ACCEPTED)
 async def delete_guild(
     guild_id: str,
     current_user: User = Depends(require_access_level(["manage_guilds"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Delete a guild (admin only, with protection for personal guilds)"""
+    """Delete a guild (admin only, with protection for personal guilds).
+
+    The guild is deactivated immediately and purged by a background job;
+    poll ``GET /guilds/{guild_id}/deletion`` for its status. Repeating the
+    request queues a deletion that failed again.
+    """
     try:
         guild_uuid = uuid.UUID(guild_id)
-        guild = db.query(Guild).filter(Guild.id == guild_uuid).first()
+        guild = await db.scalar(select(Guild).where(Guild.id == guild_uuid))
 
         if not guild:
             raise HTTPException(
@@ -1364,85 +1355,51 @@ async def delete_guild(
                 detail="This guild cannot be deleted"
             )
 
-        # Clean up related data before deleting the guild
-        # Delete guild requests
-        db.query(GuildRequest).filter(GuildRequest.guild_id == guild.id).delete()
-
-        # Delete invites
-        db.query(Invite).filter(Invite.guild_id == guild.id).delete()
-
-        # Delete objectives and related tasks (cascade through relationships)
-        objectives = db.query(Objective).filter(Objective.guild_id == guild.id).all()
-        for objective in objectives:
-            # Delete tasks for this objective
-            db.query(Task).filter(Task.objective_id == objective.id).delete()
-            # Delete the objective
-            db.delete(objective)
-
-        # Delete squads
-        db.query(Squad).filter(Squad.guild_id == guild.id).delete()
-
-        # Delete ranks
-        db.query(Rank).filter(Rank.guild_id == guild.id).delete()
-
-        # Delete access levels
-        db.query(AccessLevel).filter(AccessLevel.guild_id == guild.id).delete()
-
-        # Delete objective categories
-        db.query(ObjectiveCategory).filter(ObjectiveCategory.guild_id == guild.id).delete()
-
-        # Delete AI commander
-        db.query(AICommander).filter(AICommander.guild_id == guild.id).delete()
-
-        # Move any users in this guild to their personal guilds
-        # Handle users who have this guild as their current_guild_id
-        users_in_guild = db.query(User).filter(User.current_guild_id == str(guild.id)).all()
-        for user in users_in_guild:
-            # Find user's personal guild
-            personal_guild = db.query(Guild).filter(
-                Guild.creator_id == user.id,
-                Guild.is_solo == True
-            ).first()
-            if personal_guild:
-                user.current_guild_id = str(personal_guild.id)
-
-        # Handle users who have this guild as their personal guild (guild_id)
-        users_with_personal_guild = db.query(User).filter(User.guild_id == guild.id).all()
-        for user in users_with_personal_guild:
-            # Find user's personal guild (should be the same as guild_id, but handle gracefully)
-            personal_guild = db.query(Guild).filter(
-                Guild.creator_id == user.id,
-                Guild.is_solo == True
-            ).first()
-            if personal_guild:
-                user.guild_id = personal_guild.id
-                # Also update current_guild_id if it's pointing to the deleted guild
-                if str(user.current_guild_id) == str(guild.id):
-                    user.current_guild_id = str(personal_guild.id)
-
-        # Finally delete the guild
-        db.delete(guild)
-        db.commit()
-
+        # Hide the guild and queue its purge in one transaction
+        guild.is_active = False
+        deletion = await start_guild_deletion(db, guild.id, current_user.id)
+        await db.commit()
         return {
-            "message": "Guild deleted successfully"
+            "message": "Guild deletion started",
+            "deletion": serialize_job(deletion),
+            "status_url": f"/api/admin/guilds/{guild.id}/deletion"
         }
     except HTTPException:
         raise
     except Exception:
         logger.exception("Admin API: unable to delete guild")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Unable to delete guild"
         )
 
+@router.get("/guilds/{guild_id}/deletion")
+async def get_guild_deletion(
+    guild_id: str,
+    current_user: User = Depends(require_access_level(["manage_guilds"], get_async_primary_db)),
+    db: AsyncSession = Depends(get_async_primary_db)
+):
+    """Status of a guild deletion started by the current user"""
+    try:
+        guild_uuid = uuid.UUID(guild_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid guild ID format")
+
+    deletion = await guild_deletion_status(db, guild_uuid)
+    if not deletion or deletion.created_by != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No deletion found for this guild"
+        )
+    return serialize_job(deletion)
+
 # User Access Management Endpoints
 @router.post("/user_access")
 async def assign_user_access(
     access_data: dict,
     current_user: User = Depends(require_access_level(["manage_users"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Assign access level to user (admin only)"""
     try:
@@ -1456,7 +1413,7 @@ async def assign_user_access(
             )
 
         # Verify user exists
-        user = db.query(User).filter(User.id == uuid.UUID(user_id)).first()
+        user = await db.scalar(select(User).where(User.id == uuid.UUID(user_id)))
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1464,7 +1421,7 @@ async def assign_user_access(
             )
 
         # Verify access level exists
-        access_level = db.query(AccessLevel).filter(AccessLevel.id == uuid.UUID(access_level_id)).first()
+        access_level = await db.scalar(select(AccessLevel).where(AccessLevel.id == uuid.UUID(access_level_id)))
         if not access_level:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1472,10 +1429,10 @@ async def assign_user_access(
             )
 
         # Check if assignment already exists
-        existing = db.query(UserAccess).filter(
+        existing = await db.scalar(select(UserAccess).where(
             UserAccess.user_id == uuid.UUID(user_id),
             UserAccess.access_level_id == uuid.UUID(access_level_id)
-        ).first()
+        ))
 
         if existing:
             raise HTTPException(
@@ -1490,7 +1447,7 @@ async def assign_user_access(
         )
 
         db.add(user_access)
-        db.commit()
+        await db.commit()
 
         return {
             "message": f"Access level '{access_level.name}' assigned to user '{user.name}' successfully",
@@ -1499,7 +1456,7 @@ async def assign_user_access(
     except HTTPException:
         raise
     except Exception:
-        db.rollback()
+        await db.rollback()
         logger.exception("Admin API: unable to assign access level to user")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1510,14 +1467,14 @@ async def assign_user_access(
 async def get_user_access_levels(
     user_id: str,
     current_user: User = Depends(require_access_level(["view_users"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all access levels for a user"""
     try:
         user_uuid = uuid.UUID(user_id)
 
         # Verify user exists
-        user = db.query(User).filter(User.id == user_uuid).first()
+        user = await db.scalar(select(User).where(User.id == user_uuid))
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1525,11 +1482,11 @@ async def get_user_access_levels(
             )
 
         # Get user's access levels
-        user_access_levels = db.query(UserAccess).filter(UserAccess.user_id == user_uuid).all()
+        user_access_levels = (await db.scalars(select(UserAccess).where(UserAccess.user_id == user_uuid))).all()
 
         access_levels_data = []
         for ua in user_access_levels:
-            access_level = db.query(AccessLevel).filter(AccessLevel.id == ua.access_level_id).first()
+            access_level = await db.scalar(select(AccessLevel).where(AccessLevel.id == ua.access_level_id))
             if access_level:
                 access_levels_data.append({
                     "id": str(access_level.id),
@@ -1557,7 +1514,7 @@ async def remove_user_access(
     user_id: str,
     access_id: str,
     current_user: User = Depends(require_access_level(["manage_users"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Remove access level from user (admin only)"""
     try:
@@ -1565,10 +1522,10 @@ async def remove_user_access(
         access_uuid = uuid.UUID(access_id)
 
         # Find the user access assignment
-        user_access = db.query(UserAccess).filter(
+        user_access = await db.scalar(select(UserAccess).where(
             UserAccess.user_id == user_uuid,
             UserAccess.access_level_id == access_uuid
-        ).first()
+        ))
 
         if not user_access:
             raise HTTPException(
@@ -1577,7 +1534,7 @@ async def remove_user_access(
             )
 
         # Block super_admin revocation
-        access_level = db.query(AccessLevel).filter(AccessLevel.id == access_uuid).first()
+        access_level = await db.scalar(select(AccessLevel).where(AccessLevel.id == access_uuid))
         if access_level and access_level.name == "super_admin":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -1585,15 +1542,15 @@ async def remove_user_access(
             )
 
         # Get access level name for response
-        access_level = db.query(AccessLevel).filter(AccessLevel.id == access_uuid).first()
+        access_level = await db.scalar(select(AccessLevel).where(AccessLevel.id == access_uuid))
         access_level_name = access_level.name if access_level else "Unknown"
 
         # Get user name for response
-        user = db.query(User).filter(User.id == user_uuid).first()
+        user = await db.scalar(select(User).where(User.id == user_uuid))
         user_name = user.name if user else "Unknown"
 
-        db.delete(user_access)
-        db.commit()
+        await db.delete(user_access)
+        await db.commit()
 
         return {
             "message": f"Access level '{access_level_name}' removed from user '{user_name}' successfully"
@@ -1601,7 +1558,7 @@ async def remove_user_access(
     except HTTPException:
         raise
     except Exception:
-        db.rollback()
+        await db.rollback()
         logger.exception("Admin API: unable to remove access level from user")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1611,11 +1568,13 @@ async def remove_user_access(
 # Guild Request Management Endpoints
 @router.get("/guild_requests")
 async def get_guild_requests(
+    response: Response,
     guild_id: str = Query(..., description="Guild ID for filtering"),
+    page: PageParams = Depends(),
     current_user: User = Depends(require_access_level(["manage_users"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all guild requests for a guild (admin only)"""
+    """Get a page of guild requests for a guild (admin only)"""
     try:
         # Verify user belongs to the guild
         if str(current_user.guild_id) != guild_id:
@@ -1625,16 +1584,17 @@ async def get_guild_requests(
             )
 
         # Get guild requests for this guild
-        guild_requests = db.query(GuildRequest).filter(GuildRequest.guild_id == uuid.UUID(guild_id)).all()
+        query = page.apply(select(GuildRequest).where(GuildRequest.guild_id == uuid.UUID(guild_id)), GuildRequest.id)
+        guild_requests = page.finish((await db.scalars(query)).all(), response)
 
         requests_data = []
         for gr in guild_requests:
             # Get user info
-            user = db.query(User).filter(User.id == gr.user_id).first()
+            user = await db.scalar(select(User).where(User.id == gr.user_id))
             user_name = user.name if user else "Unknown User"
 
             # Get guild info
-            guild = db.query(Guild).filter(Guild.id == gr.guild_id).first()
+            guild = await db.scalar(select(Guild).where(Guild.id == gr.guild_id))
             guild_name = guild.name if guild else "Unknown Guild"
 
             requests_data.append({
@@ -1663,12 +1623,12 @@ async def update_guild_request(
     request_id: str,
     request_data: dict,
     current_user: User = Depends(require_access_level(["manage_users"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Approve or deny a guild request (admin only)"""
     try:
         request_uuid = uuid.UUID(request_id)
-        guild_request = db.query(GuildRequest).filter(GuildRequest.id == request_uuid).first()
+        guild_request = await db.scalar(select(GuildRequest).where(GuildRequest.id == request_uuid))
 
         if not guild_request:
             raise HTTPException(
@@ -1692,7 +1652,7 @@ async def update_guild_request(
 
         # If approving, switch user to the guild
         if new_status == "approved":
-            user = db.query(User).filter(User.id == guild_request.user_id).first()
+            user = await db.scalar(select(User).where(User.id == guild_request.user_id))
             if user:
                 user.current_guild_id = str(guild_request.guild_id)
 
@@ -1702,14 +1662,19 @@ async def update_guild_request(
 
         # If approved, switch user to the guild
         if new_status == "approved":
-            user = db.query(User).filter(User.id == guild_request.user_id).first()
+            user = await db.scalar(select(User).where(User.id == guild_request.user_id))
             if user:
                 user.current_guild_id = str(guild_request.guild_id)
 
-        #logger.debug(f"Approval: guild_request_id={request_id}, approved_count={approved_count}, user_guilds={user_guilds}")
-        logger.debug(f"Approval: guild_request_id={request_id}, approved_count={approved_count if 'approved_count' in locals() else 'N/A'}, user_guilds={user_guilds if 'user_guilds' in locals() else 'N/A'}")
+        logger.debug("Approval: guild_request_id=%s, status=%s", request_id, new_status)
+        if new_status == "approved":
+            publish_event(db, guild_request.guild_id, "guild_request.approved", {
+                "id": str(guild_request.id),
+                "user_id": str(guild_request.user_id),
+                "status": new_status,
+            })
 
-        db.commit()
+        await db.commit()
 
         return {
             "message": f"Guild request {new_status} successfully",
@@ -1719,7 +1684,7 @@ async def update_guild_request(
     except HTTPException:
         raise
     except Exception:
-        db.rollback()
+        await db.rollback()
         logger.exception("Admin API: unable to update guild request")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1729,11 +1694,13 @@ async def update_guild_request(
 # Invite Management Endpoints
 @router.get("/invites")
 async def get_invites(
+    response: Response,
     guild_id: str = Query(..., description="Guild ID for filtering"),
+    page: PageParams = Depends(),
     current_user: User = Depends(require_access_level(["manage_guilds"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all invites for a guild (admin only)"""
+    """Get a page of invites for a guild (admin only)"""
     try:
         # Verify user belongs to the guild
         if str(current_user.guild_id) != guild_id:
@@ -1742,10 +1709,11 @@ async def get_invites(
                 detail="Access denied: User does not belong to this guild"
             )
 
-        invites = db.query(Invite).filter(Invite.guild_id == uuid.UUID(guild_id)).all()
+        query = page.apply(select(Invite).where(Invite.guild_id == uuid.UUID(guild_id)), Invite.id)
+        invites = page.finish((await db.scalars(query)).all(), response)
 
         # Get guild name for display
-        guild = db.query(Guild).filter(Guild.id == uuid.UUID(guild_id)).first()
+        guild = await db.scalar(select(Guild).where(Guild.id == uuid.UUID(guild_id)))
         guild_name = guild.name if guild else "Unknown Guild"
 
         return [
@@ -1773,12 +1741,12 @@ async def get_invites(
 async def delete_invite(
     invite_code: str,
     current_user: User = Depends(require_access_level(["manage_guilds"])),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete an invite (admin only)"""
     try:
         # Find the invite
-        invite = db.query(Invite).filter(Invite.code == invite_code).first()
+        invite = await db.scalar(select(Invite).where(Invite.code == invite_code))
 
         if not invite:
             raise HTTPException(
@@ -1793,8 +1761,8 @@ async def delete_invite(
                 detail="Access denied: User does not belong to this guild"
             )
 
-        db.delete(invite)
-        db.commit()
+        await db.delete(invite)
+        await db.commit()
 
         return {
             "message": "Invite deleted successfully"
@@ -1802,7 +1770,7 @@ async def delete_invite(
     except HTTPException:
         raise
     except Exception:
-        db.rollback()
+        await db.rollback()
         logger.exception("Admin API: unable to delete invite")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
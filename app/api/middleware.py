@@ -2,240 +2,311 @@
 # Confidential - Do Not Distribute Without Permission.
 import logging
 logger = logging.getLogger(__name__)
+import math
 import os
 import re
+import time
 import uuid
 import json
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.requests import Request
-from sqlalchemy.orm import Session
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
-import jwt
 
-from ..core.models import get_db, User, Guild, Invite, GuildRequest
-from .routes import SECRET_KEY, ALGORITHM
+from ..core import metrics, models
+from ..core.log_config import request_id_var
+from ..core.query_recorder import record_queries, warn_on_repeats
+from ..core.models import AsyncSessionLocal, User, Guild, Invite, GuildRequest
+from .routes import get_request_user
 
+# Routes subject to plan limits: (method, compiled path pattern, check name).
+# Anything else is handed straight to the application.
+LIMITED_ROUTES = (
+    ("POST", re.compile(r"/api/guilds$"), "create_guild"),
+    ("POST", re.compile(r"/api/users/[^/]+/join$"), "join_guild"),
+    ("PATCH", re.compile(r"/api/users/[^/]+/join$"), "join_guild"),
+    ("POST", re.compile(r"/api/invites$"), "create_invite"),
+    ("PATCH", re.compile(r"/api/admin/guild_requests/([^/]+)$"), "approve_request"),
+)
+_LIMITED_METHODS = frozenset(method for method, _, _ in LIMITED_ROUTES)
 
+REQUEST_ID_HEADER = "X-Request-ID"
+_REQUEST_ID = re.compile(r"[A-Za-z0-9._-]{1,64}")
 
-class GuildLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
-        self.default_member_limit = int(os.getenv('STAR_CITIZEN_FREE_MEMBERS', '2'))
-        self.default_max_guilds = 3
 
-    async def dispatch(self, request, call_next):
-        logger.debug(f"Middleware: Processing request {request.method} {request.url.path}")
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+    return b"".join(chunks)
+
 
-        should_check = self._should_check_limits(request)
-        body_bytes = None
+def _replay(body: bytes, receive: Receive) -> Receive:
+    """Serve an already-read body to the application, then defer to the client."""
+    sent = False
 
-        if should_check and request.method in ("POST", "PATCH"):
-            logger.debug("Middleware: Capturing request body for downstream reuse")
-            body_bytes = await request.body()
+    async def replay_receive() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
 
-            async def receive():
-                return {"type": "http.request", "body": body_bytes, "more_body": False}
+    return replay_receive
 
-            request = Request(request.scope, receive)
-            request._body = body_bytes
 
-        if should_check:
-            logger.debug(f"Middleware: Request requires limit checking")
-            user = self._get_current_user(request)
+class GuildLimitMiddleware:
+    """Pure ASGI middleware enforcing guild and membership plan limits."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.default_member_limit = int(os.getenv('STAR_CITIZEN_FREE_MEMBERS', '2'))
+        self.default_max_guilds = 3
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] not in _LIMITED_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        match = self._match_route(scope["method"], scope["path"])
+        if match is None:
+            await self.app(scope, receive, send)
+            return
+
+        check, path_match = match
+        logger.debug("Middleware: %s limit check for %s %s", check, scope['method'], scope['path'])
+
+        body = None
+        if check == "join_guild":
+            body = await _read_body(receive)
+            receive = _replay(body, receive)
+
+        # The decoded token and user row end up in scope["state"], where
+        # get_current_user picks them up again.
+        request = Request(scope)
+        async with AsyncSessionLocal() as db:
+            user = await get_request_user(request, db)
             if not user:
-                logger.debug(f"Middleware: No authenticated user found")
-                return await call_next(request)
-
-            logger.debug(f"Middleware: Authenticated user {user.id} for guild {user.guild_id}")
-            limit_exceeded = await self._check_limits(request, user, body_bytes)
-            if limit_exceeded:
-                logger.debug(f"Middleware: Limit exceeded: {limit_exceeded}")
-                return JSONResponse(
-                    status_code=402,
-                    content={"detail": "Payment Required", "message": limit_exceeded}
+                logger.debug("Middleware: No authenticated user found")
+                limit_exceeded = None
+            else:
+                limit_exceeded = await self._check_limits(db, check, path_match, user, body)
+
+        if limit_exceeded:
+            logger.debug("Middleware: Limit exceeded: %s", limit_exceeded)
+            response = JSONResponse(
+                status_code=402,
+                content={"detail": "Payment Required", "message": limit_exceeded}
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    def _match_route(self, method: str, path: str):
+        for route_method, pattern, check in LIMITED_ROUTES:
+            if route_method == method:
+                path_match = pattern.match(path)
+                if path_match:
+                    return check, path_match
+        return None
+
+    async def _check_limits(
+        self,
+        db: AsyncSession,
+        check: str,
+        path_match: "re.Match",
+        user: User,
+        body: Optional[bytes],
+    ) -> Optional[str]:
+        if check in ("create_guild", "create_invite"):
+            guild_count = await db.scalar(select(func.count()).select_from(Guild).where(Guild.creator_id == user.id))
+            logger.debug("Middleware: User has %s guilds, max is %s", guild_count, user.max_guilds)
+            if guild_count >= user.max_guilds:
+                if check == "create_guild":
+                    return f"Maximum guild limit of {user.max_guilds} reached (including personal)"
+                return f"Maximum guild limit of {user.max_guilds} reached"
+
+        elif check == "join_guild":
+            try:
+                invite_code = json.loads(body.decode('utf-8')).get('invite_code')
+            except json.JSONDecodeError as e:
+                logger.error("Middleware: JSON decode error: %s", e)
+                return "Invalid JSON in request body"
+            except Exception as e:
+                logger.error("Middleware: Failed to read request body: %s", e)
+                return "Invalid request body"
+
+            if not invite_code:
+                return "Invalid invite code"
+
+            # Invite, its guild and the guild's member count in one round trip
+            row = (await db.execute(
+                select(Invite.guild_id, Guild.id.label("found_guild_id"), Guild.member_limit, Guild.approved_member_count)
+                .select_from(Invite)
+                .outerjoin(Guild, (Guild.id == Invite.guild_id) & (Guild.is_active == True))
+                .where(Invite.code == invite_code)
+            )).first()
+            if not row:
+                logger.debug("Middleware: Invite code not found")
+                return "Invalid invite code"
+            if row.found_guild_id is None:
+                logger.debug("Middleware: Guild %s not found", row.guild_id)
+                return "Guild not found"
+
+            return self._membership_limit(
+                row.approved_member_count, row.member_limit, user.approved_guild_count, user.max_guilds
+            )
+
+        elif check == "approve_request":
+            try:
+                request_uuid = uuid.UUID(path_match.group(1))
+            except ValueError:
+                return "Invalid request ID"
+
+            # Request, its guild and the requesting user's guild count in one round trip
+            row = (await db.execute(
+                select(
+                    Guild.id.label("found_guild_id"),
+                    Guild.member_limit,
+                    Guild.approved_member_count,
+                    User.approved_guild_count,
                 )
-            logger.debug(f"Middleware: Limits check passed")
+                .select_from(GuildRequest)
+                .outerjoin(Guild, (Guild.id == GuildRequest.guild_id) & (Guild.is_active == True))
+                .outerjoin(User, User.id == GuildRequest.user_id)
+                .where(GuildRequest.id == request_uuid)
+            )).first()
+            if not row:
+                return "Guild request not found"
+            if row.found_guild_id is None:
+                return "Guild not found"
+
+            return self._membership_limit(
+                row.approved_member_count, row.member_limit, row.approved_guild_count or 0, user.max_guilds
+            )
+
+        return None
+
+    def _membership_limit(self, approved_count: int, member_limit: Optional[int], user_guilds: int, max_guilds: int) -> Optional[str]:
+        member_limit = member_limit or self.default_member_limit
+        if approved_count >= member_limit:
+            return f"Guild at member limit ({approved_count}/{member_limit}). Upgrade plan."
+        if user_guilds >= max_guilds:
+            return f"User at guild limit ({user_guilds}/{max_guilds})."
+        return None
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, status and SQL usage per route."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        started = time.perf_counter()
+        usage, token = metrics.start_request()
+        metrics.IN_FLIGHT.add(1, method)
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.IN_FLIGHT.add(-1, method)
+            # Label by route template so path parameters do not multiply series
+            route = scope.get("route")
+            route_label = getattr(route, "path", None) or "unmatched"
+            metrics.finish_request(token, usage, method, route_label, status_code, time.perf_counter() - started)
 
-        response = await call_next(request)
-        logger.debug(f"Middleware: Request completed with status {response.status_code}")
-        return response
 
-    def _should_check_limits(self, request) -> bool:
-        path = request.url.path
-        method = request.method
+class QueryWatchMiddleware:
+    """Pure ASGI middleware logging statement shapes repeated within one request (N+1 queries)."""
 
-        if path == "/api/guilds" and method == "POST":
-            return True
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # 0 disables recording
+        self.threshold = int(os.getenv('QUERY_REPEAT_WARN_THRESHOLD', '5'))
 
-        if re.match(r"/api/users/[^/]+/join$", path) and method in ["PATCH", "POST"]:
-            return True
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or self.threshold <= 0:
+            await self.app(scope, receive, send)
+            return
 
-        if path == "/api/invites" and method == "POST":
-            return True
+        with record_queries() as recorder:
+            await self.app(scope, receive, send)
+        route = getattr(scope.get("route"), "path", None) or scope["path"]
+        warn_on_repeats(recorder, self.threshold, f"{scope['method']} {route}")
 
-        if re.match(r"/api/admin/guild_requests/[^/]+$", path) and method == "PATCH":
-            return True
 
-        return False
+class RequestContextMiddleware:
+    """Pure ASGI middleware giving each request an id for logs and the X-Request-ID header."""
 
-    def _get_current_user(self, request) -> Optional[User]:
-        auth_header = request.headers.get("Authorization")
-        if not auth_header or not auth_header.startswith("Bearer "):
-            return None
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        token = auth_header.split(" ")[1]
-        payload = self._verify_token(token)
-        if not payload:
-            return None
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        user_id = payload.get("sub")
-        if not user_id:
-            return None
+        # Reuse a well-formed id from the proxy or client so log lines correlate end to end
+        incoming = Headers(scope=scope).get(REQUEST_ID_HEADER)
+        request_id = incoming if incoming and _REQUEST_ID.fullmatch(incoming) else uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_id(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(REQUEST_ID_HEADER, request_id)
+            await send(message)
 
-        db: Session = next(get_db())
         try:
-            user = db.query(User).filter(User.id == user_id).first()
-            return user
+            await self.app(scope, receive, send_with_id)
         finally:
-            db.close()
+            request_id_var.reset(token)
 
-    def _verify_token(self, token: str) -> Optional[dict]:
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            return payload
-        except (jwt.ExpiredSignatureError, jwt.DecodeError, jwt.PyJWTError):
-            return None
 
-    async def _check_limits(self, request, user: User, body_bytes: Optional[bytes]) -> Optional[str]:
-        path = request.url.path
-        method = request.method
-        logger.debug(f"Middleware: Checking limits for {method} {path}")
-        db: Session = next(get_db())
+class ReadYourWritesMiddleware:
+    """Pure ASGI middleware marking clients that write so their next reads skip the replica.
 
-        try:
-            if path == "/api/guilds" and method == "POST":
-                logger.debug(f"Middleware: Checking guild creation limits for user {user.id}")
-                guild_count = db.query(Guild).filter(Guild.creator_id == user.id).count()
-                logger.debug(f"Middleware: User has {guild_count} guilds, max is {user.max_guilds}")
-                if guild_count >= user.max_guilds:
-                    return f"Maximum guild limit of {user.max_guilds} reached (including personal)"
+    The marker travels with the client (cookie and header), so a read served
+    by any worker process sees the client's own writes despite replication lag.
+    """
 
-            elif re.match(r"/api/users/([^/]+)/join$", path) and method in ["PATCH", "POST"]:
-                logger.debug(f"Middleware: Processing join request for user {user.id}")
-
-                if body_bytes is None:
-                    logger.debug("Middleware: Body bytes missing, reading from request")
-                    body_bytes = await request.body()
-
-                try:
-                    logger.debug(f"Middleware: Parsing request body ({len(body_bytes)} bytes)")
-                    body = json.loads(body_bytes.decode('utf-8'))
-                    request._body = body_bytes  # Restore the body for endpoint consumption
-                    logger.debug(f"Middleware: Restored body: {len(body_bytes)} bytes")
-                except json.JSONDecodeError as e:
-                    logger.error(f"Middleware: JSON decode error: {e}")
-                    return "Invalid JSON in request body"
-                except Exception as e:
-                    logger.error(f"Middleware: Failed to read request body: {e}")
-                    return "Invalid request body"
-
-                invite_code = body.get('invite_code')
-                logger.debug(f"Middleware: Invite code: {invite_code}")
-                if not invite_code:
-                    return "Invalid invite code"
-
-                # Lookup invite
-                logger.debug(f"Middleware: Looking up invite code {invite_code}")
-                invite = db.query(Invite).filter(Invite.code == invite_code).first()
-                if not invite:
-                    logger.debug(f"Middleware: Invite code not found")
-                    return "Invalid invite code"
-
-                guild_id = invite.guild_id
-                logger.debug(f"Middleware: Invite belongs to guild {guild_id}")
-
-                # Query approved_count
-                approved_count = db.query(GuildRequest).filter(
-                    GuildRequest.guild_id == guild_id,
-                    GuildRequest.status == "approved"
-                ).count()
-                logger.debug(f"Middleware: Guild {guild_id} has {approved_count} approved members")
-
-                # Query user_guilds
-                user_guilds = db.query(GuildRequest).filter(
-                    GuildRequest.user_id == user.id,
-                    GuildRequest.status == "approved"
-                ).count()
-                logger.debug(f"Middleware: User {user.id} has {user_guilds} approved guild memberships")
-
-                # Get guild for member_limit
-                guild = db.query(Guild).filter(Guild.id == guild_id).first()
-                if not guild:
-                    logger.debug(f"Middleware: Guild {guild_id} not found")
-                    return "Guild not found"
-
-                # Check member limit
-                member_limit = guild.member_limit or 2
-                logger.debug(f"Middleware: Guild member limit is {member_limit}")
-                if approved_count >= member_limit:
-                    logger.debug(f"Middleware: Guild at member limit ({approved_count}/{member_limit})")
-                    return f"Guild at member limit ({approved_count}/{member_limit}). Upgrade plan."
-
-                # Check user guild limit
-                if user_guilds >= user.max_guilds:
-                    logger.debug(f"Middleware: User at guild limit ({user_guilds}/{user.max_guilds})")
-                    return f"User at guild limit ({user_guilds}/{user.max_guilds})."
-
-                logger.debug(f"Middleware: Join validation passed for user {user.id}, guild {guild_id}")
-
-            elif re.match(r"/api/admin/guild_requests/([^/]+)$", path) and method == "PATCH":
-                logger.debug(f"Middleware: Processing guild request approval")
-                request_id = re.match(r"/api/admin/guild_requests/([^/]+)$", path).group(1)
-                try:
-                    request_uuid = uuid.UUID(request_id)
-                except ValueError:
-                    return "Invalid request ID"
-
-                guild_request = db.query(GuildRequest).filter(GuildRequest.id == request_uuid).first()
-                if not guild_request:
-                    return "Guild request not found"
-
-                guild_id = guild_request.guild_id
-
-                # Query approved_count and user_guilds, return 402 if over limits
-                approved_count = db.query(GuildRequest).filter(
-                    GuildRequest.guild_id == guild_id,
-                    GuildRequest.status == "approved"
-                ).count()
-
-                user_guilds = db.query(GuildRequest).filter(
-                    GuildRequest.user_id == guild_request.user_id,
-                    GuildRequest.status == "approved"
-                ).count()
-
-                # Get guild for member_limit
-                guild = db.query(Guild).filter(Guild.id == guild_id).first()
-                if not guild:
-                    return "Guild not found"
-
-                member_limit = guild.member_limit or 2
-                if approved_count >= member_limit:
-                    return f"Guild at member limit ({approved_count}/{member_limit}). Upgrade plan."
-
-                if user_guilds >= user.max_guilds:
-                    return f"User at guild limit ({user_guilds}/{user.max_guilds})."
-
-                logger.debug(f"Middleware: Approval validation passed for request {request_id}")
-
-            elif path == "/api/invites" and method == "POST":
-                logger.debug(f"Middleware: Checking invite creation limits")
-                guild_count = db.query(Guild).filter(Guild.creator_id == user.id).count()
-                if guild_count >= user.max_guilds:
-                    return f"Maximum guild limit of {user.max_guilds} reached"
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        finally:
-            db.close()
-            logger.debug(f"Middleware: Database closed")
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] in models._READ_METHODS or not models.REPLICA_ASYNC_DATABASE_URL:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_marker(message: Message):
+            if message["type"] == "http.response.start":
+                # Taken once the route has committed, so the window covers the whole lag
+                until = f"{models.read_primary_until():.3f}"
+                headers = MutableHeaders(scope=message)
+                headers.append(models.READ_PRIMARY_HEADER, until)
+                headers.append("Set-Cookie", (
+                    f"{models.READ_PRIMARY_COOKIE}={until}; Max-Age={math.ceil(models.REPLICA_STICKY_SECONDS)}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                ))
+            await send(message)
 
-        return None
\ No newline at end of file
+        await self.app(scope, receive, send_with_marker)
@@ -4,25 +4,30 @@
 import logging
 logger = logging.getLogger(__name__)
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import StreamingResponse
 # Rate limiting disabled for now
 # from slowapi import Limiter, _rate_limit_exceeded_handler
 # from slowapi.util import get_remote_address
 # from slowapi.errors import RateLimitExceeded
 # from slowapi.middleware import SlowAPIMiddleware
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from pydantic import BaseModel, ValidationError
 from typing import Optional, List, Dict, Any, Set
+import asyncio
 import uuid
 from datetime import datetime, timedelta
 import re
 import jwt
-import bcrypt
 import pyotp
 from datetime import datetime, timedelta
 import secrets
 import hashlib
+from ..core.jobs import get_job, serialize_job
 from ..core.models import (
     Objective,
     Task,
@@ -39,10 +44,35 @@ from ..core.models import (
     ObjectiveCategory,
     Preference,
     UserPreference,
-    get_db,
+    OBJECTIVE_STATUS,
+    get_async_db,
+    get_async_primary_db,
     create_tables,
 )
-from .utils import has_super_admin_access
+from .utils import (
+    PageParams,
+    attach_user,
+    create_guild_from_template,
+    event_stream,
+    guild_events,
+    load_categories,
+    load_objectives,
+    objective_query,
+    get_effective_permissions,
+    has_super_admin_access,
+    hash_secret,
+    issue_permission_claims,
+    load_user_row,
+    needs_rehash,
+    publish_event,
+    publish_objective_event,
+    remember_token_claims,
+    run_hashing,
+    serialize_objective,
+    serialize_objective_summary,
+    update_tasks_on_objective_progress,
+    verify_secret,
+)
 
 router = APIRouter()
 
@@ -198,7 +228,7 @@ def parse_schedule_from_text(text: str) -> Dict[str, Any]:
 
     return schedule
 
-def create_adhoc_squad(db: Session, guild_id: str, user_id: str = None) -> str:
+async def create_adhoc_squad(db: AsyncSession, guild_id: str, user_id: str = None) -> str:
     """Create an ad-hoc squad if none exists"""
     # For ad-hoc, just create a new squad without checking existing
     # Since user_id might be None or random
@@ -211,48 +241,25 @@ def create_adhoc_squad(db: Session, guild_id: str, user_id: str = None) -> str:
         lead_id=None  # Don't set lead_id for ad-hoc squad
     )
     db.add(squad)
-    db.commit()
+    await db.commit()
     return str(squad.id)
 
-async def update_tasks_on_objective_progress(db: Session, objective: Objective):
-    """Update related tasks when objective progress changes"""
-    try:
-        # Get all tasks for this objective
-        tasks = db.query(Task).filter(Task.objective_id == objective.id).all()
-
-        objective_status = objective.progress.get("status", "active")
-
-        for task in tasks:
-            # If objective is completed, mark tasks as completed
-            if objective_status == "completed":
-                task.status = "Completed"
-                task.progress = {**task.progress, "completed_via_objective": True}
-            # If objective is cancelled, mark tasks as cancelled
-            elif objective_status == "cancelled":
-                task.status = "Failed"
-                task.progress = {**task.progress, "cancelled_via_objective": True}
-
-        db.commit()
-    except Exception as e:
-        # Log error but don't fail the objective update
-        print(f"Warning: Failed to update tasks on objective progress: {str(e)}")
-
 # Authentication helper functions
 def hash_password(password: str) -> str:
     """Hash password using bcrypt"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return hash_secret(password)
 
 def verify_password(password: str, hashed: str) -> bool:
     """Verify password against hash"""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    return verify_secret(password, hashed)
 
 def hash_pin(pin: str) -> str:
     """Hash PIN using bcrypt"""
-    return bcrypt.hashpw(pin.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return hash_secret(pin)
 
 def verify_pin(pin: str, hashed: str) -> bool:
     """Verify PIN against hash"""
-    return bcrypt.checkpw(pin.encode('utf-8'), hashed.encode('utf-8'))
+    return verify_secret(pin, hashed)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
@@ -278,10 +285,35 @@ def verify_token(token: str) -> Optional[dict]:
     except jwt.PyJWTError:
         return None
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
+def get_token_payload(request: Request) -> Optional[dict]:
+    """Decode the request's bearer token once and keep the claims on request.state"""
+    if not hasattr(request.state, "token_payload"):
+        auth_header = request.headers.get("Authorization")
+        payload = None
+        if auth_header and auth_header.startswith("Bearer "):
+            payload = verify_token(auth_header.split(" ", 1)[1])
+        request.state.token_payload = payload
+    return request.state.token_payload
+
+async def get_request_user(request: Request, db: AsyncSession) -> Optional[User]:
+    """Resolve the authenticated user, sharing the row across middleware and dependencies"""
+    if not hasattr(request.state, "user_row"):
+        payload = get_token_payload(request)
+        user_id = payload.get("sub") if payload else None
+        row = None
+        if user_id:
+            try:
+                row = await load_user_row(db, uuid.UUID(user_id))
+            except ValueError:
+                row = None
+        request.state.user_row = row
+
+    row = request.state.user_row
+    return await attach_user(db, row) if row else None
+
+async def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncSession = Depends(get_async_db)):
     """Get current authenticated user from JWT token"""
-    token = credentials.credentials
-    payload = verify_token(token)
+    payload = get_token_payload(request)
 
     if not payload:
         raise HTTPException(
@@ -290,15 +322,14 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_id = payload.get("sub")
-    if not user_id:
+    if not payload.get("sub"):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(User.id == uuid.UUID(user_id)).first()
+    user = await get_request_user(request, db)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -306,76 +337,28 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    remember_token_claims(db, user, payload)
     return user
 
-def check_admin_access(user: User, db: Session) -> bool:
+async def check_admin_access(user: User, db: AsyncSession) -> bool:
     """Check if user has admin access for their guild"""
-    if not user.rank:
-        return False
-
-    rank = db.query(Rank).filter(Rank.id == user.rank).first()
-    if not rank:
-        return False
-
-    # Check if rank has admin access levels
-    return "Admin" in rank.access_levels or "manage_prompts" in rank.access_levels
+    return (await get_effective_permissions(user, db)).grants_any(["Admin", "manage_prompts"])
 
-def check_objective_access(user: User, db: Session, action: str = "view") -> bool:
+async def check_objective_access(user: User, db: AsyncSession, action: str = "view") -> bool:
     """Check if user has objective access for their guild"""
-    # Check for super_admin bypass - super_admin always has all permissions
-    user_access_levels = db.query(UserAccess).filter(UserAccess.user_id == user.id).all()
-    for ua in user_access_levels:
-        access_level = db.query(AccessLevel).filter(AccessLevel.id == ua.access_level_id).first()
-        if access_level and access_level.name == 'super_admin':
-            return True
-
-    # Check user access levels first (direct grants)
-    for ua in user_access_levels:
-        access_level = db.query(AccessLevel).filter(AccessLevel.id == ua.access_level_id).first()
-        if access_level and action in access_level.user_actions:
-            return True
-
-    # Check rank-based access levels
-    if user.rank:
-        rank = db.query(Rank).filter(Rank.id == user.rank).first()
-        if rank:
-            for access_level_id in rank.access_levels:
-                access_level = db.query(AccessLevel).filter(AccessLevel.id == access_level_id).first()
-                if access_level and action in access_level.user_actions:
-                    return True
+    # super_admin always has all permissions
+    return (await get_effective_permissions(user, db)).allows(action)
 
-    return False
-
-def check_category_access(user: User, db: Session, action: str = "view") -> bool:
+async def check_category_access(user: User, db: AsyncSession, action: str = "view") -> bool:
     """Check if user has category access for their guild"""
-    # Check for super_admin bypass - super_admin always has all permissions
-    user_access_levels = db.query(UserAccess).filter(UserAccess.user_id == user.id).all()
-    for ua in user_access_levels:
-        access_level = db.query(AccessLevel).filter(AccessLevel.id == ua.access_level_id).first()
-        if access_level and access_level.name == 'super_admin':
-            return True
-
-    # Check user access levels first (direct grants)
-    for ua in user_access_levels:
-        access_level = db.query(AccessLevel).filter(AccessLevel.id == ua.access_level_id).first()
-        if access_level and action in access_level.user_actions:
-            return True
-
-    # Check rank-based access levels
-    if user.rank:
-        rank = db.query(Rank).filter(Rank.id == user.rank).first()
-        if rank:
-            for access_level_id in rank.access_levels:
-                access_level = db.query(AccessLevel).filter(AccessLevel.id == access_level_id).first()
-                if access_level and action in access_level.user_actions:
-                    return True
+    # super_admin always has all permissions
+    return (await get_effective_permissions(user, db)).allows(action)
 
-    return False
 def create_session_token(user_id: str, token: str, expires_at: datetime) -> str:
     """Create a hash for session token storage"""
     return hashlib.sha256(f"{user_id}:{token}:{expires_at.isoformat()}".encode()).hexdigest()
 
-def track_failed_attempt(db: Session, user: User):
+async def track_failed_attempt(db: AsyncSession, user: User):
     """Track failed login attempt and implement lockout"""
     user.failed_attempts = (user.failed_attempts or 0) + 1
 
@@ -383,14 +366,14 @@ def track_failed_attempt(db: Session, user: User):
     if user.failed_attempts >= 5:
         user.locked_until = datetime.utcnow() + timedelta(minutes=15)
 
-    db.commit()
+    await db.commit()
 
-def reset_failed_attempts(db: Session, user: User):
+async def reset_failed_attempts(db: AsyncSession, user: User):
     """Reset failed attempts on successful login"""
     user.failed_attempts = 0
     user.locked_until = None
     user.last_login = datetime.utcnow()
-    db.commit()
+    await db.commit()
 
 def is_account_locked(user: User) -> bool:
     """Check if account is currently locked"""
@@ -417,14 +400,14 @@ def get_totp_uri(secret: str, name: str, issuer: str = "SphereConnect") -> str:
 
 # Authentication Endpoints
 @router.post("/auth/login", response_model=TokenResponse)
-async def login(login_data: UserLogin, db: Session = Depends(get_db)):
+async def login(login_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Authenticate user and return JWT tokens"""
     try:
         # Find user by username or email (global authentication)
-        user = db.query(User).filter(
+        user = await db.scalar(select(User).where(
             (User.username == login_data.username_or_email) |
             (User.email == login_data.username_or_email)
-        ).first()
+        ))
 
         if not user:
             raise HTTPException(
@@ -440,15 +423,19 @@ async def login(login_data: UserLogin, db: Session = Depends(get_db)):
             )
 
         # Verify password
-        if not user.password or not verify_password(login_data.password, user.password):
-            track_failed_attempt(db, user)
+        if not user.password or not await run_hashing(verify_password, login_data.password, user.password):
+            await track_failed_attempt(db, user)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials"
             )
 
+        # Upgrade hashes made with an outdated cost (committed with the reset below)
+        if needs_rehash(user.password):
+            user.password = await run_hashing(hash_password, login_data.password)
+
         # Reset failed attempts on successful login
-        reset_failed_attempts(db, user)
+        await reset_failed_attempts(db, user)
 
         # Determine current guild (use personal guild if current_guild_id is null)
         current_guild_id = user.current_guild_id
@@ -456,13 +443,17 @@ async def login(login_data: UserLogin, db: Session = Depends(get_db)):
             current_guild_id = user.guild_id  # Fall back to personal guild
 
         # Get guild name
-        guild = db.query(Guild).filter(Guild.id == current_guild_id).first()
+        guild = await db.scalar(select(Guild).where(Guild.id == current_guild_id))
         guild_name = guild.name if guild else "Unknown Guild"
 
         # Create access token
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": str(user.id), "guild_id": str(current_guild_id)},
+            data={
+                "sub": str(user.id),
+                "guild_id": str(current_guild_id),
+                "perm": await issue_permission_claims(user, db),
+            },
             expires_delta=access_token_expires
         )
 
@@ -484,7 +475,7 @@ async def login(login_data: UserLogin, db: Session = Depends(get_db)):
             expires_at=datetime.utcnow() + access_token_expires
         )
         db.add(user_session)
-        db.commit()
+        await db.commit()
 
         return TokenResponse(
             access_token=access_token,
@@ -514,10 +505,10 @@ async def login(login_data: UserLogin, db: Session = Depends(get_db)):
         )
 
 @router.post("/auth/verify-pin")
-async def verify_pin_endpoint(pin_data: PinVerification, db: Session = Depends(get_db)):
+async def verify_pin_endpoint(pin_data: PinVerification, db: AsyncSession = Depends(get_async_db)):
     """Verify user's PIN for voice authentication"""
     try:
-        user = db.query(User).filter(User.id == uuid.UUID(pin_data.user_id)).first()
+        user = await db.scalar(select(User).where(User.id == uuid.UUID(pin_data.user_id)))
 
         if not user:
             raise HTTPException(
@@ -525,12 +516,16 @@ async def verify_pin_endpoint(pin_data: PinVerification, db: Session = Depends(g
                 detail="User not found"
             )
 
-        if not user.pin or not verify_pin(pin_data.pin, user.pin):
+        if not user.pin or not await run_hashing(verify_pin, pin_data.pin, user.pin):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid PIN"
             )
 
+        if needs_rehash(user.pin):
+            user.pin = await run_hashing(hash_pin, pin_data.pin)
+            await db.commit()
+
         return {
             "message": "PIN verified successfully",
             "user_id": str(user.id),
@@ -546,7 +541,7 @@ async def verify_pin_endpoint(pin_data: PinVerification, db: Session = Depends(g
         )
 
 @router.post("/auth/register", status_code=status.HTTP_201_CREATED)
-async def register_user(user_data: UserRegister, db: Session = Depends(get_db)):
+async def register_user(user_data: UserRegister, db: AsyncSession = Depends(get_async_db)):
     """Register a new user and auto-create personal guild"""
     try:
         # Input validation
@@ -574,177 +569,99 @@ async def register_user(user_data: UserRegister, db: Session = Depends(get_db)):
                 detail="PIN must be exactly 6 digits"
             )
 
-        # Check if username already exists
-        existing_username = db.query(User).filter(User.username == user_data.username).first()
-        if existing_username:
+        # Check username and email in one query
+        taken = (await db.execute(select(User.username, User.email).where(
+            or_(User.username == user_data.username, User.email == user_data.email)
+            if user_data.email else User.username == user_data.username
+        ))).all()
+        if any(row.username == user_data.username for row in taken):
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Username already exists"
             )
+        if taken:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Email already exists"
+            )
 
-        # Check if email already exists (if provided)
-        if user_data.email:
-            existing_email = db.query(User).filter(User.email == user_data.email).first()
-            if existing_email:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail="Email already exists"
-                )
-
-        # Handle invite code if provided
+        # Handle invite code if provided; the use is only spent if registration commits
         target_guild_id = None
         if user_data.invite_code:
-            invite = db.query(Invite).filter(
-                Invite.code == user_data.invite_code,
-                Invite.expires_at > datetime.utcnow()
-            ).first()
-
-            if invite and invite.uses_left > 0:
-                target_guild_id = invite.guild_id
-                invite.uses_left -= 1
-                db.add(invite)
-            else:
+            target_guild_id = await db.scalar(
+                update(Invite)
+                .where(
+                    Invite.code == user_data.invite_code,
+                    Invite.expires_at > datetime.utcnow(),
+                    Invite.uses_left > 0
+                )
+                .values(uses_left=Invite.uses_left - 1)
+                .returning(Invite.guild_id)
+            )
+            if target_guild_id is None:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Invalid or expired invite code"
                 )
 
         # Hash password and PIN
-        hashed_password = hash_password(user_data.password)
-        hashed_pin = hash_pin(user_data.pin)
-
-        # Auto-create personal guild
-        personal_guild_id = uuid.uuid4()
-        personal_guild = Guild(
-            id=personal_guild_id,
-            name=f"{user_data.name}'s Personal Guild",
-            creator_id=None,  # Will set after user creation
-            member_limit=2,
-            billing_tier='free',
-            is_solo=True,
-            is_active=True,
-            is_deletable=False,
-            type='game_star_citizen'
+        hashed_password, hashed_pin = await asyncio.gather(
+            run_hashing(hash_password, user_data.password),
+            run_hashing(hash_pin, user_data.pin),
         )
-        db.add(personal_guild)
-        db.commit()  # Commit guild first to resolve ForeignKeyViolation
 
-        # Create default access levels before ranks
-        access_view = AccessLevel(
-            id=uuid.uuid4(),
-            guild_id=personal_guild_id,
-            name='view_guilds',
-            user_actions=['view_guilds']
-        )
-        access_manage = AccessLevel(
-            id=uuid.uuid4(),
-            guild_id=personal_guild_id,
-            name='manage_guilds',
-            user_actions=['manage_guilds', 'manage_users']
-        )
-        access_objectives = AccessLevel(
-            id=uuid.uuid4(),
-            guild_id=personal_guild_id,
-            name='objectives',
-            user_actions=['create_objective', 'manage_objectives']
-        )
-        access_rbac = AccessLevel(
-            id=uuid.uuid4(),
-            guild_id=personal_guild_id,
-            name='manage_rbac',
-            user_actions=['manage_rbac']
-        )
-        access_view_ranks = AccessLevel(
-            id=uuid.uuid4(),
-            guild_id=personal_guild_id,
-            name='view_ranks',
-            user_actions=['view_ranks']
-        )
-        access_manage_ranks = AccessLevel(
-            id=uuid.uuid4(),
-            guild_id=personal_guild_id,
-            name='manage_ranks',
-            user_actions=['manage_ranks']
-        )
-        # Create super_admin access level with ALL permissions including manage_ranks
-        access_super = AccessLevel(
-            id=uuid.uuid4(),
-            guild_id=personal_guild_id,
-            name='super_admin',
-            user_actions=['view_guilds', 'manage_guilds', 'view_users', 'manage_users', 'manage_user_access', 'manage_rbac', 'view_objectives', 'create_objective', 'manage_objectives', 'view_ranks', 'manage_ranks', 'view_categories', 'create_category', 'manage_categories']
-        )
-        db.add_all([access_view, access_manage, access_objectives, access_rbac, access_view_ranks, access_manage_ranks, access_super])
-        db.commit()
-
-        # Create default CO rank with access levels (including manage_rbac, view_ranks, manage_ranks)
-        co_rank = Rank(
-            id=uuid.uuid4(),
-            guild_id=personal_guild_id,
-            name="CO",
-            phonetic="Commander",
-            hierarchy_level=1,  # CO is the highest rank (lowest number)
-            access_levels=[access_view.id, access_manage.id, access_objectives.id, access_rbac.id, access_view_ranks.id, access_manage_ranks.id]
-        )
-
-        # Add CO rank first
-        db.add(co_rank)
-
-        # Create new user
-        new_user = User(
-            id=uuid.uuid4(),
-            guild_id=personal_guild_id,  # Assign to personal guild
-            name=user_data.name,
-            username=user_data.username,
-            email=user_data.email,
-            password=hashed_password,
-            pin=hashed_pin,
-            phonetic=user_data.phonetic,
-            availability="offline",
-            rank=co_rank.id,  # Assign CO rank
-            current_guild_id=personal_guild_id,  # Set to personal guild UUID
-            max_guilds=3,
-            is_system_admin=False
-        )
-
-        db.add(new_user)
-        db.commit()
-
-        # Update personal guild creator_id
-        personal_guild.creator_id = new_user.id
+        # Everything below is one transaction: a failure leaves no partial guild
+        personal_guild_id = uuid.uuid4()
+        user_id = uuid.uuid4()
+
+        # Personal guild with the template's access levels, CO rank and AI commander,
+        # in one statement; creator_id is set once the user row exists
+        template_ids = await create_guild_from_template(db, {
+            "id": personal_guild_id,
+            "name": f"{user_data.name}'s Personal Guild",
+            "creator_id": None,
+            "member_limit": 2,
+            "billing_tier": 'free',
+            "is_solo": True,
+            "is_active": True,
+            "is_deletable": False,
+            "type": 'game_star_citizen'
+        })
+        co_rank_id = template_ids["creator_rank"]
+
+        await db.execute(insert(User), [{
+            "id": user_id,
+            "guild_id": personal_guild_id,  # Assign to personal guild
+            "name": user_data.name,
+            "username": user_data.username,
+            "email": user_data.email,
+            "password": hashed_password,
+            "pin": hashed_pin,
+            "phonetic": user_data.phonetic,
+            "availability": "offline",
+            "rank": co_rank_id,  # Assign CO rank
+            "current_guild_id": personal_guild_id,  # Set to personal guild UUID
+            "max_guilds": 3,
+            "is_system_admin": False
+        }])
+
+        await db.execute(update(Guild).where(Guild.id == personal_guild_id).values(creator_id=user_id))
 
         # Assign super_admin access level directly to user (non-revocable)
-        user_access_super = UserAccess(
-            id=uuid.uuid4(),
-            user_id=new_user.id,
-            access_level_id=access_super.id
-        )
-        db.add(user_access_super)
+        db.add(UserAccess(id=uuid.uuid4(), user_id=user_id, access_level_id=template_ids["creator_access"]))
 
-        # Create approved GuildRequest for creator in their personal guild
-        creator_guild_request = GuildRequest(
-            id=uuid.uuid4(),
-            user_id=new_user.id,
-            guild_id=personal_guild_id,
-            status="approved"
-        )
-        db.add(creator_guild_request)
-        db.commit()
+        # Approved request for the personal guild; through the ORM so membership counters follow
+        db.add(GuildRequest(id=uuid.uuid4(), user_id=user_id, guild_id=personal_guild_id, status="approved"))
 
-        # If invite code was used, create guild request or join directly
+        # If invite code was used, create a guild request for approval
         if target_guild_id:
-            # Create a guild request for approval
-            guild_request = GuildRequest(
-                id=uuid.uuid4(),
-                user_id=new_user.id,
-                guild_id=target_guild_id,
-                status="pending"
-            )
-            db.add(guild_request)
-            db.commit()
+            db.add(GuildRequest(id=uuid.uuid4(), user_id=user_id, guild_id=target_guild_id, status="pending"))
+
+        await db.commit()
 
         return {
             "message": "User registered successfully with personal guild",
-            "user_id": str(new_user.id),
+            "user_id": str(user_id),
             "guild_id": str(personal_guild_id),
             "rank": "CO",
             "invite_processed": bool(user_data.invite_code)
@@ -752,8 +669,15 @@ async def register_user(user_data: UserRegister, db: Session = Depends(get_db)):
 
     except HTTPException:
         raise
+    except IntegrityError:
+        # A concurrent registration took the username or email after the check
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Username or email already exists"
+        )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Registration failed: {str(e)}"
@@ -763,16 +687,17 @@ async def register_user(user_data: UserRegister, db: Session = Depends(get_db)):
 @router.get("/preferences")
 async def list_preferences(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Return the global preference catalog."""
     try:
         preferences = (
-            db.query(Preference)
-            .filter(Preference.is_active.is_(True))
-            .order_by(Preference.name.asc())
-            .all()
-        )
+            await db.scalars(
+                select(Preference)
+                .where(Preference.is_active.is_(True))
+                .order_by(Preference.name.asc())
+            )
+        ).all()
 
         return [
             {
@@ -793,7 +718,7 @@ async def list_preferences(
 async def get_user_preferences(
     user_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Return the active preferences for a specific user."""
     try:
@@ -802,17 +727,16 @@ async def get_user_preferences(
         except ValueError:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid user ID format")
 
-        if str(current_user.id) != user_id and not has_super_admin_access(current_user, db):
+        if str(current_user.id) != user_id and not await has_super_admin_access(current_user, db):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied: Cannot view preferences for this user"
             )
 
-        user = (
-            db.query(User)
-            .options(joinedload(User.preferences))
-            .filter(User.id == user_uuid)
-            .first()
+        user = await db.scalar(
+            select(User)
+            .options(selectinload(User.preferences))
+            .where(User.id == user_uuid)
         )
 
         if not user:
@@ -844,7 +768,7 @@ async def update_user_preferences(
     user_id: str,
     update: UserPreferencesUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Allow a user (or super_admin) to update their preference set."""
     try:
@@ -853,17 +777,16 @@ async def update_user_preferences(
         except ValueError:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid user ID format")
 
-        if str(current_user.id) != user_id and not has_super_admin_access(current_user, db):
+        if str(current_user.id) != user_id and not await has_super_admin_access(current_user, db):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied: Cannot update preferences for this user"
             )
 
-        user = (
-            db.query(User)
-            .options(joinedload(User.preferences))
-            .filter(User.id == user_uuid)
-            .first()
+        user = await db.scalar(
+            select(User)
+            .options(selectinload(User.preferences))
+            .where(User.id == user_uuid)
         )
 
         if not user:
@@ -878,30 +801,31 @@ async def update_user_preferences(
 
         if desired_ids:
             existing_preferences = (
-                db.query(Preference)
-                .filter(Preference.id.in_(list(desired_ids)), Preference.is_active.is_(True))
-                .all()
-            )
+                await db.scalars(
+                    select(Preference)
+                    .where(Preference.id.in_(list(desired_ids)), Preference.is_active.is_(True))
+                )
+            ).all()
             if len(existing_preferences) != len(desired_ids):
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="One or more preferences not found")
 
-        existing_entries = db.query(UserPreference).filter(UserPreference.user_id == user_uuid).all()
+        existing_entries = (await db.scalars(select(UserPreference).where(UserPreference.user_id == user_uuid))).all()
         existing_ids = {entry.preference_id for entry in existing_entries}
 
         to_add = desired_ids - existing_ids
         to_remove = existing_ids - desired_ids
 
         if to_remove:
-            db.query(UserPreference).filter(
+            await db.execute(delete(UserPreference).where(
                 UserPreference.user_id == user_uuid,
                 UserPreference.preference_id.in_(list(to_remove))
-            ).delete(synchronize_session=False)
+            ))
 
         for preference_id in to_add:
             db.add(UserPreference(user_id=user_uuid, preference_id=preference_id))
 
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user, ["preferences"])
 
         updated_preferences = [
             {
@@ -921,7 +845,7 @@ async def update_user_preferences(
     except HTTPException:
         raise
     except Exception as exc:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update preferences: {exc}"
@@ -932,7 +856,7 @@ async def update_user_preferences(
 async def get_user_guilds(
     user_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all guilds for a user (personal + joined/created)"""
     try:
@@ -946,13 +870,13 @@ async def get_user_guilds(
         user_uuid = uuid.UUID(user_id)
 
         # Get user's personal guild (created by user)
-        personal_guild = db.query(Guild).filter(Guild.creator_id == user_uuid).first()
+        personal_guild = await db.scalar(select(Guild).where(Guild.creator_id == user_uuid))
 
         # Get guilds where user has approved guild requests
-        approved_requests = db.query(GuildRequest).filter(
+        approved_requests = (await db.scalars(select(GuildRequest).where(
             GuildRequest.user_id == user_uuid,
             GuildRequest.status == "approved"
-        ).all()
+        ))).all()
 
         guild_ids = set()
         if personal_guild:
@@ -962,16 +886,10 @@ async def get_user_guilds(
             guild_ids.add(request.guild_id)
 
         # Get all guilds user has access to
-        all_guilds = db.query(Guild).filter(Guild.id.in_(guild_ids)).all()
+        all_guilds = (await db.scalars(select(Guild).where(Guild.id.in_(guild_ids), Guild.is_active == True))).all()
 
         guilds_data = []
         for guild in all_guilds:
-            # Count approved members (users with approved guild requests)
-            approved_count = db.query(GuildRequest).filter(
-                GuildRequest.guild_id == guild.id,
-                GuildRequest.status == "approved"
-            ).count()
-
             guilds_data.append({
                 "id": str(guild.id),
                 "name": guild.name,
@@ -981,7 +899,7 @@ async def get_user_guilds(
                 "is_solo": guild.is_solo,
                 "is_deletable": guild.is_deletable,
                 "type": guild.type,
-                "approved_count": approved_count
+                "approved_count": guild.approved_member_count
             })
 
         return guilds_data
@@ -999,7 +917,7 @@ async def switch_guild(
     user_id: str,
     switch_data: GuildSwitch,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Switch user's current guild context"""
     try:
@@ -1012,8 +930,8 @@ async def switch_guild(
 
         target_guild_id = uuid.UUID(switch_data.guild_id)
 
-        # Verify target guild exists
-        target_guild = db.query(Guild).filter(Guild.id == target_guild_id).first()
+        # Verify target guild exists and is not being deleted
+        target_guild = await db.scalar(select(Guild).where(Guild.id == target_guild_id, Guild.is_active == True))
         if not target_guild:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1022,7 +940,7 @@ async def switch_guild(
 
         # Update current_guild_id
         current_user.current_guild_id = str(target_guild_id)
-        db.commit()
+        await db.commit()
 
         return {
             "message": "Guild switched successfully",
@@ -1034,7 +952,7 @@ async def switch_guild(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Guild switch failed: {str(e)}"
@@ -1045,51 +963,51 @@ async def join_guild(
     user_id: str,
     join_data: JoinRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Join a guild using an invite code"""
-    logger.debug(f"Join request start: user_id={user_id}, invite_code={join_data.invite_code}")
+    logger.debug("Join request start: user_id=%s, invite_code=%s", user_id, join_data.invite_code)
 
     try:
-        logger.debug(f"Verifying user owns account: current_user.id={current_user.id}, user_id={user_id}")
+        logger.debug("Verifying user owns account: current_user.id=%s, user_id=%s", current_user.id, user_id)
         # Verify user owns this account
         if str(current_user.id) != user_id:
-            logger.warning(f"Join request denied: user {current_user.id} tried to join for user {user_id}")
+            logger.warning("Join request denied: user %s tried to join for user %s", current_user.id, user_id)
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied: Can only join guilds for yourself"
             )
         logger.debug("User ownership verification passed")
 
-        logger.debug(f"Looking up invite code: {join_data.invite_code}")
+        logger.debug("Looking up invite code: %s", join_data.invite_code)
         # Find valid invite
-        invite = db.query(Invite).filter(
+        invite = await db.scalar(select(Invite).where(
             Invite.code == join_data.invite_code,
             Invite.expires_at > datetime.utcnow()
-        ).first()
-        logger.debug(f"Invite query result: {invite}")
+        ))
+        logger.debug("Invite query result: %s", invite)
 
         if not invite:
-            logger.warning(f"Invite code not found or expired: {join_data.invite_code}")
+            logger.warning("Invite code not found or expired: %s", join_data.invite_code)
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail="Invalid or expired invite code"
             )
 
-        logger.debug(f"Checking invite uses_left: {invite.uses_left}")
+        logger.debug("Checking invite uses_left: %s", invite.uses_left)
         if invite.uses_left <= 0:
-            logger.warning(f"Invite code has no uses left: {join_data.invite_code}")
+            logger.warning("Invite code has no uses left: %s", join_data.invite_code)
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail="Invite code has no remaining uses"
             )
 
-        logger.debug(f"Valid invite found: guild_id={invite.guild_id}, uses_left={invite.uses_left}")
+        logger.debug("Valid invite found: guild_id=%s, uses_left=%s", invite.guild_id, invite.uses_left)
 
         logger.debug("Updating invite uses")
         # Update invite uses
         invite.uses_left -= 1
-        logger.debug(f"Decremented invite uses_left to: {invite.uses_left}")
+        logger.debug("Decremented invite uses_left to: %s", invite.uses_left)
 
         logger.debug("Creating guild request")
         # Create guild request for approval instead of direct join
@@ -1099,30 +1017,35 @@ async def join_guild(
             guild_id=invite.guild_id,
             status="pending"
         )
-        logger.debug(f"GuildRequest object created: id={guild_request.id}, user_id={guild_request.user_id}, guild_id={guild_request.guild_id}, status={guild_request.status}")
+        logger.debug("GuildRequest object created: id=%s, user_id=%s, guild_id=%s, status=%s", guild_request.id, guild_request.user_id, guild_request.guild_id, guild_request.status)
         db.add(guild_request)
-        logger.debug(f"Added guild request to session: id={guild_request.id}")
+        logger.debug("Added guild request to session: id=%s", guild_request.id)
+        publish_event(db, invite.guild_id, "guild_request.created", {
+            "id": str(guild_request.id),
+            "user_id": str(current_user.id),
+            "status": "pending",
+        }, requires="manage_users")
 
         logger.debug("Attempting database commit")
         # Attempt to commit with error handling
         try:
-            db.commit()
+            await db.commit()
             logger.debug("Database commit successful")
         except Exception as commit_error:
-            logger.error(f"Database commit failed: {str(commit_error)}")
-            db.rollback()
+            logger.error("Database commit failed: %s", commit_error)
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to save guild join request to database"
             )
 
-        logger.debug(f"Querying guild for name: guild_id={invite.guild_id}")
+        logger.debug("Querying guild for name: guild_id=%s", invite.guild_id)
         # Get guild name for response
-        guild = db.query(Guild).filter(Guild.id == invite.guild_id).first()
+        guild = await db.scalar(select(Guild).where(Guild.id == invite.guild_id))
         guild_name = guild.name if guild else "Unknown Guild"
-        logger.debug(f"Guild query result: name={guild_name}")
+        logger.debug("Guild query result: name=%s", guild_name)
 
-        logger.debug(f"Join request completed successfully: user_id={current_user.id}, guild_id={invite.guild_id}, request_id={guild_request.id}")
+        logger.debug("Join request completed successfully: user_id=%s, guild_id=%s, request_id=%s", current_user.id, invite.guild_id, guild_request.id)
 
         logger.debug("Preparing response data")
         response_data = {
@@ -1132,12 +1055,12 @@ async def join_guild(
             "status": "pending",
             "tts_response": f"Guild join request submitted for: {guild_name}"
         }
-        logger.debug(f"Response data prepared: {response_data}")
+        logger.debug("Response data prepared: %s", response_data)
 
         return response_data
 
     except ValidationError as e:
-        logger.error(f"Validation error in join request: {str(e)}")
+        logger.error("Validation error in join request: %s", e)
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=f"Invalid request body: {str(e)}"
@@ -1145,8 +1068,8 @@ async def join_guild(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Unexpected error in join_guild: {str(e)}", exc_info=True)
-        db.rollback()
+        logger.error("Unexpected error in join_guild: %s", e, exc_info=True)
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to join guild: {str(e)}"
@@ -1157,7 +1080,7 @@ async def leave_guild(
     user_id: str,
     leave_data: dict,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Leave a guild and switch to personal guild"""
     try:
@@ -1178,7 +1101,7 @@ async def leave_guild(
         target_guild_id = uuid.UUID(guild_id)
 
         # Verify target guild exists
-        target_guild = db.query(Guild).filter(Guild.id == target_guild_id).first()
+        target_guild = await db.scalar(select(Guild).where(Guild.id == target_guild_id))
         if not target_guild:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1193,10 +1116,10 @@ async def leave_guild(
             )
 
         # Find user's personal guild
-        personal_guild = db.query(Guild).filter(
+        personal_guild = await db.scalar(select(Guild).where(
             Guild.creator_id == current_user.id,
             Guild.is_solo == True
-        ).first()
+        ))
 
         if not personal_guild:
             raise HTTPException(
@@ -1204,10 +1127,19 @@ async def leave_guild(
                 detail="Personal guild not found"
             )
 
+        # Give up the membership (member counters follow on flush)
+        memberships = (await db.scalars(select(GuildRequest).where(
+            GuildRequest.user_id == current_user.id,
+            GuildRequest.guild_id == target_guild_id,
+            GuildRequest.status == "approved"
+        ))).all()
+        for membership in memberships:
+            await db.delete(membership)
+
         # Switch to personal guild
         current_user.current_guild_id = str(personal_guild.id)
 
-        db.commit()
+        await db.commit()
 
         return {
             "message": f"Left guild and switched to: {personal_guild.name}",
@@ -1219,14 +1151,14 @@ async def leave_guild(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to leave guild: {str(e)}"
         )
 
 @router.post("/auth/refresh", response_model=TokenResponse)
-async def refresh_token(refresh_data: TokenRefresh, db: Session = Depends(get_db)):
+async def refresh_token(refresh_data: TokenRefresh, db: AsyncSession = Depends(get_async_db)):
     """Refresh access token using refresh token"""
     try:
         # Verify refresh token
@@ -1239,7 +1171,7 @@ async def refresh_token(refresh_data: TokenRefresh, db: Session = Depends(get_db
             )
 
         user_id = payload.get("sub")
-        user = db.query(User).filter(User.id == uuid.UUID(user_id)).first()
+        user = await db.scalar(select(User).where(User.id == uuid.UUID(user_id)))
 
         if not user:
             raise HTTPException(
@@ -1253,13 +1185,17 @@ async def refresh_token(refresh_data: TokenRefresh, db: Session = Depends(get_db
             current_guild_id = user.guild_id
 
         # Get guild name
-        guild = db.query(Guild).filter(Guild.id == current_guild_id).first()
+        guild = await db.scalar(select(Guild).where(Guild.id == current_guild_id))
         guild_name = guild.name if guild else "Unknown Guild"
 
         # Create new access token
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": str(user.id), "guild_id": str(current_guild_id)},
+            data={
+                "sub": str(user.id),
+                "guild_id": str(current_guild_id),
+                "perm": await issue_permission_claims(user, db),
+            },
             expires_delta=access_token_expires
         )
 
@@ -1297,10 +1233,10 @@ async def refresh_token(refresh_data: TokenRefresh, db: Session = Depends(get_db
         )
 
 @router.post("/auth/mfa/setup")
-async def setup_mfa(mfa_data: MFASetup, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def setup_mfa(mfa_data: MFASetup, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     """Setup TOTP MFA for user"""
     try:
-        user = db.query(User).filter(User.id == uuid.UUID(mfa_data.user_id)).first()
+        user = await db.scalar(select(User).where(User.id == uuid.UUID(mfa_data.user_id)))
 
         if not user:
             raise HTTPException(
@@ -1318,7 +1254,7 @@ async def setup_mfa(mfa_data: MFASetup, current_user: User = Depends(get_current
         # Generate TOTP secret
         secret = generate_totp_secret()
         user.totp_secret = secret
-        db.commit()
+        await db.commit()
 
         # Generate provisioning URI for QR code
         provisioning_uri = get_totp_uri(secret, user.name)
@@ -1332,17 +1268,17 @@ async def setup_mfa(mfa_data: MFASetup, current_user: User = Depends(get_current
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"MFA setup failed: {str(e)}"
         )
 
 @router.post("/auth/mfa/verify")
-async def verify_mfa(mfa_data: MFAVerify, db: Session = Depends(get_db)):
+async def verify_mfa(mfa_data: MFAVerify, db: AsyncSession = Depends(get_async_db)):
     """Verify TOTP code for MFA"""
     try:
-        user = db.query(User).filter(User.id == uuid.UUID(mfa_data.user_id)).first()
+        user = await db.scalar(select(User).where(User.id == uuid.UUID(mfa_data.user_id)))
 
         if not user or not user.totp_secret:
             raise HTTPException(
@@ -1375,12 +1311,12 @@ async def verify_mfa(mfa_data: MFAVerify, db: Session = Depends(get_db)):
 async def create_objective(
     objective: ObjectiveCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new objective"""
     try:
         # Check access control
-        if not check_objective_access(current_user, db, "create_objective"):
+        if not await check_objective_access(current_user, db, "create_objective"):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied: Insufficient permissions to create objectives"
@@ -1399,7 +1335,7 @@ async def create_objective(
         # Create ad-hoc squad if not provided
         squad_id = objective.squad_id
         if not squad_id:
-            squad_id = create_adhoc_squad(db, objective.guild_id, str(current_user.id))
+            squad_id = await create_adhoc_squad(db, objective.guild_id, str(current_user.id))
 
         # Convert allowed_ranks from strings to UUIDs
         allowed_rank_uuids = []
@@ -1421,73 +1357,42 @@ async def create_objective(
             lead_id=current_user.id  # Set creator as lead
         )
 
-        # Link categories via junction table
-        if objective.categories:
-            for category_id in objective.categories:
-                try:
-                    category_uuid = uuid.UUID(category_id)
-                    category = db.query(ObjectiveCategory).filter(
-                        ObjectiveCategory.id == category_uuid,
-                        ObjectiveCategory.guild_id == guild_uuid
-                    ).first()
-                    if category:
-                        new_objective.categories.append(category)
-                except ValueError:
-                    # If it's not a valid UUID, try treating it as a name (backward compatibility)
-                    category = db.query(ObjectiveCategory).filter(
-                        ObjectiveCategory.guild_id == guild_uuid,
-                        ObjectiveCategory.name == category_id
-                    ).first()
-                    if category:
-                        new_objective.categories.append(category)
+        # Link categories via junction table (ids, or names for backward compatibility)
+        new_objective.categories = await load_categories(db, guild_uuid, objective.categories)
 
         db.add(new_objective)
-        db.commit()
-        db.refresh(new_objective)
+        publish_objective_event(db, "objective.created", new_objective)
+        await db.commit()
 
         # Return the complete objective data
-        return {
-            "id": str(new_objective.id),
-            "guild_id": str(new_objective.guild_id),
-            "name": new_objective.name,
-            "description": new_objective.description,
-            "preferences": new_objective.preferences,
-            "categories": [str(cat.id) for cat in new_objective.categories],
-            "priority": new_objective.priority,
-            "allowed_ranks": [str(rank_id) for rank_id in new_objective.allowed_ranks],
-            "progress": new_objective.progress,
-            "tasks": [str(task_id) for task_id in new_objective.tasks],
-            "lead_id": str(new_objective.lead_id) if new_objective.lead_id else None,
-            "squad_id": str(new_objective.squad_id) if new_objective.squad_id else None,
-            "is_deleted": new_objective.is_deleted
-        }
+        return serialize_objective(new_objective)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create objective: {str(e)}")
 
 @router.get("/objectives/{objective_id}")
 async def get_objective(
     objective_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get objective details"""
     try:
         # Check access control
-        if not check_objective_access(current_user, db, "view_objectives"):
+        if not await check_objective_access(current_user, db, "view_objectives"):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied: Insufficient permissions to view objectives"
             )
 
         obj_uuid = uuid.UUID(objective_id)
-        objective = db.query(Objective).filter(
-            Objective.id == obj_uuid,
-            Objective.is_deleted == False
-        ).first()
+        objectives, rank_names = await load_objectives(
+            db, objective_query(Objective.id == obj_uuid, Objective.is_deleted == False)
+        )
 
-        if not objective:
+        if not objectives:
             raise HTTPException(status_code=404, detail="Objective not found")
+        objective = objectives[0]
 
         # Verify user belongs to the guild
         if str(current_user.guild_id) != str(objective.guild_id):
@@ -1496,27 +1401,10 @@ async def get_objective(
                 detail="Access denied: User does not belong to this guild"
             )
 
-        # Get rank name mapping for this guild
-        guild_uuid = objective.guild_id
-        existing_ranks = db.query(Rank).filter(Rank.guild_id == guild_uuid).all()
-        rank_id_to_name = {str(rank.id): rank.name for rank in existing_ranks}
-
-        result = {
-            "id": str(objective.id),
-            "name": objective.name,
-            "description": objective.description,
-            "categories": [str(cat.id) for cat in objective.categories],
-            "priority": objective.priority,
-            "progress": objective.progress,
-            "allowed_ranks": [rank_id_to_name.get(str(rank_id), str(rank_id)) for rank_id in objective.allowed_ranks],
-            "allowed_rank_ids": [str(rank_id) for rank_id in objective.allowed_ranks],
-            "tasks": objective.tasks,
-            "lead_id": str(objective.lead_id) if objective.lead_id else None,
-            "squad_id": str(objective.squad_id) if objective.squad_id else None,
-            "guild_id": str(objective.guild_id)
-        }
+        result = serialize_objective_summary(objective, rank_names)
+        result["tasks"] = [str(task_id) for task_id in objective.tasks or []]
 
-        logger.info(f"Returning single objective {objective_id}: allowed_ranks={result['allowed_ranks']}, allowed_rank_ids={result['allowed_rank_ids']}")
+        logger.info("Returning single objective %s: allowed_ranks=%s, allowed_rank_ids=%s", objective_id, result['allowed_ranks'], result['allowed_rank_ids'])
         return result
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid objective ID format")
@@ -1529,22 +1417,19 @@ async def update_objective(
     objective_id: str,
     objective_data: dict,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update objective details and progress"""
     try:
         # Check access control
-        if not check_objective_access(current_user, db, "manage_objectives"):
+        if not await check_objective_access(current_user, db, "manage_objectives"):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied: Insufficient permissions to update objectives"
             )
 
         obj_uuid = uuid.UUID(objective_id)
-        objective = db.query(Objective).filter(
-            Objective.id == obj_uuid,
-            Objective.is_deleted == False
-        ).first()
+        objective = await db.scalar(objective_query(Objective.id == obj_uuid, Objective.is_deleted == False))
 
         if not objective:
             raise HTTPException(status_code=404, detail="Objective not found")
@@ -1555,22 +1440,20 @@ async def update_objective(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied: User does not belong to this guild"
             )
+        previous_ranks = list(objective.allowed_ranks or [])
 
         # Update fields from the objective_data dict
         
         # NOTE: There is a potential issue here with handling null values.
         # The new update_objective flow now runs whenever a key is present in 
         # objective_data, even if the payload explicitly sets the field to null. 
-        # For example, a request body { "progress": null } will assign 
-        # objective.progress = None and immediately call 
-        # update_tasks_on_objective_progress, which calls .get on the progress 
-        # dict and raises 'NoneType' object has no attribute 'get'. 
         # Previously the ObjectiveUpdate model ignored None values and skipped 
-        # the update. The same pattern occurs for categories and allowed_ranks a 
-        # few lines below, where the code iterates over a None value. 
+        # the update. For categories and allowed_ranks a few lines below, the
+        # code iterates over a None value ({ "progress": null } is tolerated by
+        # update_tasks_on_objective_progress). 
         # This turns valid null updates into 500 errors and prevents clients 
         # from clearing fields. Consider checking that each value is not None 
-        # before mutating or invoking the helper.
+        # before mutating.
 
         if 'name' in objective_data:
             objective.name = objective_data['name']
@@ -1580,30 +1463,12 @@ async def update_objective(
 
         if 'progress' in objective_data:
             objective.progress = objective_data['progress']
-            # Progress tracking: update related tasks
+            # Progress tracking: update related tasks in the same transaction
             await update_tasks_on_objective_progress(db, objective)
 
         if 'categories' in objective_data:
-            # Clear existing categories and add new ones
-            objective.categories.clear()
-            guild_uuid = objective.guild_id
-            for category_id in objective_data['categories']:
-                try:
-                    category_uuid = uuid.UUID(category_id)
-                    category = db.query(ObjectiveCategory).filter(
-                        ObjectiveCategory.id == category_uuid,
-                        ObjectiveCategory.guild_id == guild_uuid
-                    ).first()
-                    if category:
-                        objective.categories.append(category)
-                except ValueError:
-                    # If it's not a valid UUID, try treating it as a name (backward compatibility)
-                    category = db.query(ObjectiveCategory).filter(
-                        ObjectiveCategory.guild_id == guild_uuid,
-                        ObjectiveCategory.name == category_id
-                    ).first()
-                    if category:
-                        objective.categories.append(category)
+            # Replace categories (ids, or names for backward compatibility)
+            objective.categories = await load_categories(db, objective.guild_id, objective_data['categories'])
 
         if 'priority' in objective_data:
             objective.priority = objective_data['priority']
@@ -1615,43 +1480,30 @@ async def update_objective(
             except ValueError as e:
                 raise HTTPException(status_code=400, detail=f"Invalid rank ID format: {str(e)}")
 
-        db.commit()
-        db.refresh(objective)
+        publish_objective_event(db, "objective.updated", objective, previous_allowed_ranks=previous_ranks)
+        await db.commit()
 
         # Return the updated objective data
-        return {
-            "id": str(objective.id),
-            "guild_id": str(objective.guild_id),
-            "name": objective.name,
-            "description": objective.description,
-            "preferences": objective.preferences,
-            "categories": [str(cat.id) for cat in objective.categories],
-            "priority": objective.priority,
-            "allowed_ranks": [str(rank_id) for rank_id in objective.allowed_ranks],
-            "progress": objective.progress,
-            "tasks": [str(task_id) for task_id in objective.tasks],
-            "lead_id": str(objective.lead_id) if objective.lead_id else None,
-            "squad_id": str(objective.squad_id) if objective.squad_id else None,
-            "is_deleted": objective.is_deleted
-        }
+        return serialize_objective(objective)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid objective ID format")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to update objective: {str(e)}")
 
 @router.patch("/objectives/{objective_id}")
-async def patch_objective(objective_id: str, update: ObjectiveUpdate, db: Session = Depends(get_db)):
+async def patch_objective(objective_id: str, update: ObjectiveUpdate, db: AsyncSession = Depends(get_async_db)):
     """Update objective progress or description (partial update)"""
     try:
         obj_uuid = uuid.UUID(objective_id)
-        objective = db.query(Objective).filter(Objective.id == obj_uuid).first()
+        objective = await db.scalar(objective_query(Objective.id == obj_uuid))
 
         # Log the patch request for debugging
-        logger.info(f"PATCH objective update request for {objective_id}: allowed_ranks={update.allowed_ranks}")
+        logger.info("PATCH objective update request for %s: allowed_ranks=%s", objective_id, update.allowed_ranks)
 
         if not objective:
             raise HTTPException(status_code=404, detail="Objective not found")
+        previous_ranks = list(objective.allowed_ranks or [])
 
         if update.description:
             # Merge with existing description
@@ -1666,64 +1518,50 @@ async def patch_objective(objective_id: str, update: ObjectiveUpdate, db: Sessio
             objective.progress = current_progress
 
         if update.categories:
-            objective.categories = update.categories
+            objective.categories = await load_categories(db, objective.guild_id, update.categories)
 
         if update.priority:
             objective.priority = update.priority
 
         if update.allowed_ranks is not None:
-            logger.info(f"PATCH: Updating allowed_ranks for objective {objective_id}: {update.allowed_ranks}")
+            logger.info("PATCH: Updating allowed_ranks for objective %s: %s", objective_id, update.allowed_ranks)
             # Convert string UUIDs to UUID objects for database storage
             try:
                 objective.allowed_ranks = [uuid.UUID(rank_id) for rank_id in update.allowed_ranks]
             except ValueError as e:
                 raise HTTPException(status_code=400, detail=f"Invalid rank ID format: {str(e)}")
 
-        db.commit()
-        db.refresh(objective)
+        publish_objective_event(db, "objective.updated", objective, previous_allowed_ranks=previous_ranks)
+        await db.commit()
 
         # Return the updated objective data
-        return {
-            "id": str(objective.id),
-            "guild_id": str(objective.guild_id),
-            "name": objective.name,
-            "description": objective.description,
-            "preferences": objective.preferences,
-            "categories": [str(cat.id) for cat in objective.categories],
-            "priority": objective.priority,
-            "allowed_ranks": [str(rank_id) for rank_id in objective.allowed_ranks],
-            "progress": objective.progress,
-            "tasks": [str(task_id) for task_id in objective.tasks],
-            "lead_id": str(objective.lead_id) if objective.lead_id else None,
-            "squad_id": str(objective.squad_id) if objective.squad_id else None,
-            "is_deleted": objective.is_deleted
-        }
+        return serialize_objective(objective)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid objective ID format")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to update objective: {str(e)}")
 
 @router.delete("/objectives/{objective_id}")
 async def delete_objective(
     objective_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Soft delete an objective"""
     try:
         # Check access control
-        if not check_objective_access(current_user, db, "manage_objectives"):
+        if not await check_objective_access(current_user, db, "manage_objectives"):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied: Insufficient permissions to delete objectives"
             )
 
         obj_uuid = uuid.UUID(objective_id)
-        objective = db.query(Objective).filter(
+        objective = await db.scalar(select(Objective).where(
             Objective.id == obj_uuid,
             Objective.is_deleted == False
-        ).first()
+        ))
 
         if not objective:
             raise HTTPException(status_code=404, detail="Objective not found")
@@ -1737,7 +1575,8 @@ async def delete_objective(
 
         # Soft delete
         objective.is_deleted = True
-        db.commit()
+        publish_objective_event(db, "objective.deleted", objective)
+        await db.commit()
 
         return {
             "message": "Objective deleted successfully",
@@ -1746,15 +1585,15 @@ async def delete_objective(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid objective ID format")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to delete objective: {str(e)}")
 
 @router.patch("/objectives/{objective_id}/progress")
-async def update_objective_progress(objective_id: str, progress: ProgressUpdate, db: Session = Depends(get_db)):
+async def update_objective_progress(objective_id: str, progress: ProgressUpdate, db: AsyncSession = Depends(get_async_db)):
     """Update objective progress with parsed metrics"""
     try:
         obj_uuid = uuid.UUID(objective_id)
-        objective = db.query(Objective).filter(Objective.id == obj_uuid).first()
+        objective = await db.scalar(select(Objective).where(Objective.id == obj_uuid))
 
         if not objective:
             raise HTTPException(status_code=404, detail="Objective not found")
@@ -1771,7 +1610,8 @@ async def update_objective_progress(objective_id: str, progress: ProgressUpdate,
         current_progress.update(progress.metrics)
         objective.progress = current_progress
 
-        db.commit()
+        publish_objective_event(db, "objective.progress", objective)
+        await db.commit()
 
         return {
             "message": "Progress updated successfully",
@@ -1780,11 +1620,11 @@ async def update_objective_progress(objective_id: str, progress: ProgressUpdate,
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid objective ID format")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to update progress: {str(e)}")
 
 @router.post("/tasks")
-async def create_task(task: TaskCreate, db: Session = Depends(get_db)):
+async def create_task(task: TaskCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new task"""
     try:
         task_id = uuid.uuid4()
@@ -1794,7 +1634,7 @@ async def create_task(task: TaskCreate, db: Session = Depends(get_db)):
         # Create ad-hoc squad if not provided
         squad_id = task.squad_id
         if not squad_id:
-            squad_id = create_adhoc_squad(db, task.guild_id, None)  # No user_id for ad-hoc
+            squad_id = await create_adhoc_squad(db, task.guild_id, None)  # No user_id for ad-hoc
 
         new_task = Task(
             id=task_id,
@@ -1807,7 +1647,7 @@ async def create_task(task: TaskCreate, db: Session = Depends(get_db)):
         )
 
         db.add(new_task)
-        db.commit()
+        await db.commit()
 
         return {
             "id": str(task_id),
@@ -1815,17 +1655,17 @@ async def create_task(task: TaskCreate, db: Session = Depends(get_db)):
             "tts_response": f"Task created: {task.name}"
         }
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create task: {str(e)}")
 
 @router.post("/tasks/assign")
-async def assign_task(assignment: TaskAssign, db: Session = Depends(get_db)):
+async def assign_task(assignment: TaskAssign, db: AsyncSession = Depends(get_async_db)):
     """Assign task to user/squad"""
     try:
         task_uuid = uuid.UUID(assignment.task_id)
         user_uuid = uuid.UUID(assignment.user_id)
 
-        task = db.query(Task).filter(Task.id == task_uuid).first()
+        task = await db.scalar(select(Task).where(Task.id == task_uuid))
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
 
@@ -1833,7 +1673,15 @@ async def assign_task(assignment: TaskAssign, db: Session = Depends(get_db)):
         if assignment.squad_id:
             task.squad_id = uuid.UUID(assignment.squad_id)
 
-        db.commit()
+        # Tasks are visible to the ranks of their objective
+        allowed_ranks = await db.scalar(select(Objective.allowed_ranks).where(Objective.id == task.objective_id))
+        publish_event(db, task.guild_id, "task.assigned", {
+            "id": str(task.id),
+            "objective_id": str(task.objective_id),
+            "lead_id": str(task.lead_id),
+            "squad_id": str(task.squad_id) if task.squad_id else None,
+        }, allowed_ranks=allowed_ranks or [])
+        await db.commit()
 
         return {
             "message": "Task assigned successfully",
@@ -1842,21 +1690,21 @@ async def assign_task(assignment: TaskAssign, db: Session = Depends(get_db)):
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid ID format")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to assign task: {str(e)}")
 
 @router.patch("/tasks/{task_id}/schedule")
-async def schedule_task(task_id: str, schedule_data: TaskSchedule, db: Session = Depends(get_db)):
+async def schedule_task(task_id: str, schedule_data: TaskSchedule, db: AsyncSession = Depends(get_async_db)):
     """Schedule a task"""
     try:
         task_uuid = uuid.UUID(task_id)
-        task = db.query(Task).filter(Task.id == task_uuid).first()
+        task = await db.scalar(select(Task).where(Task.id == task_uuid))
 
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
 
         task.schedule = schedule_data.schedule
-        db.commit()
+        await db.commit()
 
         return {
             "message": "Task scheduled successfully",
@@ -1865,23 +1713,25 @@ async def schedule_task(task_id: str, schedule_data: TaskSchedule, db: Session =
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid task ID format")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to schedule task: {str(e)}")
 
 @router.get("/objectives")
 async def get_objectives(
+    response: Response,
     guild_id: str = None,
     status: str = None,
     category: str = None,
     category_id: str = None,
     rank_filter: str = None,
+    page: PageParams = Depends(),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get objectives for a guild with optional filtering"""
+    """Get a page of objectives for a guild with optional filtering"""
     try:
         # Check access control
-        if not check_objective_access(current_user, db, "view_objectives"):
+        if not await check_objective_access(current_user, db, "view_objectives"):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied: Insufficient permissions to view objectives"
@@ -1899,147 +1749,128 @@ async def get_objectives(
             )
 
         guild_uuid = uuid.UUID(guild_id)
-        query = db.query(Objective).filter(
+        query = objective_query(
             Objective.guild_id == guild_uuid,
             Objective.is_deleted == False
         )
 
         # Filter by category name if provided (join with categories)
         if category:
-            query = query.join(Objective.categories).filter(ObjectiveCategory.name == category)
+            query = query.join(Objective.categories).where(ObjectiveCategory.name == category)
 
         # Filter by category_id if provided (join with categories)
         if category_id:
             category_uuid = uuid.UUID(category_id)
-            query = query.join(Objective.categories).filter(ObjectiveCategory.id == category_uuid)
+            query = query.join(Objective.categories).where(ObjectiveCategory.id == category_uuid)
 
-        objectives = query.all()
-
-        # Filter by status if provided (status derived from progress)
+        # Filter by status if provided (status derived from progress, indexed expression)
         if status:
-            filtered_objectives = []
-            for obj in objectives:
-                obj_status = obj.progress.get("status", "active")  # Default to active
-                if obj_status == status:
-                    filtered_objectives.append(obj)
-            objectives = filtered_objectives
+            query = query.where(OBJECTIVE_STATUS == status)
 
         # Filter by rank_filter if provided (admin only)
         if rank_filter:
             # Check if user has admin access for rank filtering
-            if not check_admin_access(current_user, db):
+            if not await check_admin_access(current_user, db):
                 raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
+                    status_code=403,
                     detail="Access denied: Admin access required for rank filtering"
                 )
             rank_uuid = uuid.UUID(rank_filter)
-            filtered_objectives = []
-            for obj in objectives:
-                # Convert UUIDs to strings for comparison
-                allowed_ranks_str = [str(rank_id) for rank_id in obj.allowed_ranks]
-                if str(rank_uuid) in allowed_ranks_str:
-                    filtered_objectives.append(obj)
-            objectives = filtered_objectives
+            # Containment (@>) so the GIN index on allowed_ranks can be used
+            query = query.where(Objective.allowed_ranks.contains([rank_uuid]))
 
         # Apply rank-based visibility filtering (non-admin users)
         # Check for super_admin bypass
-        user_access_levels = db.query(UserAccess).filter(UserAccess.user_id == current_user.id).all()
-        has_super_admin = any(
-            db.query(AccessLevel).filter(AccessLevel.id == ua.access_level_id, AccessLevel.name == 'super_admin').first()
-            for ua in user_access_levels
-        )
-
-        if not has_super_admin:
-            # Filter objectives where user's rank is in allowed_ranks
-            user_rank_id = str(current_user.rank) if current_user.rank else None
-            if user_rank_id:
-                filtered_objectives = []
-                for obj in objectives:
-                    # Convert UUIDs to strings for comparison
-                    allowed_ranks_str = [str(rank_id) for rank_id in obj.allowed_ranks]
-                    if user_rank_id in allowed_ranks_str:
-                        filtered_objectives.append(obj)
-                objectives = filtered_objectives
+        if not await has_super_admin_access(current_user, db):
+            if current_user.rank:
+                # Only objectives where user's rank is in allowed_ranks
+                query = query.where(Objective.allowed_ranks.contains([current_user.rank]))
             else:
                 # User has no rank, show only objectives with empty allowed_ranks (shouldn't happen normally)
-                objectives = [obj for obj in objectives if not obj.allowed_ranks]
-
-        # Get all existing ranks for this guild for name resolution and sanitization
-        existing_ranks = db.query(Rank).filter(Rank.guild_id == guild_uuid).all()
-        existing_rank_ids = {str(rank.id) for rank in existing_ranks}
-        rank_id_to_name = {str(rank.id): rank.name for rank in existing_ranks}
-
-        result = []
-        for obj in objectives:
-            sanitized_rank_ids = []
-            allowed_rank_names = []
-            for rank_id in obj.allowed_ranks:
-                rank_id_str = str(rank_id)
-                if rank_id_str in existing_rank_ids:
-                    sanitized_rank_ids.append(rank_id_str)
-                    allowed_rank_names.append(rank_id_to_name.get(rank_id_str, rank_id_str))
-
-            result.append({
-                "id": str(obj.id),
-                "name": obj.name,
-                "description": obj.description,
-                "categories": [str(cat.id) for cat in obj.categories],
-                "priority": obj.priority,
-                "progress": obj.progress,
-                "allowed_ranks": allowed_rank_names,
-                "allowed_rank_ids": sanitized_rank_ids,
-                "guild_id": str(obj.guild_id),
-                "lead_id": str(obj.lead_id) if obj.lead_id else None,
-                "squad_id": str(obj.squad_id) if obj.squad_id else None
-            })
+                query = query.where(or_(Objective.allowed_ranks.is_(None), func.cardinality(Objective.allowed_ranks) == 0))
 
-        return result
+        objectives, rank_names = await load_objectives(db, page.apply(query, Objective.id))
+        objectives = page.finish(objectives, response)
+
+        return [serialize_objective_summary(obj, rank_names) for obj in objectives]
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid guild ID format")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve objectives: {str(e)}")
 
+@router.get("/guilds/{guild_id}/events")
+async def stream_guild_events(
+    guild_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Server-Sent Events stream of objective, task and guild request changes in a guild"""
+    try:
+        guild_uuid = uuid.UUID(guild_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid guild ID format")
+
+    permissions = await get_effective_permissions(current_user, db)
+    if not permissions.allows("view_objectives"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied: Insufficient permissions to view objectives"
+        )
+
+    # Verify user belongs to the guild
+    if str(current_user.guild_id) != guild_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied: User does not belong to this guild"
+        )
+
+    subscription = guild_events.subscribe(guild_uuid, current_user.id, current_user.rank, permissions)
+    # The stream stays open for as long as the client listens; release the connection now
+    await db.close()
+    return StreamingResponse(
+        event_stream(subscription, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @router.get("/guilds/{guild_id}/objectives/recent")
-async def get_recent_objectives(guild_id: str, limit: int = 5, db: Session = Depends(get_db)):
+async def get_recent_objectives(guild_id: str, limit: int = 5, db: AsyncSession = Depends(get_async_db)):
     """Get recent objectives for a guild"""
     try:
         if not guild_id:
             raise HTTPException(status_code=400, detail="guild_id parameter required")
 
         guild_uuid = uuid.UUID(guild_id)
-        objectives = db.query(Objective).filter(
-            Objective.guild_id == guild_uuid
-        ).limit(limit).all()
+        objectives, rank_names = await load_objectives(
+            db, objective_query(Objective.guild_id == guild_uuid).limit(limit)
+        )
 
-        return [
-            {
-                "id": str(obj.id),
-                "name": obj.name,
-                "description": obj.description,
-                "categories": [str(cat.id) for cat in obj.categories],
-                "priority": obj.priority,
-                "guild_id": str(obj.guild_id)
-            }
-            for obj in objectives
-        ]
+        return [serialize_objective_summary(obj, rank_names) for obj in objectives]
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid guild ID format")
 
 @router.get("/tasks")
-async def get_tasks(guild_id: str = None, assignee: str = None, db: Session = Depends(get_db)):
-    """Get tasks for a guild, optionally filtered by assignee"""
+async def get_tasks(
+    response: Response,
+    guild_id: str = None,
+    assignee: str = None,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a page of tasks for a guild, optionally filtered by assignee"""
     try:
         if not guild_id:
             raise HTTPException(status_code=400, detail="guild_id parameter required")
 
         guild_uuid = uuid.UUID(guild_id)
-        query = db.query(Task).filter(Task.guild_id == guild_uuid)
+        query = select(Task).where(Task.guild_id == guild_uuid)
 
         if assignee:
             assignee_uuid = uuid.UUID(assignee)
-            query = query.filter(Task.lead_id == assignee_uuid)
+            query = query.where(Task.lead_id == assignee_uuid)
 
-        tasks = query.all()
+        tasks = page.finish((await db.scalars(page.apply(query, Task.id))).all(), response)
 
         return [
             {
@@ -2058,12 +1889,29 @@ async def get_tasks(guild_id: str = None, assignee: str = None, db: Session = De
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid ID format")
 
+@router.get("/jobs/{job_id}")
+async def get_job_status(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_primary_db)
+):
+    """Status of a background job started by the current user"""
+    try:
+        job_uuid = uuid.UUID(job_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid job ID format")
+
+    job = await get_job(db, job_uuid)
+    if not job or job.created_by != current_user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return serialize_job(job)
+
 @router.get("/guilds/{guild_id}")
-async def get_guild(guild_id: str, db: Session = Depends(get_db)):
+async def get_guild(guild_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get guild details"""
     try:
         guild_uuid = uuid.UUID(guild_id)
-        guild = db.query(Guild).filter(Guild.id == guild_uuid).first()
+        guild = await db.scalar(select(Guild).where(Guild.id == guild_uuid, Guild.is_active == True))
 
         if not guild:
             raise HTTPException(status_code=404, detail="Guild not found")
@@ -2081,7 +1929,7 @@ async def get_guild(guild_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Invalid guild ID format")
 
 @router.post("/invites")
-async def create_invite(invite_data: dict, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def create_invite(invite_data: dict, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     """Create a new invite for a guild"""
     try:
         guild_uuid = uuid.UUID(invite_data["guild_id"])
@@ -2094,18 +1942,15 @@ async def create_invite(invite_data: dict, current_user: User = Depends(get_curr
             )
 
         # Check member limit before creating invite
-        guild = db.query(Guild).filter(Guild.id == guild_uuid).first()
+        guild = await db.scalar(select(Guild).where(Guild.id == guild_uuid, Guild.is_active == True))
         if not guild:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Guild not found"
             )
 
-        # Count approved members (users with approved guild requests)
-        approved_count = db.query(GuildRequest).filter(
-            GuildRequest.guild_id == guild.id,
-            GuildRequest.status == "approved"
-        ).count()
+        # Approved members (users with approved guild requests)
+        approved_count = guild.approved_member_count
 
         if approved_count >= guild.member_limit:
             raise HTTPException(
@@ -2131,10 +1976,10 @@ async def create_invite(invite_data: dict, current_user: User = Depends(get_curr
         )
 
         db.add(invite)
-        db.commit()
+        await db.commit()
 
         # Get guild name for response
-        guild = db.query(Guild).filter(Guild.id == invite.guild_id).first()
+        guild = await db.scalar(select(Guild).where(Guild.id == invite.guild_id))
         guild_name = guild.name if guild else "Unknown Guild"
 
         return {
@@ -2149,18 +1994,18 @@ async def create_invite(invite_data: dict, current_user: User = Depends(get_curr
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create invite: {str(e)}"
         )
 
 @router.get("/guilds/{guild_id}/ai-commander")
-async def get_ai_commander(guild_id: str, db: Session = Depends(get_db)):
+async def get_ai_commander(guild_id: str, db: AsyncSession = Depends(get_async_primary_db)):
     """Get AI Commander configuration for guild"""
     try:
         guild_uuid = uuid.UUID(guild_id)
-        commander = db.query(AICommander).filter(AICommander.guild_id == guild_uuid).first()
+        commander = await db.scalar(select(AICommander).where(AICommander.guild_id == guild_uuid))
 
         if not commander:
             # Create default commander if none exists
@@ -2171,7 +2016,7 @@ async def get_ai_commander(guild_id: str, db: Session = Depends(get_db)):
                 system_prompt="Act as a UEE Commander, coordinating Star Citizen guild missions with formal, strategic responses."
             )
             db.add(commander)
-            db.commit()
+            await db.commit()
 
         return {
             "id": str(commander.id),
@@ -2188,12 +2033,12 @@ async def update_ai_commander(
     guild_id: str,
     update_data: AICommanderUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update AI Commander configuration (admin only)"""
     try:
         # Check if user has admin access
-        if not check_admin_access(current_user, db):
+        if not await check_admin_access(current_user, db):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Admin access required to modify AI Commander configuration"
@@ -2207,7 +2052,7 @@ async def update_ai_commander(
             )
 
         guild_uuid = uuid.UUID(guild_id)
-        commander = db.query(AICommander).filter(AICommander.guild_id == guild_uuid).first()
+        commander = await db.scalar(select(AICommander).where(AICommander.guild_id == guild_uuid))
 
         if not commander:
             # Create commander if none exists
@@ -2226,7 +2071,7 @@ async def update_ai_commander(
         if update_data.phonetic is not None:
             commander.phonetic = update_data.phonetic
 
-        db.commit()
+        await db.commit()
 
         return {
             "message": "AI Commander configuration updated successfully",
@@ -2241,7 +2086,7 @@ async def update_ai_commander(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid guild ID format")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update AI Commander: {str(e)}"
@@ -2252,12 +2097,12 @@ async def update_ai_commander(
 async def create_category(
     category: CategoryCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new category"""
     try:
         # Check access control
-        if not check_category_access(current_user, db, "create_category"):
+        if not await check_category_access(current_user, db, "create_category"):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied: Insufficient permissions to create categories"
@@ -2281,7 +2126,7 @@ async def create_category(
         )
 
         db.add(new_category)
-        db.commit()
+        await db.commit()
 
         return {
             "id": str(cat_id),
@@ -2289,26 +2134,26 @@ async def create_category(
             "tts_response": f"Category created: {category.name}"
         }
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create category: {str(e)}")
 
 @router.get("/categories/{category_id}")
 async def get_category(
     category_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get category details"""
     try:
         # Check access control
-        if not check_category_access(current_user, db, "view_categories"):
+        if not await check_category_access(current_user, db, "view_categories"):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied: Insufficient permissions to view categories"
             )
 
         cat_uuid = uuid.UUID(category_id)
-        category = db.query(ObjectiveCategory).filter(ObjectiveCategory.id == cat_uuid).first()
+        category = await db.scalar(select(ObjectiveCategory).where(ObjectiveCategory.id == cat_uuid))
 
         if not category:
             raise HTTPException(status_code=404, detail="Category not found")
@@ -2336,19 +2181,19 @@ async def update_category(
     category_id: str,
     update: CategoryUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update category details"""
     try:
         # Check access control
-        if not check_category_access(current_user, db, "manage_categories"):
+        if not await check_category_access(current_user, db, "manage_categories"):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied: Insufficient permissions to update categories"
             )
 
         cat_uuid = uuid.UUID(category_id)
-        category = db.query(ObjectiveCategory).filter(ObjectiveCategory.id == cat_uuid).first()
+        category = await db.scalar(select(ObjectiveCategory).where(ObjectiveCategory.id == cat_uuid))
 
         if not category:
             raise HTTPException(status_code=404, detail="Category not found")
@@ -2366,7 +2211,7 @@ async def update_category(
         if update.description is not None:
             category.description = update.description
 
-        db.commit()
+        await db.commit()
 
         return {
             "message": "Category updated successfully",
@@ -2375,26 +2220,26 @@ async def update_category(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid category ID format")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to update category: {str(e)}")
 
 @router.delete("/categories/{category_id}")
 async def delete_category(
     category_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a category and unlink it from all objectives"""
     try:
         # Check access control
-        if not check_category_access(current_user, db, "manage_categories"):
+        if not await check_category_access(current_user, db, "manage_categories"):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied: Insufficient permissions to delete categories"
             )
 
         cat_uuid = uuid.UUID(category_id)
-        category = db.query(ObjectiveCategory).filter(ObjectiveCategory.id == cat_uuid).first()
+        category = await db.scalar(select(ObjectiveCategory).where(ObjectiveCategory.id == cat_uuid))
 
         if not category:
             raise HTTPException(status_code=404, detail="Category not found")
@@ -2407,13 +2252,20 @@ async def delete_category(
             )
 
         # Unlink category from all objectives (clear relationships)
-        objectives_with_category = db.query(Objective).join(Objective.categories).filter(ObjectiveCategory.id == cat_uuid).all()
+        objectives_with_category = (
+            await db.scalars(
+                select(Objective)
+                .options(selectinload(Objective.categories))
+                .join(Objective.categories)
+                .where(ObjectiveCategory.id == cat_uuid)
+            )
+        ).all()
         for objective in objectives_with_category:
             objective.categories.remove(category)
 
         # Delete the category
-        db.delete(category)
-        db.commit()
+        await db.delete(category)
+        await db.commit()
 
         return {
             "message": "Category deleted successfully",
@@ -2422,21 +2274,23 @@ async def delete_category(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid category ID format")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to delete category: {str(e)}")
 
 @router.get("/categories")
 async def get_categories(
+    response: Response,
     guild_id: str = None,
     name: str = None,
     description: str = None,
+    page: PageParams = Depends(),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get categories for a guild with optional filtering"""
+    """Get a page of categories for a guild with optional filtering"""
     try:
         # Check access control
-        if not check_category_access(current_user, db, "view_categories"):
+        if not await check_category_access(current_user, db, "view_categories"):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied: Insufficient permissions to view categories"
@@ -2454,15 +2308,15 @@ async def get_categories(
             )
 
         guild_uuid = uuid.UUID(guild_id)
-        query = db.query(ObjectiveCategory).filter(ObjectiveCategory.guild_id == guild_uuid)
+        query = select(ObjectiveCategory).where(ObjectiveCategory.guild_id == guild_uuid)
 
         # Apply filters
         if name:
-            query = query.filter(ObjectiveCategory.name.ilike(f"%{name}%"))
+            query = query.where(ObjectiveCategory.name.ilike(f"%{name}%"))
         if description:
-            query = query.filter(ObjectiveCategory.description.ilike(f"%{description}%"))
+            query = query.where(ObjectiveCategory.description.ilike(f"%{description}%"))
 
-        categories = query.all()
+        categories = page.finish((await db.scalars(page.apply(query, ObjectiveCategory.id))).all(), response)
 
         return [
             {
@@ -1,5 +1,68 @@
 """Utility helpers for API-level shared logic."""
 
+from .events import event_stream, guild_events, publish_event, publish_objective_event
+from .guild_deletion import guild_deletion_status, start_guild_deletion
+from .guild_templates import (
+    GuildTemplate,
+    create_guild_from_template,
+    get_guild_template,
+    register_guild_template,
+)
+from .hashing import hash_secret, hashing_stats, needs_rehash, run_hashing, verify_secret
+from .membership import delete_guild_memberships
+from .objectives import (
+    load_categories,
+    load_objectives,
+    load_rank_names,
+    objective_query,
+    serialize_objective,
+    serialize_objective_summary,
+    update_tasks_on_objective_progress,
+)
+from .pagination import NEXT_CURSOR_HEADER, PageParams
+from .permissions import (
+    EffectivePermissions,
+    get_effective_permissions,
+    invalidate_permission_cache,
+    issue_permission_claims,
+    remember_token_claims,
+)
 from .security import has_super_admin_access
+from .user_cache import attach_user, invalidate_user_cache, load_user_row
 
-__all__ = ["has_super_admin_access"]
+__all__ = [
+    "EffectivePermissions",
+    "GuildTemplate",
+    "NEXT_CURSOR_HEADER",
+    "PageParams",
+    "attach_user",
+    "create_guild_from_template",
+    "delete_guild_memberships",
+    "event_stream",
+    "get_effective_permissions",
+    "get_guild_template",
+    "guild_deletion_status",
+    "guild_events",
+    "has_super_admin_access",
+    "hash_secret",
+    "hashing_stats",
+    "invalidate_permission_cache",
+    "invalidate_user_cache",
+    "issue_permission_claims",
+    "load_categories",
+    "load_objectives",
+    "load_rank_names",
+    "load_user_row",
+    "needs_rehash",
+    "objective_query",
+    "publish_event",
+    "publish_objective_event",
+    "register_guild_template",
+    "remember_token_claims",
+    "run_hashing",
+    "serialize_objective",
+    "serialize_objective_summary",
+    "start_guild_deletion",
+    "update_tasks_on_objective_progress",
+    "verify_secret",
+]
@@ -0,0 +1,341 @@
+"""Per-guild change events pushed to clients over Server-Sent Events.
+
+Routes call ``publish_event`` while they change objectives, tasks or guild
+requests. Events wait on the session and go out with one ``pg_notify``
+statement just before the transaction commits, so PostgreSQL delivers them
+only if the change commits, and to every API process. Each process holds one
+``LISTEN`` connection (``GuildEventHub``) and fans events out in memory to
+the ``GET /api/guilds/{guild_id}/events`` streams of that guild. A stream
+only receives what its subscriber may see: objective and task events follow
+the rank rule of ``GET /api/objectives``, and an event can require an action.
+
+Nothing is replayed. Clients (re)fetch their lists on every ``resync``
+event: the first one arrives once the stream is live, others follow a lost
+listener connection or a client that fell too far behind.
+
+Access is checked again from the database every keepalive interval, so rank
+and permission changes apply to open streams, and a subscriber who left the
+guild or lost ``view_objectives`` gets ``access_revoked`` and the stream ends.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, event, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.types import Text
+
+from app.core.models import AsyncSessionLocal, Objective, User, get_async_engine
+
+from .permissions import EffectivePermissions, refresh_effective_permissions
+
+logger = logging.getLogger(__name__)
+
+GUILD_EVENTS_CHANNEL = "guild_events"
+GUILD_EVENT_QUEUE_SIZE = int(os.getenv("GUILD_EVENT_QUEUE_SIZE", "100"))
+GUILD_EVENT_KEEPALIVE_SECONDS = float(os.getenv("GUILD_EVENT_KEEPALIVE_SECONDS", "15"))
+LISTEN_RETRY_SECONDS = 5
+
+EVENT_TYPES = frozenset({
+    "objective.created",
+    "objective.updated",
+    "objective.deleted",
+    "objective.progress",
+    "task.assigned",
+    "guild_request.created",
+    "guild_request.approved",
+})
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+_MAX_PAYLOAD = 7900
+_PENDING_KEY = "pending_guild_events"
+
+_NOTIFY = text(
+    "SELECT pg_notify(:channel, payload) FROM unnest(:payloads) AS payload"
+).bindparams(bindparam("payloads", type_=ARRAY(Text)))
+
+
+def publish_event(
+    db: AsyncSession,
+    guild_id: uuid.UUID,
+    event_type: str,
+    data: Dict[str, Any],
+    allowed_ranks: Optional[Iterable[uuid.UUID]] = None,
+    previous_allowed_ranks: Optional[Iterable[uuid.UUID]] = None,
+    requires: Optional[str] = None,
+) -> None:
+    """Queue an event on ``db``; it is sent if and when the transaction commits.
+
+    ``allowed_ranks`` limits it to subscribers who may see an objective with
+    those ranks. Subscribers who could see ``previous_allowed_ranks`` but not
+    the new ones get an ``objective.hidden`` event instead. ``requires`` is
+    an action the subscriber must be granted.
+    """
+    if event_type not in EVENT_TYPES:
+        raise ValueError(f"Unknown guild event type {event_type!r}")
+
+    payload: Dict[str, Any] = {
+        "type": event_type,
+        "guild_id": str(guild_id),
+        "at": datetime.utcnow().isoformat(),
+        "data": data,
+    }
+    if allowed_ranks is not None:
+        payload["allowed_ranks"] = [str(rank) for rank in allowed_ranks]
+    if previous_allowed_ranks is not None:
+        payload["previous_allowed_ranks"] = [str(rank) for rank in previous_allowed_ranks]
+    if requires:
+        payload["requires"] = requires
+    db.info.setdefault(_PENDING_KEY, []).append(payload)
+
+
+def publish_objective_event(
+    db: AsyncSession,
+    event_type: str,
+    objective: Objective,
+    previous_allowed_ranks: Optional[Iterable[uuid.UUID]] = None,
+) -> None:
+    data: Dict[str, Any] = {"id": str(objective.id)}
+    if event_type != "objective.deleted":
+        data.update({
+            "name": objective.name,
+            "priority": objective.priority,
+            "progress": objective.progress or {},
+            "allowed_rank_ids": [str(rank) for rank in objective.allowed_ranks or []],
+        })
+    publish_event(
+        db, objective.guild_id, event_type, data,
+        allowed_ranks=objective.allowed_ranks or [],
+        previous_allowed_ranks=previous_allowed_ranks,
+    )
+
+
+def encode_event(payload: Dict[str, Any]) -> str:
+    encoded = json.dumps(payload, default=str)
+    if len(encoded.encode()) > _MAX_PAYLOAD:
+        # Too big for NOTIFY: send the id only, clients fetch the rest
+        payload = {**payload, "data": {"id": payload["data"].get("id")}, "truncated": True}
+        encoded = json.dumps(payload, default=str)
+    return encoded
+
+
+@event.listens_for(Session, "before_commit")
+def _send_pending_events(session):
+    events = session.info.pop(_PENDING_KEY, None)
+    if events:
+        # Runs inside the transaction; NOTIFY is delivered on commit
+        session.execute(_NOTIFY, {"channel": GUILD_EVENTS_CHANNEL, "payloads": [encode_event(e) for e in events]})
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_events(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+class Subscription:
+    """One open event stream and what its subscriber may see."""
+
+    def __init__(self, guild_id: uuid.UUID, user_id: Optional[uuid.UUID], rank: Optional[uuid.UUID],
+                 permissions: EffectivePermissions):
+        self.guild_id = str(guild_id)
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=GUILD_EVENT_QUEUE_SIZE)
+        self.closed = False
+        self.update_access(rank, permissions)
+
+    def update_access(self, rank: Optional[uuid.UUID], permissions: EffectivePermissions) -> None:
+        self.rank = str(rank) if rank else None
+        self.permissions = permissions
+
+    def can_see(self, allowed_ranks: List[str]) -> bool:
+        # Same rule as GET /api/objectives
+        if self.permissions.is_super_admin:
+            return True
+        if self.rank is None:
+            return not allowed_ranks
+        return self.rank in allowed_ranks
+
+    def deliver(self, payload: Dict[str, Any]) -> None:
+        if self.closed:
+            return
+        requires = payload.get("requires")
+        if requires and not self.permissions.allows(requires):
+            return
+
+        allowed_ranks = payload.get("allowed_ranks")
+        if allowed_ranks is not None and not self.can_see(allowed_ranks):
+            previous = payload.get("previous_allowed_ranks")
+            if previous is None or not self.can_see(previous):
+                return
+            # The objective was just hidden from this subscriber; send its id only
+            payload = {"type": "objective.hidden", "guild_id": payload["guild_id"], "at": payload["at"],
+                       "data": {"id": payload["data"]["id"]}}
+        else:
+            payload = {key: value for key, value in payload.items()
+                       if key not in ("allowed_ranks", "previous_allowed_ranks", "requires")}
+        self.put(payload)
+
+    def put(self, payload: Dict[str, Any]) -> None:
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # A client this far behind refetches instead of catching up
+            self.closed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync", "guild_id": self.guild_id, "reason": "overflow"})
+
+
+class GuildEventHub:
+    """Fans NOTIFY payloads out to the subscriptions of this process."""
+
+    def __init__(self):
+        self._subscriptions: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._listener: Optional[asyncio.Task] = None
+        self._listening = False
+
+    def subscribe(self, guild_id: uuid.UUID, user_id: uuid.UUID, rank: Optional[uuid.UUID],
+                  permissions: EffectivePermissions) -> Subscription:
+        subscription = Subscription(guild_id, user_id, rank, permissions)
+        self._subscriptions[subscription.guild_id].add(subscription)
+        if self._listening:
+            subscription.put({"type": "resync", "guild_id": subscription.guild_id, "reason": "subscribed"})
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.guild_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.guild_id]
+
+    def dispatch(self, payload: str) -> None:
+        try:
+            event_payload = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed guild event: %.200s", payload)
+            return
+        for subscription in list(self._subscriptions.get(event_payload.get("guild_id"), ())):
+            subscription.deliver(event_payload)
+
+    def resync_all(self, reason: str) -> None:
+        for subscriptions in list(self._subscriptions.values()):
+            for subscription in list(subscriptions):
+                subscription.put({"type": "resync", "guild_id": subscription.guild_id, "reason": reason})
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        self.dispatch(payload)
+
+    async def _listen(self) -> None:
+        """Hold a LISTEN connection, reconnecting as needed."""
+        while True:
+            try:
+                async with get_async_engine().connect() as conn:
+                    raw = (await conn.get_raw_connection()).driver_connection
+                    lost = asyncio.Event()
+                    raw.add_termination_listener(lambda _: lost.set())
+                    await raw.add_listener(GUILD_EVENTS_CHANNEL, self._on_notify)
+                    self._listening = True
+                    # Nothing sent before this point reached the streams
+                    self.resync_all("connected")
+                    try:
+                        while not lost.is_set():
+                            try:
+                                await asyncio.wait_for(lost.wait(), GUILD_EVENT_KEEPALIVE_SECONDS)
+                            except asyncio.TimeoutError:
+                                # Also notices a connection that died silently
+                                await raw.fetchval("SELECT 1")
+                    finally:
+                        self._listening = False
+                        # Never hand a LISTENing connection back to the pool
+                        await conn.invalidate()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Guild event listener lost its connection")
+                await asyncio.sleep(LISTEN_RETRY_SECONDS)
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+
+guild_events = GuildEventHub()
+
+
+def format_sse(payload: Dict[str, Any]) -> str:
+    return f"event: {payload['type']}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+Access = Tuple[Optional[uuid.UUID], EffectivePermissions]
+
+
+async def check_access(subscription: Subscription) -> Optional[Access]:
+    """The subscriber's current rank and permissions, or None once they may no longer follow the guild."""
+    async with AsyncSessionLocal() as db:
+        user = await db.scalar(select(User).where(User.id == subscription.user_id))
+        # Same rule as GET /api/guilds/{guild_id}/events
+        if user is None or str(user.guild_id) != subscription.guild_id:
+            return None
+        permissions = await refresh_effective_permissions(user, db)
+        if not permissions.allows("view_objectives"):
+            return None
+        return user.rank, permissions
+
+
+async def event_stream(
+    subscription: Subscription,
+    is_disconnected: Callable[[], Awaitable[bool]],
+    hub: GuildEventHub = guild_events,
+    check: Callable[[Subscription], Awaitable[Optional[Access]]] = check_access,
+) -> AsyncIterator[str]:
+    """Server-Sent Events for one subscription, with keepalive comments and access checks."""
+    try:
+        yield f"retry: {int(LISTEN_RETRY_SECONDS * 1000)}\n\n"
+        checked = time.monotonic()
+        while True:
+            try:
+                payload = await asyncio.wait_for(subscription.queue.get(), GUILD_EVENT_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if await is_disconnected():
+                    return
+                payload = None
+
+            # On a timer rather than only when idle, so a busy stream is checked too
+            if time.monotonic() - checked >= GUILD_EVENT_KEEPALIVE_SECONDS:
+                checked = time.monotonic()
+                try:
+                    access = await check(subscription)
+                except Exception:
+                    logger.warning("Could not re-check guild event access for %s", subscription.user_id, exc_info=True)
+                    # Fail closed; the client reconnects and is authorized again
+                    yield format_sse({"type": "resync", "guild_id": subscription.guild_id, "reason": "unavailable"})
+                    return
+                if access is None:
+                    yield format_sse({"type": "access_revoked", "guild_id": subscription.guild_id})
+                    return
+                subscription.update_access(*access)
+
+            if payload is None:
+                yield ": keepalive\n\n"
+                continue
+            yield format_sse(payload)
+            if subscription.closed and subscription.queue.empty():
+                return
+    finally:
+        hub.unsubscribe(subscription)
@@ -0,0 +1,213 @@
+"""Background deletion of a guild and everything that belongs to it.
+
+``DELETE /api/admin/guilds/{id}`` only marks the guild inactive, so lists,
+switches and joins stop seeing it at once, and enqueues a ``guild.delete``
+job in the same transaction (see app.core.jobs). The job purges the guild in
+dependency order with set-based statements: members are moved back to their
+personal guilds with ``UPDATE ... FROM``, then dependent rows are deleted
+with ``DELETE ... WHERE guild_id = ...``. Each batch of at most
+``GUILD_DELETE_BATCH_SIZE`` rows is its own short transaction, so no request
+waits on it and locks are held briefly. Each batch also writes the rows
+affected so far into the job's ``result``, so the deletion status shows
+progress while the job runs. Every step is idempotent, so a failed or
+interrupted deletion is simply retried.
+"""
+
+import logging
+import os
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.jobs import enqueue, get_job_by_key, job_handler
+from app.core.models import (
+    AccessLevel,
+    AICommander,
+    AsyncSessionLocal,
+    Guild,
+    Job,
+    Invite,
+    Objective,
+    ObjectiveCategory,
+    Rank,
+    Squad,
+    Task,
+    User,
+    UserAccess,
+    objective_categories_association,
+)
+
+from .membership import delete_guild_memberships
+
+logger = logging.getLogger(__name__)
+
+GUILD_DELETE_BATCH_SIZE = int(os.getenv("GUILD_DELETE_BATCH_SIZE", "1000"))
+
+Step = Callable[[AsyncSession, uuid.UUID, int], Awaitable[int]]
+
+
+def _limited(column, *conditions, limit: int):
+    """``column IN`` the first ``limit`` matching ids (PostgreSQL has no DELETE ... LIMIT)."""
+    # Not correlated: the subquery reads the same table the statement changes
+    return column.in_(select(column).where(*conditions).limit(limit).correlate(None).scalar_subquery())
+
+
+def _bulk(statement):
+    return statement.execution_options(synchronize_session=False)
+
+
+async def _rowcount(db: AsyncSession, statement) -> int:
+    return (await db.execute(_bulk(statement))).rowcount
+
+
+async def _move_current_members(db: AsyncSession, guild_id: uuid.UUID, limit: int) -> int:
+    # users.guild_id is the personal guild; rows whose home is this guild
+    # would not change here and are moved by _move_home_members
+    return await _rowcount(db, update(User)
+        .where(_limited(User.id, User.current_guild_id == guild_id, User.guild_id != guild_id, limit=limit))
+        .values(current_guild_id=User.guild_id))
+
+
+async def _move_home_members(db: AsyncSession, guild_id: uuid.UUID, limit: int) -> int:
+    # Legacy rows whose home guild is this one get their personal guild back.
+    # The batch only picks rows the update will change, so an empty batch
+    # means the step is done.
+    personal_guild = (Guild.creator_id == User.id, Guild.is_solo == True, Guild.id != guild_id)
+    return await _rowcount(db, update(User)
+        .where(_limited(User.id, User.guild_id == guild_id, *personal_guild, limit=limit), *personal_guild)
+        .values(guild_id=Guild.id, current_guild_id=Guild.id))
+
+
+async def _reset_ranks(db: AsyncSession, guild_id: uuid.UUID, limit: int) -> int:
+    guild_ranks = select(Rank.id).where(Rank.guild_id == guild_id)
+    # Members holding one of this guild's ranks get the top rank of their own guild
+    personal_rank = (
+        select(Rank.id)
+        .where(Rank.guild_id == User.guild_id, Rank.guild_id != guild_id)
+        .order_by(Rank.hierarchy_level)
+        .limit(1)
+        .scalar_subquery()
+    )
+    return await _rowcount(db, update(User)
+        .where(_limited(User.id, User.rank.in_(guild_ranks), limit=limit))
+        .values(rank=personal_rank))
+
+
+async def _clear_squads(db: AsyncSession, guild_id: uuid.UUID, limit: int) -> int:
+    guild_squads = select(Squad.id).where(Squad.guild_id == guild_id)
+    return await _rowcount(db, update(User)
+        .where(_limited(User.id, User.squad_id.in_(guild_squads), limit=limit))
+        .values(squad_id=None))
+
+
+async def _delete_grants(db: AsyncSession, guild_id: uuid.UUID, limit: int) -> int:
+    guild_levels = select(AccessLevel.id).where(AccessLevel.guild_id == guild_id)
+    return await _rowcount(db, delete(UserAccess)
+        .where(_limited(UserAccess.id, UserAccess.access_level_id.in_(guild_levels), limit=limit))
+        .execution_options(permission_guild_ids=[guild_id]))
+
+
+async def _delete_memberships(db: AsyncSession, guild_id: uuid.UUID, limit: int) -> int:
+    return await delete_guild_memberships(db, guild_id, limit=limit)
+
+
+async def _delete_objectives(db: AsyncSession, guild_id: uuid.UUID, limit: int) -> int:
+    # A batch of objectives together with their tasks and category links
+    objective_ids = (await db.scalars(
+        select(Objective.id).where(Objective.guild_id == guild_id).limit(limit)
+    )).all()
+    if not objective_ids:
+        return 0
+    junction = objective_categories_association
+    await db.execute(delete(junction).where(junction.c.objective_id.in_(objective_ids)))
+    await db.execute(_bulk(delete(Task).where(Task.objective_id.in_(objective_ids))))
+    await db.execute(_bulk(delete(Objective).where(Objective.id.in_(objective_ids))))
+    return len(objective_ids)
+
+
+async def _delete_category_links(db: AsyncSession, guild_id: uuid.UUID, limit: int) -> int:
+    # Links from other guilds' objectives to this guild's categories
+    junction = objective_categories_association
+    guild_categories = select(ObjectiveCategory.id).where(ObjectiveCategory.guild_id == guild_id)
+    return (await db.execute(delete(junction).where(junction.c.category_id.in_(guild_categories)))).rowcount
+
+
+def _delete_where(model, column_name: str = "guild_id") -> Step:
+    async def step(db: AsyncSession, guild_id: uuid.UUID, limit: int) -> int:
+        # permission_guild_ids only matters for ranks and access levels (see utils.permissions)
+        return await _rowcount(db, delete(model)
+            .where(_limited(model.id, getattr(model, column_name) == guild_id, limit=limit))
+            .execution_options(permission_guild_ids=[guild_id]))
+    return step
+
+
+# (name, step, batched); each batched step runs until a batch affects no rows
+PURGE_STEPS = [
+    ("users.current_guild", _move_current_members, True),
+    ("users.home_guild", _move_home_members, True),
+    ("users.rank", _reset_ranks, True),
+    ("users.squad", _clear_squads, True),
+    ("user_access", _delete_grants, True),
+    ("guild_requests", _delete_memberships, True),
+    ("invites", _delete_where(Invite), True),
+    ("objectives", _delete_objectives, True),
+    ("tasks", _delete_where(Task), True),
+    ("objective_categories_junction", _delete_category_links, False),
+    ("objective_categories", _delete_where(ObjectiveCategory), True),
+    ("squads", _delete_where(Squad), True),
+    ("ranks", _delete_where(Rank), True),
+    ("access_levels", _delete_where(AccessLevel), True),
+    ("ai_commanders", _delete_where(AICommander), True),
+    ("guilds", _delete_where(Guild, "id"), False),
+]
+
+
+async def _save_progress(db: AsyncSession, guild_id: uuid.UUID, progress: Dict[str, int]) -> None:
+    # Replaced by the handler's return value when the job completes
+    await db.execute(_bulk(update(Job).where(Job.key == _job_key(guild_id)).values(result=dict(progress))))
+
+
+async def purge_guild(guild_id: uuid.UUID, batch_size: int = GUILD_DELETE_BATCH_SIZE,
+                      progress: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+    """Remove the guild and its rows; returns rows affected per step."""
+    progress = {} if progress is None else progress
+    for name, step, batched in PURGE_STEPS:
+        progress.setdefault(name, 0)
+        while True:
+            async with AsyncSessionLocal() as db:
+                affected = await step(db, guild_id, batch_size)
+                progress[name] += affected
+                await _save_progress(db, guild_id, progress)
+                await db.commit()
+            # A short batch is not proof of the end: rows may be added concurrently
+            if not batched or affected == 0:
+                break
+    return progress
+
+
+def _job_key(guild_id: uuid.UUID) -> str:
+    return f"guild.delete:{guild_id}"
+
+
+@job_handler("guild.delete")
+async def _delete_guild_job(payload: Dict[str, Any]) -> Dict[str, int]:
+    guild_id = uuid.UUID(payload["guild_id"])
+    deleted = await purge_guild(guild_id)
+    logger.info("Guild %s deleted: %s", guild_id, deleted)
+    return deleted
+
+
+async def start_guild_deletion(db: AsyncSession, guild_id: uuid.UUID, requested_by: uuid.UUID) -> Job:
+    """Enqueue the purge of an inactive guild in ``db``'s transaction.
+
+    Returns the job already queued or running for the guild, if any; a
+    failed deletion is queued again.
+    """
+    return await enqueue(db, "guild.delete", {"guild_id": str(guild_id)},
+                         key=_job_key(guild_id), created_by=requested_by)
+
+
+async def guild_deletion_status(db: AsyncSession, guild_id: uuid.UUID) -> Optional[Job]:
+    return await get_job_by_key(db, _job_key(guild_id))
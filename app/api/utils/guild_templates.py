@@ -0,0 +1,195 @@
+"""Guild bootstrap templates shared by registration and admin guild creation.
+
+A template describes the rows every new guild of a given ``Guild.type``
+starts with: access levels, ranks, objective categories and the AI
+commander. It is compiled once into a single ``INSERT`` whose data-modifying
+CTEs write the guild and all of its template rows, with every id left as a
+bind parameter. Materializing a guild is one statement and one round trip,
+however many rows the template holds.
+
+Variants for other guild types are registered with ``register_guild_template``;
+unknown types fall back to the default template.
+"""
+
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.models import AccessLevel, AICommander, Guild, GuildRequest, ObjectiveCategory, Rank, UserAccess
+
+DEFAULT_GUILD_TYPE = "game_star_citizen"
+
+# Columns a caller supplies for the guild row itself
+GUILD_COLUMNS = (
+    "id", "name", "creator_id", "member_limit", "billing_tier",
+    "is_solo", "is_active", "is_deletable", "type",
+)
+
+
+class GuildTemplate:
+    """The default layout of a guild, precompiled into one insert statement.
+
+    ``access_levels`` is a list of ``(name, user_actions)``; ``ranks`` a list of
+    ``(name, phonetic, hierarchy_level, access_level_names)``; ``categories`` a
+    list of ``(name, description)``. The creator is granted ``creator_access``
+    directly and, on registration, holds ``creator_rank``.
+    """
+
+    def __init__(
+        self,
+        access_levels: Sequence[Tuple[str, List[str]]],
+        ranks: Sequence[Tuple[str, Optional[str], int, List[str]]],
+        categories: Sequence[Tuple[str, Optional[str]]] = (),
+        ai_commander: Optional[Dict[str, Any]] = None,
+        creator_access: str = "super_admin",
+        creator_rank: Optional[str] = None,
+    ):
+        level_names = {name for name, _ in access_levels}
+        unknown = {level for *_, levels in ranks for level in levels} - level_names
+        if unknown or creator_access not in level_names:
+            raise ValueError(f"Template references undefined access levels: {sorted(unknown | ({creator_access} - level_names))}")
+
+        self.access_levels = list(access_levels)
+        self.ranks = list(ranks)
+        self.categories = list(categories)
+        self.ai_commander = dict(ai_commander) if ai_commander else None
+        self.creator_access = creator_access
+        self.creator_rank = creator_rank or (self.ranks[0][0] if self.ranks else None)
+        self.statement = self._compile()
+
+    def _compile(self):
+        guild_id = bindparam("guild_id", type_=Guild.__table__.c.id.type)
+        statement = insert(Guild.__table__).values({
+            column: guild_id if column == "id" else bindparam(f"guild_{column}", type_=Guild.__table__.c[column].type)
+            for column in GUILD_COLUMNS
+        })
+
+        ctes = []
+        if self.access_levels:
+            table = AccessLevel.__table__
+            ctes.append(insert(table).values([
+                {
+                    "id": bindparam(f"access_level_{i}", type_=table.c.id.type),
+                    "guild_id": guild_id,
+                    "name": name,
+                    "user_actions": actions,
+                }
+                for i, (name, actions) in enumerate(self.access_levels)
+            ]).cte("template_access_levels"))
+        if self.ranks:
+            table = Rank.__table__
+            ctes.append(insert(table).values([
+                {
+                    "id": bindparam(f"rank_{i}", type_=table.c.id.type),
+                    "guild_id": guild_id,
+                    "name": name,
+                    "phonetic": phonetic,
+                    "hierarchy_level": level,
+                    "access_levels": bindparam(f"rank_{i}_access_levels", type_=table.c.access_levels.type),
+                }
+                for i, (name, phonetic, level, _) in enumerate(self.ranks)
+            ]).cte("template_ranks"))
+        if self.categories:
+            table = ObjectiveCategory.__table__
+            ctes.append(insert(table).values([
+                {
+                    "id": bindparam(f"category_{i}", type_=table.c.id.type),
+                    "guild_id": guild_id,
+                    "name": name,
+                    "description": description,
+                }
+                for i, (name, description) in enumerate(self.categories)
+            ]).cte("template_categories"))
+        if self.ai_commander:
+            table = AICommander.__table__
+            ctes.append(insert(table).values({
+                "id": bindparam("ai_commander", type_=table.c.id.type),
+                "guild_id": guild_id,
+                **self.ai_commander,
+            }).cte("template_ai_commander"))
+
+        # Foreign keys are checked at the end of the statement, after the guild row exists
+        return statement.add_cte(*ctes) if ctes else statement
+
+    def parameters(self, guild: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Bind values for one guild, plus the generated ids by template row name."""
+        access_ids = {name: uuid.uuid4() for name, _ in self.access_levels}
+        rank_ids = {name: uuid.uuid4() for name, *_ in self.ranks}
+        category_ids = {name: uuid.uuid4() for name, _ in self.categories}
+        ai_commander_id = uuid.uuid4() if self.ai_commander else None
+
+        params: Dict[str, Any] = {"guild_id": guild["id"]}
+        params.update({f"guild_{column}": guild[column] for column in GUILD_COLUMNS if column != "id"})
+        params.update({f"access_level_{i}": access_ids[name] for i, (name, _) in enumerate(self.access_levels)})
+        for i, (name, _, _, levels) in enumerate(self.ranks):
+            params[f"rank_{i}"] = rank_ids[name]
+            params[f"rank_{i}_access_levels"] = [access_ids[level] for level in levels]
+        params.update({f"category_{i}": category_ids[name] for i, (name, _) in enumerate(self.categories)})
+        if ai_commander_id:
+            params["ai_commander"] = ai_commander_id
+
+        ids = {
+            "access_levels": access_ids,
+            "ranks": rank_ids,
+            "categories": category_ids,
+            "ai_commander": ai_commander_id,
+            "creator_access": access_ids[self.creator_access],
+            "creator_rank": rank_ids.get(self.creator_rank),
+        }
+        return params, ids
+
+
+DEFAULT_GUILD_TEMPLATE = GuildTemplate(
+    access_levels=[
+        ('view_guilds', ['view_guilds']),
+        ('manage_guilds', ['manage_guilds', 'manage_users']),
+        ('objectives', ['create_objective', 'manage_objectives']),
+        ('manage_rbac', ['manage_rbac']),
+        ('view_ranks', ['view_ranks']),
+        ('manage_ranks', ['manage_ranks']),
+        ('super_admin', ['view_guilds', 'manage_guilds', 'view_users', 'manage_users', 'manage_user_access', 'manage_rbac', 'view_objectives', 'create_objective', 'manage_objectives', 'view_ranks', 'manage_ranks', 'view_categories', 'create_category', 'manage_categories']),
+    ],
+    # CO is the highest rank (lowest number); super_admin is granted to the creator directly
+    ranks=[
+        ("CO", "Commander", 1, ['view_guilds', 'manage_guilds', 'objectives', 'manage_rbac', 'view_ranks', 'manage_ranks']),
+    ],
+    ai_commander={
+        "name": "UEE Commander",
+        "system_prompt": "Act as a UEE Commander, coordinating Star Citizen guild missions with formal, strategic responses.",
+        "user_prompt": "",
+    },
+)
+
+_templates: Dict[str, GuildTemplate] = {DEFAULT_GUILD_TYPE: DEFAULT_GUILD_TEMPLATE}
+
+
+def register_guild_template(guild_type: str, template: GuildTemplate) -> None:
+    """Use ``template`` for new guilds whose ``type`` is ``guild_type``."""
+    _templates[guild_type] = template
+
+
+def get_guild_template(guild_type: Optional[str]) -> GuildTemplate:
+    return _templates.get(guild_type or DEFAULT_GUILD_TYPE, DEFAULT_GUILD_TEMPLATE)
+
+
+async def create_guild_from_template(
+    db: AsyncSession,
+    guild: Dict[str, Any],
+    creator_id: Optional[uuid.UUID] = None,
+) -> Dict[str, Any]:
+    """Insert the guild and its template rows; optionally seat ``creator_id`` as its admin.
+
+    ``guild`` holds every column in ``GUILD_COLUMNS``. The creator's access
+    grant and approved membership go through the unit of work so membership
+    counters and permission caches follow. Nothing is committed.
+    """
+    template = get_guild_template(guild.get("type"))
+    params, ids = template.parameters(guild)
+    await db.execute(template.statement, params)
+
+    if creator_id is not None:
+        db.add(UserAccess(id=uuid.uuid4(), user_id=creator_id, access_level_id=ids["creator_access"]))
+        db.add(GuildRequest(id=uuid.uuid4(), user_id=creator_id, guild_id=guild["id"], status="approved"))
+    return ids
@@ -0,0 +1,63 @@
+"""bcrypt hashing for passwords and PINs, run in a bounded worker pool.
+
+bcrypt is deliberately slow; calling it directly from an ``async def``
+endpoint blocks the event loop for every other request. ``run_hashing``
+moves the work onto a small thread pool (bcrypt releases the GIL) and keeps
+count of how many calls are waiting for a worker.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+import bcrypt
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_executor = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+_lock = threading.Lock()
+_in_flight = 0
+
+
+def hash_secret(secret: str) -> str:
+    """Hash a password or PIN with the configured cost."""
+    return bcrypt.hashpw(secret.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
+
+
+def verify_secret(secret: str, hashed: str) -> bool:
+    """Check a password or PIN against its bcrypt hash."""
+    return bcrypt.checkpw(secret.encode('utf-8'), hashed.encode('utf-8'))
+
+
+def needs_rehash(hashed: str) -> bool:
+    """Return True if the hash was made with a lower cost than configured."""
+    try:
+        return int(hashed.split("$")[2]) < BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
+
+
+async def run_hashing(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a hashing call on the bcrypt pool without blocking the event loop."""
+    global _in_flight
+    with _lock:
+        _in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+    finally:
+        with _lock:
+            _in_flight -= 1
+
+
+def hashing_stats() -> Dict[str, int]:
+    """Current pool size, cost and queue depth."""
+    in_flight = _in_flight
+    return {
+        "rounds": BCRYPT_ROUNDS,
+        "workers": BCRYPT_WORKERS,
+        "in_flight": in_flight,
+        "queued": max(0, in_flight - BCRYPT_WORKERS),
+    }
@@ -0,0 +1,123 @@
+"""Approved-membership counters for guilds and users.
+
+``guilds.approved_member_count`` and ``users.approved_guild_count`` mirror the
+number of approved ``guild_requests`` rows, so member-limit checks and guild
+lists read a column instead of counting. Every flush that inserts, approves,
+revokes or deletes a request applies the net change in the same transaction
+as ``count = count + delta``, which stays correct with concurrent writers.
+
+Bulk statements bypass the unit of work; remove a guild's requests with
+``delete_guild_memberships`` so the members' counters follow.
+"""
+
+import uuid
+from collections import Counter
+from itertools import chain
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import delete, event, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+
+from app.core.models import Guild, GuildRequest, User
+
+from .user_cache import mark_user_changed
+
+APPROVED = "approved"
+
+
+def _previous(state, key):
+    history = state.attrs[key].history
+    values = history.deleted or history.unchanged or history.added
+    return values[0] if values else None
+
+
+def _approved_before(request: GuildRequest) -> Optional[Tuple[uuid.UUID, uuid.UUID]]:
+    """(guild_id, user_id) if the request was approved before this flush."""
+    state = inspect(request)
+    if _previous(state, "status") != APPROVED:
+        return None
+    return _previous(state, "guild_id"), _previous(state, "user_id")
+
+
+def _approved_now(request: GuildRequest) -> Optional[Tuple[uuid.UUID, uuid.UUID]]:
+    if request.status != APPROVED:
+        return None
+    return request.guild_id, request.user_id
+
+
+def _apply_deltas(session: Session, guild_deltas: Dict[uuid.UUID, int], user_deltas: Dict[uuid.UUID, int]) -> None:
+    """Add the deltas to the stored counters and to any loaded instances."""
+    for model, column, deltas in (
+        (Guild, "approved_member_count", guild_deltas),
+        (User, "approved_guild_count", user_deltas),
+    ):
+        table = model.__table__
+        by_delta: Dict[int, list] = {}
+        for key, delta in deltas.items():
+            if delta:
+                by_delta.setdefault(delta, []).append(key)
+
+        for delta, keys in by_delta.items():
+            rows = session.connection().execute(
+                update(table)
+                .where(table.c.id.in_(keys))
+                .values({column: table.c[column] + delta})
+                .returning(table.c.id, table.c[column])
+            )
+            for key, count in rows:
+                # Keep instances already loaded in this session in step
+                # without marking them dirty.
+                loaded = session.identity_map.get(identity_key(model, key))
+                if loaded is not None:
+                    set_committed_value(loaded, column, count)
+                if model is User:
+                    mark_user_changed(session, key)
+
+
+async def delete_guild_memberships(db: AsyncSession, guild_id: uuid.UUID, limit: Optional[int] = None) -> int:
+    """Delete every request for a guild (at most ``limit``), releasing its members' counters."""
+    requests = GuildRequest.__table__
+    condition = requests.c.guild_id == guild_id
+    if limit is not None:
+        batch = select(requests.c.id).where(condition).limit(limit).scalar_subquery()
+        condition = requests.c.id.in_(batch)
+    removed = (
+        await db.execute(
+            delete(requests)
+            .where(condition)
+            .returning(requests.c.user_id, requests.c.status)
+        )
+    ).all()
+
+    user_deltas = Counter()
+    for user_id, status in removed:
+        if status == APPROVED:
+            user_deltas[user_id] -= 1
+    await db.run_sync(_apply_deltas, {}, dict(user_deltas))
+    return len(removed)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_membership_changes(session, flush_context):
+    guild_deltas, user_deltas = Counter(), Counter()
+    # The new/dirty/deleted collections still describe the flush that just ran
+    changes = chain(
+        ((None, _approved_now(obj)) for obj in session.new if isinstance(obj, GuildRequest)),
+        ((_approved_before(obj), _approved_now(obj)) for obj in session.dirty if isinstance(obj, GuildRequest)),
+        ((_approved_before(obj), None) for obj in session.deleted if isinstance(obj, GuildRequest)),
+    )
+    for before, after in changes:
+        if before == after:
+            continue
+        if before is not None:
+            guild_deltas[before[0]] -= 1
+            user_deltas[before[1]] -= 1
+        if after is not None:
+            guild_deltas[after[0]] += 1
+            user_deltas[after[1]] += 1
+
+    if guild_deltas or user_deltas:
+        _apply_deltas(session, dict(guild_deltas), dict(user_deltas))
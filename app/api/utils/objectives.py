@@ -0,0 +1,146 @@
+"""Shared loading and serialization of objective responses.
+
+Objective payloads carry category ids and, in listings, the names of the
+allowed ranks. ``objective_query`` eager-loads categories with a single
+``SELECT ... IN`` for the whole result and ``load_rank_names`` resolves rank
+names for every guild involved in one query, so serializing any number of
+objectives costs a fixed number of round trips. Completing or cancelling
+an objective updates all of its tasks with one ``UPDATE``.
+"""
+
+import logging
+import uuid
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import Select, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.models import Objective, ObjectiveCategory, Rank, Task
+
+logger = logging.getLogger(__name__)
+
+# Objective progress status -> (status given to its tasks, flag merged into their progress)
+TASK_CASCADE = {
+    "completed": ("Completed", "completed_via_objective"),
+    "cancelled": ("Failed", "cancelled_via_objective"),
+}
+
+
+def objective_query(*criteria) -> Select:
+    """``select(Objective)`` with categories batch-loaded alongside the rows."""
+    return select(Objective).options(selectinload(Objective.categories)).where(*criteria)
+
+
+async def load_rank_names(db: AsyncSession, guild_ids: Iterable[uuid.UUID]) -> Dict[str, str]:
+    """Map rank id (as string) to rank name for the given guilds."""
+    guild_ids = set(guild_ids)
+    if not guild_ids:
+        return {}
+    rows = await db.execute(select(Rank.id, Rank.name).where(Rank.guild_id.in_(guild_ids)))
+    return {str(rank_id): name for rank_id, name in rows}
+
+
+async def load_objectives(db: AsyncSession, query: Select) -> Tuple[Sequence[Objective], Dict[str, str]]:
+    """Run an objective query and resolve the rank names its rows refer to."""
+    objectives = (await db.scalars(query)).all()
+    rank_names = await load_rank_names(db, {obj.guild_id for obj in objectives})
+    return objectives, rank_names
+
+
+async def load_categories(db: AsyncSession, guild_id: uuid.UUID, refs: Iterable[str]) -> List[ObjectiveCategory]:
+    """Resolve category ids (or names, for older clients) in one query, keeping input order."""
+    ids, names, keys = set(), set(), []
+    for ref in refs or []:
+        try:
+            category_id = uuid.UUID(ref)
+        except ValueError:
+            names.add(ref)
+            keys.append(ref)
+        else:
+            ids.add(category_id)
+            keys.append(str(category_id))
+    if not keys:
+        return []
+
+    categories = (
+        await db.scalars(
+            select(ObjectiveCategory).where(
+                ObjectiveCategory.guild_id == guild_id,
+                or_(ObjectiveCategory.id.in_(ids), ObjectiveCategory.name.in_(names))
+            )
+        )
+    ).all()
+    by_key = {}
+    for category in categories:
+        by_key[str(category.id)] = category
+        by_key.setdefault(category.name, category)
+
+    resolved = []
+    for key in keys:
+        category = by_key.get(key)
+        if category is not None and category not in resolved:
+            resolved.append(category)
+    return resolved
+
+
+def serialize_objective(obj: Objective) -> Dict[str, Any]:
+    """Full objective record, as returned after a create or update."""
+    return {
+        "id": str(obj.id),
+        "guild_id": str(obj.guild_id),
+        "name": obj.name,
+        "description": obj.description,
+        "preferences": obj.preferences,
+        "categories": [str(cat.id) for cat in obj.categories],
+        "priority": obj.priority,
+        "allowed_ranks": [str(rank_id) for rank_id in obj.allowed_ranks or []],
+        "progress": obj.progress,
+        "tasks": [str(task_id) for task_id in obj.tasks or []],
+        "lead_id": str(obj.lead_id) if obj.lead_id else None,
+        "squad_id": str(obj.squad_id) if obj.squad_id else None,
+        "is_deleted": obj.is_deleted
+    }
+
+
+def serialize_objective_summary(obj: Objective, rank_names: Dict[str, str]) -> Dict[str, Any]:
+    """Objective as listed to users, with ranks that no longer exist dropped."""
+    allowed_rank_ids = [str(rank_id) for rank_id in obj.allowed_ranks or [] if str(rank_id) in rank_names]
+    return {
+        "id": str(obj.id),
+        "name": obj.name,
+        "description": obj.description,
+        "categories": [str(cat.id) for cat in obj.categories],
+        "priority": obj.priority,
+        "progress": obj.progress,
+        "allowed_ranks": [rank_names[rank_id] for rank_id in allowed_rank_ids],
+        "allowed_rank_ids": allowed_rank_ids,
+        "guild_id": str(obj.guild_id),
+        "lead_id": str(obj.lead_id) if obj.lead_id else None,
+        "squad_id": str(obj.squad_id) if obj.squad_id else None
+    }
+
+
+async def update_tasks_on_objective_progress(db: AsyncSession, objective: Objective) -> int:
+    """Carry a completed or cancelled objective over to its tasks; returns tasks updated.
+
+    One set-based statement in the caller's transaction, however many tasks
+    the objective has. Nothing is committed.
+    """
+    objective_status = (objective.progress or {}).get("status", "active")
+    if objective_status not in TASK_CASCADE:
+        return 0
+
+    task_status, flag = TASK_CASCADE[objective_status]
+    progress = func.coalesce(Task.progress, literal({}, JSONB)).op("||", return_type=JSONB)(
+        func.jsonb_build_object(flag, True)
+    )
+    result = await db.execute(
+        update(Task)
+        .where(Task.objective_id == objective.id)
+        .values(status=task_status, progress=progress)
+        .execution_options(synchronize_session=False)
+    )
+    logger.info("Objective %s %s: %s tasks set to %s", objective.id, objective_status, result.rowcount, task_status)
+    return result.rowcount
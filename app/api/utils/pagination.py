@@ -0,0 +1,81 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+Pages are ordered by the table's primary key and continue strictly after
+the last key returned, so every page is a bounded index range scan no
+matter how deep the client has paged. The cursor is an opaque token;
+clients only pass back the value of the ``X-Next-Cursor`` header, which is
+absent on the last page. Response bodies stay plain lists.
+
+Every list is paged, ``LIST_PAGE_SIZE`` items by default; the frontend and
+the Wingman skill follow the cursor until the last page.
+"""
+
+import base64
+import binascii
+import os
+import uuid
+from typing import Any, Callable, List, Optional, Sequence
+
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import Select
+
+DEFAULT_PAGE_SIZE = int(os.getenv("LIST_PAGE_SIZE", "500"))
+MAX_PAGE_SIZE = int(os.getenv("LIST_MAX_PAGE_SIZE", "1000"))
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(key: uuid.UUID) -> str:
+    """Turn the last key of a page into an opaque cursor."""
+    return base64.urlsafe_b64encode(key.bytes).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> uuid.UUID:
+    """Inverse of ``encode_cursor``; raises ``ValueError`` on a bad cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    except (binascii.Error, ValueError):
+        raise ValueError("Invalid cursor")
+    if len(raw) != 16:
+        raise ValueError("Invalid cursor")
+    return uuid.UUID(bytes=raw)
+
+
+class PageParams:
+    """``cursor``/``limit`` query parameters, used as ``Depends(PageParams)``."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    ):
+        self.limit = limit
+        self.after: Optional[uuid.UUID] = None
+        if cursor:
+            try:
+                self.after = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    def apply(self, query: Select, key_column) -> Select:
+        """Order ``query`` by ``key_column`` and restrict it to this page.
+
+        One extra row is fetched so ``finish`` can tell whether another page
+        follows without a separate count.
+        """
+        if self.after is not None:
+            query = query.where(key_column > self.after)
+        return query.order_by(key_column).limit(self.limit + 1)
+
+    def finish(
+        self,
+        rows: Sequence[Any],
+        response: Response,
+        key: Callable[[Any], uuid.UUID] = lambda row: row.id,
+    ) -> List[Any]:
+        """Trim the look-ahead row and publish the next cursor, if any."""
+        rows = list(rows)
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(key(rows[-1]))
+        return rows
@@ -0,0 +1,349 @@
+"""Effective-permission resolution shared by the API routers.
+
+A user's effective action set is the union of the ``user_actions`` of every
+access level granted directly (``user_access`` rows) and through their rank.
+It is loaded in a single query and kept in a per-process cache that is
+cleared whenever ranks, access levels or user_access rows are committed.
+
+Access tokens embed a compact encoding of the action set together with the
+``permission_version`` of every guild that contributed to it. Committing an
+RBAC change bumps the version of the affected guilds, so a token's claims
+are only trusted while all of its recorded versions are still current.
+"""
+
+import os
+import uuid
+from itertools import chain
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+from sqlalchemy import String, any_, cast, event, literal, null, select, union_all, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.models import AccessLevel, Guild, Rank, User, UserAccess
+
+from .cache import TTLCache
+
+SUPER_ADMIN = "super_admin"
+
+# Bit positions used to encode actions in access tokens. Append only:
+# reordering would change the meaning of tokens that are already issued.
+ACTION_CATALOG = (
+    "view_guilds",
+    "manage_guilds",
+    "view_users",
+    "manage_users",
+    "manage_user_access",
+    "manage_rbac",
+    "view_objectives",
+    "create_objective",
+    "manage_objectives",
+    "view_ranks",
+    "manage_ranks",
+    "view_categories",
+    "create_category",
+    "manage_categories",
+    "view_tasks",
+    "manage_tasks",
+    "view_squads",
+    "manage_squads",
+    "manage_prompts",
+)
+_ACTION_BITS = {action: 1 << index for index, action in enumerate(ACTION_CATALOG)}
+
+# Entries also expire on their own so that changes committed by other worker
+# processes are picked up without a restart.
+_permission_cache = TTLCache(
+    maxsize=int(os.getenv("PERMISSION_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("PERMISSION_CACHE_TTL_SECONDS", "60")),
+)
+
+_RBAC_MODELS = (Rank, AccessLevel, UserAccess)
+_RBAC_TABLES = frozenset(model.__tablename__ for model in _RBAC_MODELS)
+# Bulk INSERT/UPDATE/DELETE statements on RBAC tables must name the guilds
+# whose grants they change, e.g. execution_options(permission_guild_ids=[gid])
+PERMISSION_GUILDS_OPTION = "permission_guild_ids"
+_PENDING_KEY = "rbac_changed"
+_RESOLVED_KEY = "resolved_permissions"
+_TOKEN_CLAIMS_KEY = "token_permission_claims"
+
+
+class EffectivePermissions:
+    """Resolved action set for a single user."""
+
+    __slots__ = ("actions", "is_super_admin", "guild_versions")
+
+    def __init__(
+        self,
+        actions: Iterable[str] = (),
+        is_super_admin: bool = False,
+        guild_versions: Optional[Dict[str, int]] = None,
+    ):
+        self.actions: FrozenSet[str] = frozenset(actions)
+        self.is_super_admin = is_super_admin
+        # permission_version of every guild the grants were read from
+        self.guild_versions: Dict[str, int] = guild_versions or {}
+
+    def allows(self, action: str) -> bool:
+        """Return True if the action is granted (super_admin is granted everything)."""
+        return self.is_super_admin or action in self.actions
+
+    def allows_all(self, actions: Iterable[str]) -> bool:
+        """Return True if every action is granted (super_admin is granted everything)."""
+        return self.is_super_admin or all(action in self.actions for action in actions)
+
+    def grants_any(self, actions: Iterable[str]) -> bool:
+        """Return True if at least one of the actions is explicitly granted."""
+        return any(action in self.actions for action in actions)
+
+    def __repr__(self) -> str:
+        return f"EffectivePermissions(actions={sorted(self.actions)!r}, is_super_admin={self.is_super_admin!r})"
+
+
+async def _load_permissions(user: User, db: AsyncSession) -> EffectivePermissions:
+    """Load direct and rank grants, with the versions of their guilds, in one round trip."""
+    direct = (
+        select(AccessLevel.name, AccessLevel.user_actions, literal(True).label("is_direct"), Guild.id, Guild.permission_version)
+        .join(UserAccess, UserAccess.access_level_id == AccessLevel.id)
+        .join(Guild, Guild.id == AccessLevel.guild_id)
+        .where(UserAccess.user_id == user.id)
+    )
+    branches = []
+
+    # The user's own guilds are recorded even without grants there, so that a
+    # grant added in one of them also invalidates tokens issued before it.
+    home_guild_ids = {gid for gid in (user.guild_id, user.current_guild_id) if gid}
+    if home_guild_ids:
+        branches.append(
+            select(null(), null(), literal(False), Guild.id, Guild.permission_version)
+            .where(Guild.id.in_([uuid.UUID(str(gid)) for gid in home_guild_ids]))
+        )
+
+    if user.rank:
+        # ranks.access_levels is UUID[] in the ORM but TEXT[] in older schemas,
+        # so compare as text to support both.
+        branches.append(
+            select(AccessLevel.name, AccessLevel.user_actions, literal(False), Guild.id, Guild.permission_version)
+            .select_from(Rank)
+            .join(AccessLevel, cast(AccessLevel.id, String) == any_(cast(Rank.access_levels, ARRAY(String))))
+            .join(Guild, Guild.id == AccessLevel.guild_id)
+            .where(Rank.id == user.rank)
+        )
+        branches.append(
+            select(null(), null(), literal(False), Guild.id, Guild.permission_version)
+            .join(Rank, Rank.guild_id == Guild.id)
+            .where(Rank.id == user.rank)
+        )
+
+    query = union_all(direct, *branches) if branches else direct
+
+    actions = set()
+    is_super_admin = False
+    guild_versions = {}
+    for name, user_actions, is_direct, guild_id, version in (await db.execute(query)).all():
+        actions.update(user_actions or [])
+        guild_versions[str(guild_id)] = version or 0
+        # Only direct grants confer super_admin; it is assigned per user at registration.
+        if is_direct and name == SUPER_ADMIN:
+            is_super_admin = True
+
+    return EffectivePermissions(actions, is_super_admin, guild_versions)
+
+
+def encode_permission_claims(user: User, permissions: EffectivePermissions) -> Dict[str, Any]:
+    """Encode permissions as a compact access-token claim."""
+    mask = 0
+    extra = []
+    for action in permissions.actions:
+        bit = _ACTION_BITS.get(action)
+        if bit is None:
+            extra.append(action)
+        else:
+            mask |= bit
+
+    claims: Dict[str, Any] = {
+        "a": mask,
+        "rk": str(user.rank) if user.rank else None,
+        "pv": permissions.guild_versions,
+    }
+    if extra:
+        claims["x"] = sorted(extra)
+    if permissions.is_super_admin:
+        claims["sa"] = 1
+    return claims
+
+
+def decode_permission_claims(claims: Dict[str, Any]) -> EffectivePermissions:
+    """Rebuild permissions from an access-token claim."""
+    mask = int(claims.get("a", 0))
+    actions = [action for action, bit in _ACTION_BITS.items() if mask & bit]
+    actions.extend(claims.get("x", []))
+    return EffectivePermissions(actions, bool(claims.get("sa")), dict(claims.get("pv") or {}))
+
+
+async def issue_permission_claims(user: User, db: AsyncSession) -> Dict[str, Any]:
+    """Resolve fresh permissions for a new access token.
+
+    Grants and guild versions come from the same statement, so a concurrent
+    RBAC change can never be missing from the grants while its version bump
+    is already recorded in the token.
+    """
+    permissions = await _load_permissions(user, db)
+    _permission_cache.set((user.id, user.rank), permissions)
+    return encode_permission_claims(user, permissions)
+
+
+def remember_token_claims(db: AsyncSession, user: User, payload: Dict[str, Any]) -> None:
+    """Make the authenticated token's permission claims available to the guards."""
+    claims = payload.get("perm")
+    if claims:
+        db.info[_TOKEN_CLAIMS_KEY] = (user.id, claims)
+
+
+def _has_token_claims(user: User, db: AsyncSession) -> bool:
+    remembered = db.info.get(_TOKEN_CLAIMS_KEY)
+    return bool(remembered) and remembered[0] == user.id
+
+
+async def _permissions_from_token(user: User, db: AsyncSession) -> Optional[EffectivePermissions]:
+    """Return the token's permissions if they are still current, else None."""
+    if not _has_token_claims(user, db):
+        return None
+    remembered = db.info[_TOKEN_CLAIMS_KEY]
+
+    claims = remembered[1]
+    try:
+        if claims.get("rk") != (str(user.rank) if user.rank else None):
+            return None
+
+        recorded = {str(gid): int(version) for gid, version in (claims.get("pv") or {}).items()}
+        if recorded:
+            rows = await db.execute(
+                select(Guild.id, Guild.permission_version)
+                .where(Guild.id.in_([uuid.UUID(gid) for gid in recorded]))
+            )
+            current = {str(gid): version or 0 for gid, version in rows.all()}
+            if current != recorded:
+                return None
+
+        return decode_permission_claims(claims)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+async def get_effective_permissions(user: User, db: AsyncSession) -> EffectivePermissions:
+    """Return the user's effective permissions.
+
+    Resolution order: this request's earlier result, the access token's
+    claims (one primary-key lookup to confirm the guild versions), the
+    process cache, and finally the database. A token whose versions are
+    stale skips the cache: an entry cached before the same RBAC change, by
+    this or another process, would be just as stale.
+    """
+    # Keying on the rank means a rank reassignment never serves stale grants.
+    key = (user.id, user.rank)
+    resolved = db.info.setdefault(_RESOLVED_KEY, {})
+    permissions = resolved.get(key)
+    if permissions is not None:
+        return permissions
+
+    permissions = await _permissions_from_token(user, db)
+    if permissions is None and not _has_token_claims(user, db):
+        permissions = _permission_cache.get(key)
+    if permissions is None:
+        permissions = await refresh_effective_permissions(user, db)
+
+    resolved[key] = permissions
+    return permissions
+
+
+async def refresh_effective_permissions(user: User, db: AsyncSession) -> EffectivePermissions:
+    """Load the user's permissions from the database and replace the cached entry."""
+    permissions = await _load_permissions(user, db)
+    _permission_cache.set((user.id, user.rank), permissions)
+    return permissions
+
+
+def invalidate_permission_cache() -> None:
+    """Drop every cached permission set in this process."""
+    _permission_cache.clear()
+
+
+def _changed_guild_ids(session: Session, instances) -> set:
+    guild_ids = set()
+    access_level_ids = set()
+    for instance in instances:
+        if isinstance(instance, (Rank, AccessLevel)):
+            guild_ids.add(instance.guild_id)
+        elif isinstance(instance, UserAccess):
+            access_level_ids.add(instance.access_level_id)
+
+    if access_level_ids:
+        rows = session.connection().execute(
+            select(AccessLevel.guild_id).where(AccessLevel.id.in_(list(access_level_ids)))
+        )
+        guild_ids.update(row.guild_id for row in rows)
+
+    return {uuid.UUID(str(gid)) for gid in guild_ids if gid}
+
+
+@event.listens_for(Session, "after_flush")
+def _track_rbac_changes(session, flush_context):
+    changed = [
+        instance
+        for instance in chain(session.new, session.dirty, session.deleted)
+        if isinstance(instance, _RBAC_MODELS)
+    ]
+    if not changed:
+        return
+
+    session.info[_PENDING_KEY] = True
+    session.info.pop(_RESOLVED_KEY, None)
+
+    _bump_permission_versions(session, _changed_guild_ids(session, changed))
+
+
+def _bump_permission_versions(session: Session, guild_ids) -> None:
+    # Bump in the same transaction so the new version becomes visible
+    # together with the change it describes.
+    guild_ids = {uuid.UUID(str(gid)) for gid in guild_ids if gid}
+    if guild_ids:
+        guilds = Guild.__table__
+        session.connection().execute(
+            update(guilds)
+            .where(guilds.c.id.in_(list(guild_ids)))
+            .values(permission_version=guilds.c.permission_version + 1)
+        )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_rbac_changes(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+
+    # ORM and Core statements alike; the flush hook never sees these rows
+    table = orm_execute_state.statement.table
+    if getattr(table, "name", None) not in _RBAC_TABLES:
+        return
+
+    guild_ids = orm_execute_state.execution_options.get(PERMISSION_GUILDS_OPTION)
+    if guild_ids is None:
+        raise ValueError(
+            f"Bulk statements on {table.name} must pass execution_options({PERMISSION_GUILDS_OPTION}=...) "
+            "so the permission versions of those guilds are bumped"
+        )
+    orm_execute_state.session.info[_PENDING_KEY] = True
+    orm_execute_state.session.info.pop(_RESOLVED_KEY, None)
+    _bump_permission_versions(orm_execute_state.session, guild_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    if session.info.pop(_PENDING_KEY, False):
+        invalidate_permission_cache()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
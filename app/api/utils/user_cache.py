@@ -0,0 +1,123 @@
+"""Process-wide cache of authenticated user rows.
+
+Every authenticated request needs the caller's ``users`` row. Column values
+are cached per user id and turned back into a session-bound ``User`` without
+a query; the entry is dropped whenever a flush or bulk statement in this
+process touches that user (rank change, guild switch, lockout, membership
+counters). Changes committed by other worker processes are picked up once
+the entry expires, so the TTL is kept short.
+
+Password, PIN and TOTP secret are never cached. They are left unloaded on
+the attached ``User``; routes that need them select the row, which fills
+them in.
+"""
+
+import os
+import uuid
+from itertools import chain
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+
+from app.core.models import User
+
+from .cache import TTLCache
+
+# The TTL bounds how long another worker process may serve a changed row.
+_user_cache = TTLCache(
+    maxsize=int(os.getenv("AUTH_USER_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("AUTH_USER_CACHE_TTL_SECONDS", "5")),
+)
+
+_SECRET_COLUMNS = frozenset({"password", "pin", "totp_secret"})
+_USER_COLUMNS = tuple(attr.key for attr in User.__mapper__.column_attrs if attr.key not in _SECRET_COLUMNS)
+_CHANGED_KEY = "changed_user_ids"
+
+
+def _snapshot(user: User) -> Dict[str, Any]:
+    return {key: getattr(user, key) for key in _USER_COLUMNS}
+
+
+async def load_user_row(db: AsyncSession, user_id: uuid.UUID) -> Optional[Dict[str, Any]]:
+    """Return the user's column values, querying only on a cache miss."""
+    row = _user_cache.get(user_id)
+    if row is not None:
+        return row
+
+    user = await db.scalar(select(User).where(User.id == user_id))
+    if not user:
+        _user_cache.pop(user_id)
+        return None
+    row = _snapshot(user)
+    _user_cache.set(user_id, row)
+    return row
+
+
+async def attach_user(db: AsyncSession, row: Dict[str, Any]) -> User:
+    """Return a ``User`` bound to ``db`` for a cached row without emitting SQL."""
+    existing = db.identity_map.get(identity_key(User, row["id"]))
+    if existing is not None:
+        return existing
+
+    user = User(**row)
+    # Mark the cached columns as loaded and unmodified so the session treats
+    # the instance like one it had just read; the secrets stay expired.
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
+
+def invalidate_user_cache(user_id: Optional[uuid.UUID] = None) -> None:
+    """Drop one cached user, or every cached user when no id is given."""
+    if user_id is None:
+        _user_cache.clear()
+    else:
+        _user_cache.pop(user_id)
+
+
+def mark_user_changed(session: Session, user_id: uuid.UUID) -> None:
+    """Record a change to a user row written outside the ORM unit of work."""
+    changed = session.info.setdefault(_CHANGED_KEY, set())
+    if changed is not None:
+        changed.add(user_id)
+    # Also drop it now so this process never serves the old row once the
+    # transaction commits.
+    _user_cache.pop(user_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_user_changes(session, flush_context):
+    for instance in chain(session.new, session.dirty, session.deleted):
+        if isinstance(instance, User) and instance.id is not None:
+            mark_user_changed(session, instance.id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_user_changes(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, User):
+        # The affected ids are unknown for bulk statements
+        orm_execute_state.session.info[_CHANGED_KEY] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_users_after_commit(session):
+    if _CHANGED_KEY not in session.info:
+        return
+
+    changed = session.info.pop(_CHANGED_KEY)
+    if changed is None:
+        invalidate_user_cache()
+    else:
+        for user_id in changed:
+            _user_cache.pop(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_changes(session):
+    session.info.pop(_CHANGED_KEY, None)
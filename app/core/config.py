@@ -0,0 +1,33 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+from functools import lru_cache
+
+from pydantic_settings import BaseSettings
+
+
+class PoolSettings(BaseSettings):
+    """Connection pool tuning, shared by every engine the application creates."""
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30          # seconds to wait for a free connection
+    db_pool_recycle: int = 300           # seconds before a connection is replaced
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 0     # per-connection statement_timeout, 0 disables
+
+    class Config:
+        env_file = ".env.local"
+        extra = "ignore"
+
+
+class Settings(PoolSettings):
+    db_user: str = "postgres"
+    db_pass: str
+    db_host: str = "localhost"
+    db_port: int = 5432
+    db_name: str = "sphereconnect"
+    cors_origins: str = "http://localhost:3000"
+
+
+@lru_cache
+def get_pool_settings() -> PoolSettings:
+    return PoolSettings()
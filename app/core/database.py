@@ -0,0 +1,124 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+"""Engine factory and connection pool metrics.
+
+Every engine is built here so pool size, overflow, timeout, pre-ping and
+``statement_timeout`` come from ``PoolSettings``. The pools also time each
+checkout, so ``pool_stats()`` can report how long requests wait for a
+connection and how often they give up.
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, exc
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from .config import get_pool_settings
+
+_engines: Dict[str, Any] = {}
+
+
+class CheckoutWaits:
+    """Running totals of time spent acquiring connections from a pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.timeouts = 0
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+
+class _TimedCheckout:
+    def __init__(self, *args, **kw):
+        super().__init__(*args, **kw)
+        self.checkout_waits = CheckoutWaits()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.checkout_waits.record(time.perf_counter() - started, timed_out)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def _pool_kwargs() -> Dict[str, Any]:
+    settings = get_pool_settings()
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def create_db_engine(url: str, name: str = "sync"):
+    """Create a pooled psycopg2 engine and register it for ``pool_stats``."""
+    timeout_ms = get_pool_settings().db_statement_timeout_ms
+    connect_args = {"options": f"-c statement_timeout={timeout_ms}"} if timeout_ms else {}
+    engine = create_engine(url, poolclass=TimedQueuePool, connect_args=connect_args, **_pool_kwargs())
+    _engines[name] = engine
+    return engine
+
+
+def create_async_db_engine(url: str, name: str = "async"):
+    """Create a pooled asyncpg engine and register it for ``pool_stats``."""
+    timeout_ms = get_pool_settings().db_statement_timeout_ms
+    connect_args = {"server_settings": {"statement_timeout": str(timeout_ms)}} if timeout_ms else {}
+    engine = create_async_engine(url, poolclass=TimedAsyncQueuePool, connect_args=connect_args, **_pool_kwargs())
+    _engines[name] = engine
+    return engine
+
+
+def _stats_for(pool) -> Dict[str, Any]:
+    stats = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        # QueuePool counts overflow from -pool_size; only positive values are extra connections
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "timeout_seconds": pool.timeout(),
+    }
+    waits = getattr(pool, "checkout_waits", None)
+    if waits is not None:
+        stats.update({
+            "checkouts": waits.count,
+            "avg_wait_ms": round(waits.total / waits.count * 1000, 3) if waits.count else 0.0,
+            "max_wait_ms": round(waits.max * 1000, 3),
+            "timeouts": waits.timeouts,
+        })
+    return stats
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Live pool usage for every engine created in this process."""
+    stats = {}
+    for name, engine in _engines.items():
+        pool = engine.sync_engine.pool if hasattr(engine, "sync_engine") else engine.pool
+        stats[name] = _stats_for(pool)
+    return stats
@@ -0,0 +1,322 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+"""Persistent background jobs run by an in-process asyncio worker pool.
+
+Work that need not finish inside a request (such as purging a deleted
+guild) is written to the ``jobs`` table by ``enqueue`` in the caller's own
+transaction, so a job exists exactly when the change that needs it commits.
+``JobWorker`` tasks, started in the application lifespan, claim due jobs with
+``FOR UPDATE SKIP LOCKED``; any number of workers and processes share the
+table without a broker. A failing job is retried with capped exponential
+backoff until its ``max_attempts``, and a job whose worker died is claimed
+again once its lock is older than ``JOB_LOCK_TIMEOUT``.
+
+A job enqueued with a ``key`` exists at most once: enqueueing the same key
+again returns the existing job, unless that job failed, in which case it is
+reset and runs again. Handlers are coroutines registered with
+``job_handler``; they receive the JSON payload, open their own sessions and
+return a JSON-serializable result.
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+import random
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, event, null, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .models import AsyncSessionLocal, Job
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+JOB_LOCK_TIMEOUT = float(os.getenv("JOB_LOCK_TIMEOUT", "900"))
+JOB_RETRY_BASE_DELAY = float(os.getenv("JOB_RETRY_BASE_DELAY", "5"))
+JOB_RETRY_MAX_DELAY = float(os.getenv("JOB_RETRY_MAX_DELAY", "900"))
+DEFAULT_MAX_ATTEMPTS = 5
+
+PENDING, RUNNING, COMPLETED, FAILED = "pending", "running", "completed", "failed"
+
+# Modules whose handlers every worker process must have registered
+HANDLER_MODULES = ("app.api.utils.guild_deletion",)
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+Handler = Callable[[Dict[str, Any]], Awaitable[Any]]
+_handlers: Dict[str, Tuple[Handler, int]] = {}
+_workers: Set["JobWorker"] = set()
+_ENQUEUED_KEY = "jobs_enqueued"
+
+
+def job_handler(kind: str, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+    """Register the decorated coroutine as the handler for jobs of ``kind``."""
+    def register(handler: Handler) -> Handler:
+        _handlers[kind] = (handler, max_attempts)
+        return handler
+    return register
+
+
+def load_handlers() -> None:
+    for module in HANDLER_MODULES:
+        importlib.import_module(module)
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds to wait after failed attempt number ``attempts``."""
+    delay = min(JOB_RETRY_MAX_DELAY, JOB_RETRY_BASE_DELAY * 2 ** (attempts - 1))
+    # Jitter spreads out jobs that failed together, e.g. while the database was down
+    return delay * random.uniform(0.5, 1.0)
+
+
+def job_outcome(attempts: int, max_attempts: int, error: Optional[str], now: datetime) -> Dict[str, Any]:
+    """Column values for a job whose attempt number ``attempts`` just ended."""
+    if error is None:
+        return {"status": COMPLETED, "finished_at": now, "last_error": None}
+    if attempts < max_attempts:
+        return {"status": PENDING, "run_at": now + timedelta(seconds=retry_delay(attempts)), "last_error": error}
+    return {"status": FAILED, "finished_at": now, "last_error": error}
+
+
+async def enqueue(
+    db: AsyncSession,
+    kind: str,
+    payload: Optional[Dict[str, Any]] = None,
+    key: Optional[str] = None,
+    run_at: Optional[datetime] = None,
+    created_by: Optional[uuid.UUID] = None,
+) -> Job:
+    """Add a job to ``db``'s transaction; it becomes visible to workers on commit.
+
+    With a ``key``, returns the existing job of that key instead, unless it
+    failed, in which case it is reset to pending with the new payload.
+    """
+    if kind not in _handlers:
+        raise ValueError(f"No job handler registered for {kind!r}")
+
+    now = datetime.utcnow()
+    statement = pg_insert(Job).values(
+        id=uuid.uuid4(),
+        kind=kind,
+        key=key,
+        payload=payload or {},
+        status=PENDING,
+        attempts=0,
+        max_attempts=_handlers[kind][1],
+        run_at=run_at or now,
+        created_by=created_by,
+        created_at=now,
+        updated_at=now,
+    )
+    if key is not None:
+        excluded = statement.excluded
+        statement = statement.on_conflict_do_update(
+            index_elements=[Job.key],
+            set_={
+                "payload": excluded.payload,
+                "status": PENDING,
+                "attempts": 0,
+                "run_at": excluded.run_at,
+                "locked_at": None,
+                "locked_by": None,
+                "last_error": None,
+                "result": null(),
+                "created_by": excluded.created_by,
+                "updated_at": now,
+                "finished_at": None,
+            },
+            where=Job.status == FAILED,
+        )
+
+    job = await db.scalar(statement.returning(Job), execution_options={"populate_existing": True})
+    if job is None:
+        # The key is taken by a job that has not failed
+        return await db.scalar(select(Job).where(Job.key == key))
+    db.info[_ENQUEUED_KEY] = True
+    return job
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_workers(session):
+    if session.info.pop(_ENQUEUED_KEY, False):
+        for worker in list(_workers):
+            worker.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_enqueued(session):
+    session.info.pop(_ENQUEUED_KEY, None)
+
+
+def claim_statement(now: datetime):
+    """Mark the oldest due job as running by this worker and return it."""
+    due = (
+        select(Job.id)
+        .where(or_(
+            and_(Job.status == PENDING, Job.run_at <= now),
+            # Its worker died or lost the database mid-run
+            and_(Job.status == RUNNING, Job.locked_at < now - timedelta(seconds=JOB_LOCK_TIMEOUT)),
+        ))
+        .order_by(Job.run_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        # Not correlated: the subquery reads the table the statement changes
+        .correlate(None)
+        .scalar_subquery()
+    )
+    return (
+        update(Job)
+        .where(Job.id == due)
+        .values(status=RUNNING, attempts=Job.attempts + 1, locked_at=now, locked_by=WORKER_ID, updated_at=now)
+        .returning(Job)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def claim_job() -> Optional[Job]:
+    async with AsyncSessionLocal() as db:
+        job = await db.scalar(claim_statement(datetime.utcnow()))
+        await db.commit()
+        return job
+
+
+async def finish_job(job: Job, result: Any = None, error: Optional[str] = None) -> None:
+    now = datetime.utcnow()
+    values = job_outcome(job.attempts, job.max_attempts, error, now)
+    if error is None:
+        values["result"] = result
+    async with AsyncSessionLocal() as db:
+        # Once the lock went stale another worker owns the job; leave it alone
+        await db.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.locked_at == job.locked_at)
+            .values(locked_at=None, locked_by=None, updated_at=now, **values)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+
+async def run_next_job() -> bool:
+    """Claim and run one due job; False when no job is due."""
+    job = await claim_job()
+    if job is None:
+        return False
+
+    registered = _handlers.get(job.kind)
+    if job.attempts > job.max_attempts:
+        await finish_job(job, error="Worker lost during the last attempt")
+    elif registered is None:
+        # Another process may know the handler; retry there
+        await finish_job(job, error=f"No job handler registered for {job.kind!r}")
+    else:
+        try:
+            result = await registered[0](dict(job.payload))
+        except Exception as e:
+            logger.warning("Job %s (%s) attempt %s/%s failed: %s", job.id, job.kind, job.attempts, job.max_attempts, e)
+            await finish_job(job, error=f"{type(e).__name__}: {e}")
+        else:
+            logger.info("Job %s (%s) completed", job.id, job.kind)
+            await finish_job(job, result=result)
+    return True
+
+
+async def run_pending_jobs(limit: Optional[int] = None) -> int:
+    """Run due jobs in the current task until none is left; returns how many ran.
+
+    For scripts and local testing without a running worker.
+    """
+    load_handlers()
+    ran = 0
+    while (limit is None or ran < limit) and await run_next_job():
+        ran += 1
+    return ran
+
+
+class JobWorker:
+    """``concurrency`` asyncio tasks that claim and run due jobs.
+
+    Idle tasks poll every ``poll_interval`` seconds, and are woken at once
+    when a session that enqueued a job commits in this process.
+    """
+
+    def __init__(self, concurrency: int = JOB_WORKERS, poll_interval: float = JOB_POLL_INTERVAL):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+
+    def start(self) -> None:
+        load_handlers()
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._run(), name=f"job-worker-{i}") for i in range(self.concurrency)]
+        _workers.add(self)
+        logger.info("Started %s job workers as %s", self.concurrency, WORKER_ID)
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    async def stop(self, timeout: float = 10) -> None:
+        """Let running jobs finish for up to ``timeout`` seconds, then cancel them.
+
+        A cancelled job stays running until its lock expires and is then
+        claimed again, by this or another process.
+        """
+        self._stopping = True
+        _workers.discard(self)
+        self._wakeup.set()
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                if await run_next_job():
+                    continue
+            except Exception:
+                logger.exception("Job worker could not claim or finish a job")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def get_job(db: AsyncSession, job_id: uuid.UUID) -> Optional[Job]:
+    return await db.scalar(select(Job).where(Job.id == job_id))
+
+
+async def get_job_by_key(db: AsyncSession, key: str) -> Optional[Job]:
+    return await db.scalar(select(Job).where(Job.key == key))
+
+
+def serialize_job(job: Job) -> Dict[str, Any]:
+    def iso(value: Optional[datetime]) -> Optional[str]:
+        return value.isoformat() if value else None
+
+    return {
+        "id": str(job.id),
+        "kind": job.kind,
+        "key": job.key,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "run_at": iso(job.run_at),
+        "last_error": job.last_error,
+        "result": job.result,
+        "created_by": str(job.created_by) if job.created_by else None,
+        "created_at": iso(job.created_at),
+        "finished_at": iso(job.finished_at),
+    }
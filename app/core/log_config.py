@@ -0,0 +1,144 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+"""Logging setup: queue-backed output, per-module levels, JSON and DEBUG sampling.
+
+Request handlers only put records on an in-memory queue. A background
+``QueueListener`` thread formats them and writes them to stdout, so slow
+terminals or log collectors never block the event loop. Configured from the
+environment by ``setup_logging()``:
+
+- ``LOG_LEVEL``: root level (default ``INFO``)
+- ``LOG_LEVELS``: per-logger overrides, e.g. ``app.api.middleware=DEBUG,sqlalchemy.engine=WARNING``
+- ``LOG_FORMAT``: ``text`` (default) or ``json``
+- ``LOG_DEBUG_RATE_LIMIT``: DEBUG records per second allowed per logger (0 = unlimited)
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+TEXT_FORMAT = "%(levelname)s:     %(message)s (%(name)s)"
+
+# Set per request by RequestContextMiddleware; "-" outside a request
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+_listener: Optional[QueueListener] = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the id of the request that produced them."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class DebugRateLimitFilter(logging.Filter):
+    """Pass at most ``per_second`` DEBUG records per logger each second; drop the rest."""
+
+    def __init__(self, per_second: int):
+        super().__init__()
+        self.per_second = per_second
+        self._lock = threading.Lock()
+        self._windows: Dict[str, list] = {}  # logger name -> [second, passed]
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.per_second <= 0:
+            return True
+        second = int(time.monotonic())
+        with self._lock:
+            window = self._windows.get(record.name)
+            if window is None or window[0] != second:
+                window = self._windows[record.name] = [second, 0]
+            if window[1] < self.per_second:
+                window[1] += 1
+                return True
+            self.dropped += 1
+            return False
+
+
+class _ThreadQueueHandler(QueueHandler):
+    """QueueHandler for an in-process listener: resolve args now, format on the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Arguments may be mutated after the call returns, so merge them here;
+        # tracebacks and formatting stay with the record for the listener.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log collectors."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def _parse_levels(spec: str) -> Dict[str, str]:
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging() -> None:
+    """Route all logging through a background queue listener; safe to call more than once."""
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    if os.getenv("LOG_FORMAT", "text").lower() == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _ThreadQueueHandler(log_queue)
+    # Filters run on the caller's side, where the request id is known
+    queue_handler.addFilter(RequestIdFilter())
+    queue_handler.addFilter(DebugRateLimitFilter(int(os.getenv("LOG_DEBUG_RATE_LIMIT", "50"))))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    for name, level in _parse_levels(os.getenv("LOG_LEVELS", "")).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -3,16 +3,22 @@
 import logging
 logger = logging.getLogger(__name__)
 
-from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, Table, DateTime, text
+from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, Table, DateTime, Index, func, literal_column, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.dialects.postgresql import JSONB, ARRAY, UUID as PG_UUID
-from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, relationship
 from sqlalchemy.schema import FetchedValue
+import asyncio
 import os
+import time
 from datetime import datetime
 import uuid
 
+from starlette.requests import Request
+
+from .database import create_async_db_engine, create_db_engine
+
 Base = declarative_base()
 
 # Association table for many-to-many relationship between objectives and categories
@@ -27,9 +33,9 @@ if os.path.exists(env_local_path):
     try:
         from dotenv import load_dotenv
         load_dotenv(env_local_path)
-        print("Loaded .env.local configuration from models.py")
+        logger.info("Loaded .env.local configuration from models.py")
     except ImportError:
-        print("Warning: python-dotenv not installed, using environment variables")
+        logger.warning("python-dotenv not installed, using environment variables")
 
 # PostgreSQL configuration from environment
 DB_USER = os.getenv('DB_USER', 'postgres')
@@ -38,34 +44,113 @@ DB_HOST = os.getenv('DB_HOST', 'localhost')
 DB_PORT = os.getenv('DB_PORT', '5432')
 DB_NAME = os.getenv('DB_NAME', 'sphereconnect')
 
-# Create PostgreSQL engine with retry logic
-DATABASE_URL = f'postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
-import time
+# Connection URLs; engines are created on first use (see get_engine), so
+# importing this module never touches the network.
+# The driver is pinned: scripts/generate_data.py loads rows with psycopg2's COPY API.
+DATABASE_URL = f'postgresql+psycopg2://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+# Async engine for the FastAPI routers, so database round trips do not block
+# the event loop. The Flask app and scripts keep using ENGINE/SessionLocal.
+ASYNC_DATABASE_URL = f'postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
 
-max_retries = 5
-retry_delay = 2  # seconds
+# Optional streaming replica for read-only requests (see get_async_db). When
+# DB_REPLICA_HOST is unset every request uses the primary.
+DB_REPLICA_HOST = os.getenv('DB_REPLICA_HOST')
+DB_REPLICA_PORT = os.getenv('DB_REPLICA_PORT', DB_PORT)
+REPLICA_ASYNC_DATABASE_URL = (
+    f'postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_REPLICA_HOST}:{DB_REPLICA_PORT}/{DB_NAME}'
+    if DB_REPLICA_HOST else None
+)
+# How long a client's reads stay on the primary after it writes, so it sees
+# its own changes despite replication lag.
+REPLICA_STICKY_SECONDS = float(os.getenv('DB_REPLICA_STICKY_SECONDS', '5'))
+
+_engine = None
+_async_engine = None
+_replica_async_engine = None
+
+
+def get_engine():
+    """Return the process-wide sync engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        _engine = create_db_engine(DATABASE_URL)
+    return _engine
+
+
+def get_async_engine():
+    """Return the process-wide async engine, creating it on first use."""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_db_engine(ASYNC_DATABASE_URL)
+    return _async_engine
+
+
+def get_replica_async_engine():
+    """Return the read replica engine, or the primary when no replica is configured."""
+    global _replica_async_engine
+    if REPLICA_ASYNC_DATABASE_URL is None:
+        return get_async_engine()
+    if _replica_async_engine is None:
+        _replica_async_engine = create_async_db_engine(REPLICA_ASYNC_DATABASE_URL, name="replica")
+    return _replica_async_engine
+
+
+def _reset_pools_after_fork():
+    # A forked worker must not share pooled connections with its parent.
+    # dispose(close=False) gives the child fresh pools and leaves the
+    # parent's sockets alone.
+    if _engine is not None:
+        _engine.dispose(close=False)
+    if _async_engine is not None:
+        _async_engine.sync_engine.dispose(close=False)
+    if _replica_async_engine is not None:
+        _replica_async_engine.sync_engine.dispose(close=False)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker bound to get_engine() when the first session is made."""
+
+    def __call__(self, **local_kw):
+        if self.kw.get('bind') is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+class _LazyAsyncSessionmaker(async_sessionmaker):
+    """async_sessionmaker bound to get_async_engine() when the first session is made."""
+
+    _get_bind = staticmethod(get_async_engine)
+
+    def __call__(self, **local_kw):
+        if self.kw.get('bind') is None:
+            self.configure(bind=self._get_bind())
+        return super().__call__(**local_kw)
+
+
+class _LazyReplicaSessionmaker(_LazyAsyncSessionmaker):
+    """async_sessionmaker bound to get_replica_async_engine() when the first session is made."""
+
+    _get_bind = staticmethod(get_replica_async_engine)
 
-for attempt in range(max_retries):
-    try:
-        logger.info(f"Connecting to database (attempt {attempt + 1}/{max_retries}): {DATABASE_URL.replace(DB_PASS, '***')}")
-        #print(f"Connecting to database (attempt {attempt + 1}/{max_retries}): {DATABASE_URL.replace(DB_PASS, '***')}")
-        ENGINE = create_engine(DATABASE_URL, pool_pre_ping=True, pool_recycle=300)
-        # Test connection
-        with ENGINE.connect() as conn:
-            conn.execute(text("SELECT 1"))
-        logger.info("Database connection successful")
-        break
-    except Exception as e:
-        logger.error(f"Database connection failed (attempt {attempt + 1}): {e}")
-        if attempt < max_retries - 1:
-            print(f"Retrying in {retry_delay} seconds...")
-            time.sleep(retry_delay)
-            retry_delay *= 2  # exponential backoff
-        else:
-            logger.error("Max retries exceeded")
-            raise
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=ENGINE)
+
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
+# Objects stay usable after commit; attributes are never lazily reloaded under asyncio.
+AsyncSessionLocal = _LazyAsyncSessionmaker(class_=AsyncSession, autoflush=False, expire_on_commit=False)
+ReplicaSessionLocal = _LazyReplicaSessionmaker(class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+def __getattr__(name):
+    # ENGINE and ASYNC_ENGINE stay importable for scripts, but are only
+    # created when actually used.
+    if name == 'ENGINE':
+        return get_engine()
+    if name == 'ASYNC_ENGINE':
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 class User(Base):
     __tablename__ = 'users'
@@ -93,6 +178,8 @@ class User(Base):
     current_guild_id = Column(PG_UUID(as_uuid=True), ForeignKey('guilds.id'), nullable=True)
     max_guilds = Column(Integer, default=3)
     is_system_admin = Column(Boolean, default=False)
+    # Approved guild_requests of this user, maintained on flush (see api.utils.membership)
+    approved_guild_count = Column(Integer, nullable=False, default=0, server_default=text('0'))
     preferences = relationship('Preference', secondary='user_preferences', back_populates='users')
 
 class Guild(Base):
@@ -106,6 +193,10 @@ class Guild(Base):
     is_active = Column(Boolean, default=True)
     is_deletable = Column(Boolean, default=True)
     type = Column(String, default='game_star_citizen')
+    # Bumped whenever ranks, access levels or user_access rows of the guild change
+    permission_version = Column(Integer, nullable=False, default=0, server_default=text('0'))
+    # Approved guild_requests for this guild, maintained on flush (see api.utils.membership)
+    approved_member_count = Column(Integer, nullable=False, default=0, server_default=text('0'))
 
     # Relationships
     creator = relationship('User', foreign_keys=[creator_id])
@@ -133,6 +224,15 @@ class Objective(Base):
     squad_id = Column(PG_UUID(as_uuid=True), ForeignKey('squads.id'))
     is_deleted = Column(Boolean, default=False)
 
+# Objective status as derived from progress (missing means active). The
+# literals are inlined so the expression matches idx_objectives_guild_status.
+OBJECTIVE_STATUS = func.coalesce(
+    Objective.progress.op('->>')(literal_column("'status'")),
+    literal_column("'active'"),
+)
+Index('idx_objectives_guild_status', Objective.guild_id, OBJECTIVE_STATUS)
+Index('idx_objectives_allowed_ranks', Objective.allowed_ranks, postgresql_using='gin')
+
 class Task(Base):
     __tablename__ = 'tasks'
     id = Column(PG_UUID(as_uuid=True), primary_key=True)
@@ -234,6 +334,29 @@ class UserSession(Base):
     ip_address = Column(String(45))  # Support IPv4 and IPv6
     user_agent = Column(String(255))
 
+class Job(Base):
+    """Deferred work claimed and run by the in-process workers (see core.jobs)."""
+    __tablename__ = 'jobs'
+    id = Column(PG_UUID(as_uuid=True), primary_key=True)
+    kind = Column(String, nullable=False)
+    key = Column(String, unique=True)  # Idempotency key; NULL allows duplicates
+    payload = Column(JSONB, nullable=False, default=dict)
+    status = Column(String, nullable=False, default='pending')  # pending, running, completed, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_at = Column(DateTime)
+    locked_by = Column(String)
+    last_error = Column(String)
+    result = Column(JSONB)
+    created_by = Column(PG_UUID(as_uuid=True))  # No foreign key: jobs outlive the rows they work on
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = Column(DateTime)
+
+# Workers look for the oldest due job of a status
+Index('idx_jobs_status_run_at', Job.status, Job.run_at)
+
 # Database utility functions
 def get_db():
     logger.debug("Models: Getting DB session")
@@ -245,7 +368,75 @@ def get_db():
             logger.debug("Models: Closing DB session")
             db.close()
         except Exception as e:
-            print(f"Warning: Error closing database session: {e}")
+            logger.warning("Error closing database session: %s", e)
+
+_READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Responses to writes tell the client until when its reads must use the
+# primary (see ReadYourWritesMiddleware). Browsers send it back as a cookie,
+# other clients as a header, so every worker process and host honours it.
+READ_PRIMARY_HEADER = "X-Read-Primary-Until"
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+
+def read_primary_until() -> float:
+    """Unix time until which a client that writes now should read from the primary."""
+    return time.time() + REPLICA_STICKY_SECONDS
+
+
+def _wrote_recently(request: Request) -> bool:
+    marker = request.headers.get(READ_PRIMARY_HEADER) or request.cookies.get(READ_PRIMARY_COOKIE)
+    try:
+        return float(marker) > time.time()
+    except (TypeError, ValueError):
+        return False
+
+
+async def get_async_db(request: Request):
+    """Session for the request: reads go to the replica unless this client wrote recently."""
+    if request.method in _READ_METHODS and REPLICA_ASYNC_DATABASE_URL and not _wrote_recently(request):
+        logger.debug("Models: Getting replica DB session")
+        async with ReplicaSessionLocal() as db:
+            yield db
+        return
+
+    logger.debug("Models: Getting async DB session")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_primary_db():
+    """Primary session regardless of method, for read routes that also write."""
+    async with AsyncSessionLocal() as db:
+        yield db
 
 def create_tables():
-    Base.metadata.create_all(bind=ENGINE)
+    Base.metadata.create_all(bind=get_engine())
+
+async def init_database(max_retries: int = 5, retry_delay: float = 2):
+    """Wait for PostgreSQL and create missing tables; run once at application startup."""
+    engine = get_async_engine()
+    for attempt in range(max_retries):
+        try:
+            logger.info("Connecting to database (attempt %s/%s): %s", attempt + 1, max_retries, ASYNC_DATABASE_URL.replace(DB_PASS, '***'))
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            logger.info("Database connection successful")
+            return
+        except Exception as e:
+            logger.error("Database connection failed (attempt %s): %s", attempt + 1, e)
+            if attempt < max_retries - 1:
+                logger.info("Retrying in %s seconds...", retry_delay)
+                await asyncio.sleep(retry_delay)
+                retry_delay *= 2  # exponential backoff
+            else:
+                logger.error("Max retries exceeded")
+                raise
+
+async def dispose_engines():
+    """Close pooled connections; run at application shutdown."""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _replica_async_engine is not None:
+        await _replica_async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
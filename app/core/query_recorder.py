@@ -0,0 +1,96 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+"""Request-scoped SQL recording for spotting N+1 query patterns.
+
+``record_queries()`` collects every statement executed in the current
+context (request task, or a block in a test) together with a fingerprint:
+the SQL with literals and bind parameters stripped, so the same query for
+different ids shares one shape. ``QueryWatchMiddleware`` warns when a shape
+repeats more than ``QUERY_REPEAT_WARN_THRESHOLD`` times in one request, and
+``assert_max_queries`` fails a test that goes over its query budget.
+"""
+
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|\$\d+|(?<![:\w]):\w+|\?|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalise SQL so statements differing only in values compare equal."""
+    shape = _PLACEHOLDER.sub("?", statement)
+    shape = _VALUE_LIST.sub("(...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryRecorder:
+    """Statements executed while the recorder is active."""
+
+    def __init__(self, parent: Optional["QueryRecorder"] = None):
+        self.parent = parent
+        self.statements: List[str] = []
+        self.shapes: Counter = Counter()
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def add(self, statement: str) -> None:
+        self.statements.append(statement)
+        self.shapes[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed more than ``threshold`` times, most frequent first."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+    def report(self) -> str:
+        lines = [f"{self.count} queries executed:"]
+        lines.extend(f"  {n}x {shape}" for shape, n in self.shapes.most_common())
+        return "\n".join(lines)
+
+
+_current: ContextVar[Optional[QueryRecorder]] = ContextVar("query_recorder", default=None)
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryRecorder]:
+    """Record statements run in this context; nested recorders also feed their parents."""
+    recorder = QueryRecorder(parent=_current.get())
+    token = _current.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryRecorder]:
+    """Fail with the recorded statement shapes if the block runs more than ``limit`` queries."""
+    with record_queries() as recorder:
+        yield recorder
+    if recorder.count > limit:
+        raise AssertionError(f"Expected at most {limit} queries, got {recorder.count}.\n{recorder.report()}")
+
+
+def warn_on_repeats(recorder: QueryRecorder, threshold: int, where: str) -> None:
+    for shape, n in recorder.repeated(threshold):
+        logger.warning("Possible N+1 in %s: statement ran %s times: %s", where, n, shape[:300])
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    recorder = _current.get()
+    while recorder is not None:
+        recorder.add(statement)
+        recorder = recorder.parent
@@ -4,26 +4,23 @@ import os
 import sys
 import logging
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    #format="%(levelname)s:\t%(asctime)s\t%(name)s\t%(message)s",
-    format="%(levelname)s:     %(message)s (%(name)s)",
-    handlers=[logging.StreamHandler(sys.stdout)]
-)
+from .core.log_config import setup_logging
+
+setup_logging()
 logger = logging.getLogger(__name__)
 
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import jwt
 
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, ValidationError
-from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 import uuid
+from contextlib import asynccontextmanager
 
 # Rate limiting imports
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -32,39 +29,60 @@ from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
 # Import our models and routes
-from .core.models import get_db, create_tables
+from .core.config import Settings
+from .core.database import pool_stats
+from .core.jobs import JOB_WORKERS, JobWorker
+from .core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, render_metrics
+from .core.models import READ_PRIMARY_HEADER, get_db, dispose_engines, init_database
 from .api.routes import router
 from .api.admin_routes import router as admin_router
-from .api.middleware import GuildLimitMiddleware
+from .api.middleware import (
+    REQUEST_ID_HEADER,
+    GuildLimitMiddleware,
+    MetricsMiddleware,
+    QueryWatchMiddleware,
+    ReadYourWritesMiddleware,
+    RequestContextMiddleware,
+)
+from .api.utils import NEXT_CURSOR_HEADER, guild_events, hashing_stats
 
 load_dotenv()
 
 
-class Settings(BaseSettings):
-    db_user: str = "postgres"
-    db_pass: str
-    db_host: str = "localhost"
-    db_port: int = 5432
-    db_name: str = "sphereconnect"
-    cors_origins: str = "http://localhost:3000"
-
-    class Config:
-        env_file = ".env.local"
-        extra = "ignore"
-
 try:
     settings = Settings()
     logger.info("Configuration loaded successfully")
 except ValidationError as e:
-    logger.error(f"Configuration validation failed: {e}")
+    logger.error("Configuration validation failed: %s", e)
     raise
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Database work happens here rather than at import, so importing the app
+    # (tests, scripts, each forked worker) needs no live database.
+    try:
+        logger.info("Attempting to create database tables...")
+        await init_database()
+        logger.info("Database tables created successfully")
+    except Exception as e:
+        logger.error("Failed to create database tables: %s", e)
+        raise
+    # Every worker process runs its own job workers; they share the jobs table
+    job_worker = JobWorker() if JOB_WORKERS > 0 else None
+    if job_worker:
+        job_worker.start()
+    yield
+    if job_worker:
+        await job_worker.stop()
+    await guild_events.stop()
+    await dispose_engines()
+
 try:
     logger.info("Initializing SphereConnect API...")
-    app = FastAPI(title="SphereConnect API")
+    app = FastAPI(title="SphereConnect API", lifespan=lifespan)
     logger.info("FastAPI app initialized successfully")
 except Exception as e:
-    logger.error(f"Failed to initialize FastAPI app: {e}")
+    logger.error("Failed to initialize FastAPI app: %s", e)
     raise
 
 # CORS middleware
@@ -74,11 +92,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, READ_PRIMARY_HEADER, REQUEST_ID_HEADER],
 )
 
 # Guild limit middleware
 app.add_middleware(GuildLimitMiddleware)
 
+# Keep a client's reads on the primary for a while after it writes
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Warn about statement shapes repeated within a request (N+1 queries)
+app.add_middleware(QueryWatchMiddleware)
+
+# Request metrics; times the whole stack below it
+app.add_middleware(MetricsMiddleware)
+
+# Request id for log records and the X-Request-ID response header; outermost
+app.add_middleware(RequestContextMiddleware)
+
 # Rate limiting setup (disabled for now to avoid configuration issues)
 # limiter = Limiter(key_func=get_remote_address)
 # app.state.limiter = limiter
@@ -92,12 +123,12 @@ app.include_router(admin_router, prefix="/api/admin", tags=["admin"])
 # Log all routes on startup
 logger.info("Logging all registered routes:")
 for route in app.routes:
-    logger.info(f"Route: {route.methods} {route.path}")
+    logger.info("Route: %s %s", route.methods, route.path)
 
 # Global exception handler for unhandled errors
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
-    logger.error(f"Unhandled exception in {request.method} {request.url.path}: {str(exc)}", exc_info=True)
+    logger.error("Unhandled exception in %s %s: %s", request.method, request.url.path, exc, exc_info=True)
     return JSONResponse(
         status_code=500,
         content={"detail": "Internal server error", "error_id": str(uuid.uuid4())},
@@ -107,13 +138,9 @@ async def global_exception_handler(request, exc):
 @app.get("/health", tags=["health"])
 async def health_check():
     logger.debug("Health check endpoint called")
-    return {"status": "healthy", "service": "SphereConnect API"}
+    return {"status": "healthy", "service": "SphereConnect API", "password_hashing": hashing_stats(), "database_pool": pool_stats()}
 
-# Create all database tables
-try:
-    logger.info("Attempting to create database tables...")
-    create_tables()
-    logger.info("Database tables created successfully")
-except Exception as e:
-    logger.error(f"Failed to create database tables: {e}")
-    raise
+# Prometheus scrape endpoint (per worker process; restrict access at the proxy)
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+async def metrics_endpoint():
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
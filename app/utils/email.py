@@ -1,6 +1,8 @@
 # Copyright 2025 Federico Arce. All Rights Reserved.
 # Confidential - Do Not Distribute Without Permission.
 
+import logging
+logger = logging.getLogger(__name__)
 import smtplib
 import os
 from email.mime.text import MIMEText
@@ -34,7 +36,7 @@ def send_email(to_email: str, subject: str, body: str, from_email: str = "info@s
             server.starttls()  # Enable TLS
             server.login(smtp_user, smtp_password)
             server.send_message(msg)
-        print(f"Email sent to {to_email}")
+        logger.info("Email sent to %s", to_email)
     except Exception as e:
-        print(f"Failed to send email: {e}")
+        logger.error("Failed to send email: %s", e)
         raise
@@ -11,5 +11,7 @@ CREATE TABLE guilds (
     is_active BOOLEAN DEFAULT true,
     is_deletable BOOLEAN DEFAULT true,
     type TEXT DEFAULT 'game_star_citizen',
+    permission_version INTEGER NOT NULL DEFAULT 0,
+    approved_member_count INTEGER NOT NULL DEFAULT 0,
     CHECK (NOT (is_solo = true AND is_deletable = true))
 );
\ No newline at end of file
@@ -18,6 +18,8 @@ CREATE TABLE guilds (
     is_active BOOLEAN DEFAULT true,
     is_deletable BOOLEAN DEFAULT true,
     type TEXT DEFAULT 'game_star_citizen',
+    permission_version INTEGER NOT NULL DEFAULT 0,
+    approved_member_count INTEGER NOT NULL DEFAULT 0,
     CHECK (NOT (is_solo = true AND is_deletable = true))
 );
 
@@ -62,6 +64,7 @@ CREATE TABLE users (
     current_guild_id UUID,
     max_guilds INTEGER DEFAULT 3,
     is_system_admin BOOLEAN DEFAULT false,
+    approved_guild_count INTEGER NOT NULL DEFAULT 0,
     FOREIGN KEY (guild_id) REFERENCES guilds(id),
     FOREIGN KEY (rank) REFERENCES ranks(id),
     FOREIGN KEY (squad_id) REFERENCES squads(id),
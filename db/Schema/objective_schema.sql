@@ -19,3 +19,7 @@ CREATE TABLE objectives (
     FOREIGN KEY (lead_id) REFERENCES users(id),
     FOREIGN KEY (squad_id) REFERENCES squads(id)
 );
+
+-- Index for performance
+CREATE INDEX idx_objectives_guild_status ON objectives (guild_id, coalesce(progress ->> 'status', 'active'));
+CREATE INDEX idx_objectives_allowed_ranks ON objectives USING gin (allowed_ranks);
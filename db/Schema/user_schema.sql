@@ -22,6 +22,7 @@ CREATE TABLE users (
     current_guild_id UUID,
     max_guilds INTEGER DEFAULT 3,
     is_system_admin BOOLEAN DEFAULT false,
+    approved_guild_count INTEGER NOT NULL DEFAULT 0,
     FOREIGN KEY (guild_id) REFERENCES guilds(id),
     FOREIGN KEY (rank) REFERENCES ranks(id),
     FOREIGN KEY (squad_id) REFERENCES squads(id),
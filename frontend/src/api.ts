@@ -1,7 +1,10 @@
 import axios, { AxiosInstance, InternalAxiosRequestConfig, AxiosResponse } from 'axios';
+import { NEXT_CURSOR_HEADER, withCursor } from './pagination';
 
 const api: AxiosInstance = axios.create({
   baseURL: 'http://localhost:8000/api',
+  // Sends the read-after-write cookie so reads right after a write see it
+  withCredentials: true,
 });
 
 // Request interceptor to attach token
@@ -101,4 +104,17 @@ api.interceptors.response.use(
   }
 );
 
+// GET a list endpoint, following X-Next-Cursor until the last page
+export const getAllPages = async <T>(url: string): Promise<T[]> => {
+  const items: T[] = [];
+  let next: string | undefined = url;
+  while (next) {
+    const response: AxiosResponse<T[]> = await api.get(next);
+    items.push(...response.data);
+    const cursor = response.headers[NEXT_CURSOR_HEADER.toLowerCase()];
+    next = cursor ? withCursor(url, cursor) : undefined;
+  }
+  return items;
+};
+
 export default api;
\ No newline at end of file
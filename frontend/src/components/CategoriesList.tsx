@@ -6,6 +6,7 @@ import AdminMessage from './AdminMessage';
 import ConfirmModal from './ConfirmModal';
 import { useAdminMessage } from '../hooks/useAdminMessage';
 import { useConfirmModal } from '../hooks/useConfirmModal';
+import { fetchAllPages } from '../pagination';
 
 interface Category {
   id: string;
@@ -56,7 +57,7 @@ function CategoriesList() {
       if (nameFilter) params.append('name', nameFilter);
       if (descriptionFilter) params.append('description', descriptionFilter);
 
-      const response = await fetch(`http://localhost:8000/api/categories?${params}`, {
+      const response = await fetchAllPages(`http://localhost:8000/api/categories?${params}`, {
         headers: { 'Authorization': `Bearer ${token}` }
       });
 
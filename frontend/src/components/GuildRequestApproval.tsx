@@ -3,6 +3,7 @@ import { useGuild } from '../contexts/GuildContext';
 import { adminPageStyles } from './AdminPageStyles';
 import AdminMessage from './AdminMessage';
 import { useAdminMessage } from '../hooks/useAdminMessage';
+import { fetchAllPages } from '../pagination';
 
 interface GuildRequest {
   id: string;
@@ -33,7 +34,7 @@ function GuildRequestApproval() {
     setLoading(true);
     clearMessage();
     try {
-      const response = await fetch(`http://localhost:8000/api/admin/guild_requests?guild_id=${currentGuildId}`, {
+      const response = await fetchAllPages(`http://localhost:8000/api/admin/guild_requests?guild_id=${currentGuildId}`, {
         headers: {
           'Authorization': `Bearer ${token}`
         }
@@ -5,6 +5,7 @@ import { adminPageStyles } from './AdminPageStyles';
 import AdminMessage from './AdminMessage';
 import { useAdminMessage } from '../hooks/useAdminMessage';
 import InviteForm from './InviteForm';
+import { fetchAllPages } from '../pagination';
 
 interface Invite {
   id: string;
@@ -34,7 +35,7 @@ function InviteManagement() {
     clearMessage();
     try {
       const headers = { 'Authorization': `Bearer ${token}` };
-      const response = await fetch(`http://localhost:8000/api/admin/invites?guild_id=${currentGuildId}`, { headers });
+      const response = await fetchAllPages(`http://localhost:8000/api/admin/invites?guild_id=${currentGuildId}`, { headers });
 
       if (response.ok) {
         const invitesData = await response.json();
@@ -2,6 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { useObjectivesAPI, Objective } from '../contexts/ObjectivesAPI';
 import { useGuild } from '../contexts/GuildContext';
 import { theme } from '../theme';
+import { fetchAllPages } from '../pagination';
 
 interface Task {
   id: string;
@@ -64,7 +65,7 @@ const ObjectiveDetail: React.FC<ObjectiveDetailProps> = ({
 
       try {
         const token = localStorage.getItem('token');
-        const response = await fetch(`http://localhost:8000/api/categories?guild_id=${guildId}`, {
+        const response = await fetchAllPages(`http://localhost:8000/api/categories?guild_id=${guildId}`, {
           headers: token ? { 'Authorization': `Bearer ${token}` } : undefined
         });
 
@@ -89,7 +90,7 @@ const ObjectiveDetail: React.FC<ObjectiveDetailProps> = ({
 
       try {
         const token = localStorage.getItem('token');
-        const response = await fetch(`http://localhost:8000/api/admin/ranks?guild_id=${guildId}`, {
+        const response = await fetchAllPages(`http://localhost:8000/api/admin/ranks?guild_id=${guildId}`, {
           headers: token ? { 'Authorization': `Bearer ${token}` } : undefined
         });
 
@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { useObjectivesAPI, Objective, ObjectiveDescription } from '../contexts/ObjectivesAPI';
 import { theme } from '../theme';
+import { fetchAllPages } from '../pagination';
 
 interface ObjectiveFormProps {
   objective?: Objective;
@@ -46,7 +47,7 @@ const ObjectiveForm: React.FC<ObjectiveFormProps> = ({
   const loadCategories = useCallback(async () => {
     try {
       const token = localStorage.getItem('token');
-      const response = await fetch(`http://localhost:8000/api/categories?guild_id=${guildId}`, {
+      const response = await fetchAllPages(`http://localhost:8000/api/categories?guild_id=${guildId}`, {
         headers: { 'Authorization': `Bearer ${token}` }
       });
 
@@ -62,7 +63,7 @@ const ObjectiveForm: React.FC<ObjectiveFormProps> = ({
   const loadRanks = useCallback(async () => {
     try {
       const token = localStorage.getItem('token');
-      const response = await fetch(`http://localhost:8000/api/admin/ranks?guild_id=${guildId}`, {
+      const response = await fetchAllPages(`http://localhost:8000/api/admin/ranks?guild_id=${guildId}`, {
         headers: { 'Authorization': `Bearer ${token}` }
       });
 
@@ -8,6 +8,7 @@ import AdminMessage from './AdminMessage';
 import ConfirmModal from './ConfirmModal';
 import { useAdminMessage } from '../hooks/useAdminMessage';
 import { useConfirmModal } from '../hooks/useConfirmModal';
+import { fetchAllPages } from '../pagination';
 
 interface ObjectivesListProps {
   onViewObjective: (objective: Objective) => void;
@@ -77,7 +78,7 @@ const ObjectivesList: React.FC<ObjectivesListProps> = ({
 
     try {
       const token = localStorage.getItem('token');
-      const response = await fetch(`http://localhost:8000/api/categories?guild_id=${currentGuildId}`, {
+      const response = await fetchAllPages(`http://localhost:8000/api/categories?guild_id=${currentGuildId}`, {
         headers: { 'Authorization': `Bearer ${token}` }
       });
 
@@ -101,7 +102,7 @@ const ObjectivesList: React.FC<ObjectivesListProps> = ({
 
     try {
       const token = localStorage.getItem('token');
-      const response = await fetch(`http://localhost:8000/api/admin/ranks?guild_id=${currentGuildId}`, {
+      const response = await fetchAllPages(`http://localhost:8000/api/admin/ranks?guild_id=${currentGuildId}`, {
         headers: { 'Authorization': `Bearer ${token}` }
       });
 
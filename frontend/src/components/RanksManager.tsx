@@ -6,6 +6,7 @@ import AdminMessage from './AdminMessage';
 import ConfirmModal from './ConfirmModal';
 import { useAdminMessage } from '../hooks/useAdminMessage';
 import { useConfirmModal } from '../hooks/useConfirmModal';
+import { fetchAllPages } from '../pagination';
 
 interface Rank {
   id: string;
@@ -50,7 +51,7 @@ function RanksManager() {
     setLoading(true);
     try {
       const headers = { 'Authorization': `Bearer ${token}` };
-      const response = await fetch(`http://localhost:8000/api/admin/ranks?guild_id=${currentGuildId}`, { headers });
+      const response = await fetchAllPages(`http://localhost:8000/api/admin/ranks?guild_id=${currentGuildId}`, { headers });
 
       if (response.ok) {
         const data = await response.json();
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import ConfirmModal from './ConfirmModal';
 import { useConfirmModal } from '../hooks/useConfirmModal';
+import { fetchAllPages } from '../pagination';
 
 interface User {
 
@@ -76,7 +77,7 @@ const UserList: React.FC<UserListProps> = ({
 
     try {
 
-      const response = await fetch(`http://localhost:8000/api/admin/users?guild_id=${guildId}`, {
+      const response = await fetchAllPages(`http://localhost:8000/api/admin/users?guild_id=${guildId}`, {
 
         headers: {
 
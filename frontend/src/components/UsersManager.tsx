@@ -4,6 +4,7 @@ import { theme } from '../theme';
 import { adminPageStyles } from './AdminPageStyles';
 import AdminMessage from './AdminMessage';
 import { useAdminMessage } from '../hooks/useAdminMessage';
+import { fetchAllPages } from '../pagination';
 
 interface Rank {
   id: string;
@@ -122,7 +123,7 @@ const UsersManager: React.FC = () => {
         url = `${url}&${preferenceParams}`;
       }
 
-      const response = await fetch(url, { headers: requestHeaders });
+      const response = await fetchAllPages(url, { headers: requestHeaders });
       if (!response.ok) {
         if (response.status === 403) {
           showMessage('error', 'Insufficient permissions to manage users. You need manage_users permission.');
@@ -149,7 +150,7 @@ const UsersManager: React.FC = () => {
     }
 
     try {
-      const response = await fetch(`http://localhost:8000/api/admin/ranks?guild_id=${currentGuildId}`, { headers: requestHeaders });
+      const response = await fetchAllPages(`http://localhost:8000/api/admin/ranks?guild_id=${currentGuildId}`, { headers: requestHeaders });
       if (response.ok) {
         const data = await response.json();
         setRanks(data);
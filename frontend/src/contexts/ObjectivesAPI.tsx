@@ -1,5 +1,5 @@
 import React, { createContext, useContext } from 'react';
-import api from '../api';
+import api, { getAllPages } from '../api';
 
 export interface ObjectiveDescription {
   brief: string;
@@ -57,8 +57,7 @@ export const ObjectivesAPIProvider: React.FC<ObjectivesAPIProviderProps> = ({ ch
     if (filters?.status) params.append('status', filters.status);
     if (filters?.category_id) params.append('category_id', filters.category_id);
 
-    const response = await api.get(`/objectives?${params}`);
-    return response.data;
+    return getAllPages<Objective>(`/objectives?${params}`);
   };
 
   const getObjective = async (id: string): Promise<Objective> => {
@@ -19,6 +19,7 @@ import CategoriesList from '../components/CategoriesList';
 import CategoryForm from '../components/CategoryForm';
 import AdminMessage from '../components/AdminMessage';
 import { ObjectivesAPIProvider, useObjectivesAPI, Objective } from '../contexts/ObjectivesAPI';
+import { fetchAllPages } from '../pagination';
 
 type ActiveTab = 'users' | 'ranks' | 'objectives' | 'tasks' | 'squads' | 'access-levels' | 'categories' | 'guilds' | 'invites' | 'guild-requests';
 
@@ -134,14 +135,14 @@ function AdminDashboardContent() {
       switch (activeTab) {
         case 'users':
           // Load users for the guild
-          const usersResponse = await fetch(`http://localhost:8000/api/admin/users?guild_id=${currentGuildId}`, { headers });
+          const usersResponse = await fetchAllPages(`http://localhost:8000/api/admin/users?guild_id=${currentGuildId}`, { headers });
           if (usersResponse.ok) {
             const usersData = await usersResponse.json();
             setUsers(usersData);
           }
           break;
         case 'ranks':
-          const ranksResponse = await fetch(`http://localhost:8000/api/admin/ranks?guild_id=${currentGuildId}`, { headers });
+          const ranksResponse = await fetchAllPages(`http://localhost:8000/api/admin/ranks?guild_id=${currentGuildId}`, { headers });
           if (ranksResponse.ok) {
             const ranksData = await ranksResponse.json();
             setRanks(ranksData);
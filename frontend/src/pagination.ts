@@ -0,0 +1,30 @@
+// List endpoints return one page at a time; the next page's cursor comes in
+// the X-Next-Cursor response header, which is absent on the last page.
+export const NEXT_CURSOR_HEADER = 'X-Next-Cursor';
+
+export const withCursor = (url: string, cursor: string): string =>
+  `${url}${url.includes('?') ? '&' : '?'}cursor=${encodeURIComponent(cursor)}`;
+
+// fetch() that follows the cursor: resolves to the first failing response,
+// or to one response whose body holds the items of every page.
+export const fetchAllPages = async (url: string, init?: RequestInit): Promise<Response> => {
+  let response = await fetch(url, init);
+  let cursor = response.ok ? response.headers?.get?.(NEXT_CURSOR_HEADER) : null;
+  if (!cursor) {
+    return response;
+  }
+
+  const items: unknown[] = [...(await response.json())];
+  while (cursor) {
+    response = await fetch(withCursor(url, cursor), init);
+    if (!response.ok) {
+      return response;
+    }
+    items.push(...(await response.json()));
+    cursor = response.headers.get(NEXT_CURSOR_HEADER);
+  }
+  return new Response(JSON.stringify(items), {
+    status: 200,
+    headers: { 'Content-Type': 'application/json' },
+  });
+};
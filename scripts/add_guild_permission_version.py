@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Add Guild Permission Version Column Migration
+Adds permission_version column to guilds table so access tokens can carry
+permission claims that are invalidated when a guild's RBAC data changes
+"""
+
+import os
+import sys
+from sqlalchemy import create_engine, text
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def add_guild_permission_version():
+    """Apply schema migration to add permission_version column to guilds table"""
+
+    # Database configuration
+    env_local_path = os.path.join(os.path.dirname(__file__), '..', '.env.local')
+    if os.path.exists(env_local_path):
+        try:
+            from dotenv import load_dotenv
+            load_dotenv(env_local_path)
+        except ImportError:
+            pass
+
+    DB_USER = os.getenv('DB_USER', 'postgres')
+    DB_PASS = os.getenv('DB_PASS', 'password')
+    DB_HOST = os.getenv('DB_HOST', 'localhost')
+    DB_PORT = os.getenv('DB_PORT', '5432')
+    DB_NAME = os.getenv('DB_NAME', 'sphereconnect')
+
+    DATABASE_URL = f'postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+
+    try:
+        print("Connecting to database...")
+        engine = create_engine(DATABASE_URL)
+
+        with engine.connect() as conn:
+            # Check if guilds table exists
+            result = conn.execute(text("""
+                SELECT EXISTS (
+                    SELECT 1 FROM information_schema.tables
+                    WHERE table_name = 'guilds'
+                );
+            """))
+
+            if result.fetchone()[0]:
+                print("Checking guilds table structure...")
+
+                # Check if permission_version column exists
+                result = conn.execute(text("""
+                    SELECT EXISTS (
+                        SELECT 1 FROM information_schema.columns
+                        WHERE table_name = 'guilds' AND column_name = 'permission_version'
+                    );
+                """))
+
+                if not result.fetchone()[0]:
+                    print("Adding permission_version column...")
+                    conn.execute(text("""
+                        ALTER TABLE guilds
+                        ADD COLUMN permission_version INTEGER NOT NULL DEFAULT 0;
+                    """))
+                    conn.commit()
+                    print("Permission version column added successfully")
+                else:
+                    print("Permission version column already exists")
+
+                print("Successfully updated guilds table schema")
+            else:
+                print("guilds table doesn't exist - will be created with correct schema")
+
+            print("Schema migration completed successfully!")
+
+    except Exception as e:
+        print(f"Schema migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+if __name__ == "__main__":
+    print("SphereConnect Guild Permission Version Migration")
+    print("=" * 50)
+
+    success = add_guild_permission_version()
+
+    if success:
+        print("\nMigration applied successfully!")
+        print("The guilds table now has permission_version column.")
+        print("Access tokens issued from now on carry permission claims.")
+    else:
+        print("\nMigration failed!")
+        sys.exit(1)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Add Membership Counters Migration
+Adds approved_member_count to guilds and approved_guild_count to users and
+backfills both from approved guild_requests, so membership limit checks and
+guild lists no longer count rows on every request
+"""
+
+import os
+import sys
+from sqlalchemy import create_engine, text
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def add_membership_counters():
+    """Apply schema migration to add and backfill membership counter columns"""
+
+    # Database configuration
+    env_local_path = os.path.join(os.path.dirname(__file__), '..', '.env.local')
+    if os.path.exists(env_local_path):
+        try:
+            from dotenv import load_dotenv
+            load_dotenv(env_local_path)
+        except ImportError:
+            pass
+
+    DB_USER = os.getenv('DB_USER', 'postgres')
+    DB_PASS = os.getenv('DB_PASS', 'password')
+    DB_HOST = os.getenv('DB_HOST', 'localhost')
+    DB_PORT = os.getenv('DB_PORT', '5432')
+    DB_NAME = os.getenv('DB_NAME', 'sphereconnect')
+
+    DATABASE_URL = f'postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+
+    try:
+        print("Connecting to database...")
+        engine = create_engine(DATABASE_URL)
+
+        with engine.connect() as conn:
+            # Check if guild_requests table exists
+            result = conn.execute(text("""
+                SELECT EXISTS (
+                    SELECT 1 FROM information_schema.tables
+                    WHERE table_name = 'guild_requests'
+                );
+            """))
+
+            if result.fetchone()[0]:
+                for table, column in (("guilds", "approved_member_count"), ("users", "approved_guild_count")):
+                    result = conn.execute(text("""
+                        SELECT EXISTS (
+                            SELECT 1 FROM information_schema.columns
+                            WHERE table_name = :table AND column_name = :column
+                        );
+                    """), {"table": table, "column": column})
+
+                    if not result.fetchone()[0]:
+                        print(f"Adding {column} column to {table}...")
+                        conn.execute(text(f"""
+                            ALTER TABLE {table}
+                            ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0;
+                        """))
+                    else:
+                        print(f"{column} column already exists")
+
+                # Recount from guild_requests; safe to re-run at any time
+                print("Backfilling guild member counts...")
+                conn.execute(text("""
+                    UPDATE guilds g
+                    SET approved_member_count = COALESCE((
+                        SELECT COUNT(*) FROM guild_requests gr
+                        WHERE gr.guild_id = g.id AND gr.status = 'approved'
+                    ), 0);
+                """))
+
+                print("Backfilling user guild counts...")
+                conn.execute(text("""
+                    UPDATE users u
+                    SET approved_guild_count = COALESCE((
+                        SELECT COUNT(*) FROM guild_requests gr
+                        WHERE gr.user_id = u.id AND gr.status = 'approved'
+                    ), 0);
+                """))
+                conn.commit()
+
+                print("Successfully updated membership counters")
+            else:
+                print("guild_requests table doesn't exist - will be created with correct schema")
+
+            print("Schema migration completed successfully!")
+
+    except Exception as e:
+        print(f"Schema migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+if __name__ == "__main__":
+    print("SphereConnect Membership Counters Migration")
+    print("=" * 50)
+
+    success = add_membership_counters()
+
+    if success:
+        print("\nMigration applied successfully!")
+        print("guilds.approved_member_count and users.approved_guild_count are populated.")
+    else:
+        print("\nMigration failed!")
+        sys.exit(1)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Add Objective Filter Indexes Migration
+Adds an expression index on (guild_id, progress status) and a GIN index on
+allowed_ranks so objective listing filters run in the database
+"""
+
+import os
+import sys
+from sqlalchemy import create_engine, text
+
+# Add the app directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+def add_objective_filter_indexes():
+    """Apply schema migration to add filter indexes to objectives table"""
+
+    # Database configuration
+    env_local_path = os.path.join(os.path.dirname(__file__), '..', '.env.local')
+    if os.path.exists(env_local_path):
+        try:
+            from dotenv import load_dotenv
+            load_dotenv(env_local_path)
+        except ImportError:
+            pass
+
+    DB_USER = os.getenv('DB_USER', 'postgres')
+    DB_PASS = os.getenv('DB_PASS', 'password')
+    DB_HOST = os.getenv('DB_HOST', 'localhost')
+    DB_PORT = os.getenv('DB_PORT', '5432')
+    DB_NAME = os.getenv('DB_NAME', 'sphereconnect')
+
+    DATABASE_URL = f'postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+
+    try:
+        print("Connecting to database...")
+        engine = create_engine(DATABASE_URL)
+
+        with engine.connect() as conn:
+            # Check if objectives table exists
+            result = conn.execute(text("""
+                SELECT EXISTS (
+                    SELECT 1 FROM information_schema.tables
+                    WHERE table_name = 'objectives'
+                );
+            """))
+
+            if result.fetchone()[0]:
+                print("Creating objective status index...")
+                # Must match OBJECTIVE_STATUS in app/core/models.py
+                conn.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_objectives_guild_status
+                    ON objectives (guild_id, coalesce(progress ->> 'status', 'active'));
+                """))
+
+                print("Creating allowed_ranks GIN index...")
+                conn.execute(text("""
+                    CREATE INDEX IF NOT EXISTS idx_objectives_allowed_ranks
+                    ON objectives USING gin (allowed_ranks);
+                """))
+                conn.commit()
+
+                print("Successfully updated objectives table indexes")
+            else:
+                print("objectives table doesn't exist - will be created with correct schema")
+
+            print("Schema migration completed successfully!")
+
+    except Exception as e:
+        print(f"Schema migration failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+    return True
+
+if __name__ == "__main__":
+    print("SphereConnect Objective Filter Indexes Migration")
+    print("=" * 50)
+
+    success = add_objective_filter_indexes()
+
+    if success:
+        print("\nMigration applied successfully!")
+        print("The objectives table now has status and allowed_ranks indexes.")
+    else:
+        print("\nMigration failed!")
+        sys.exit(1)
@@ -0,0 +1,262 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+"""
+API Benchmark Suite for SphereConnect
+
+Drives app.main:app in-process through an ASGI client against the database
+configured in .env.local (DB_HOST, DB_NAME, ...), and reports p50/p95/p99
+latency and SQL statements per request for the main endpoints. Results can be
+compared against a stored baseline so regressions show up as a non-zero exit.
+
+A benchmark user ("bench_user") with its personal guild is registered on the
+first run and reused afterwards; each run adds the objectives and tasks it
+creates. Point it at a dedicated database, never at production.
+
+Usage:
+    python scripts/benchmark_api.py                      # Run and print results
+    python scripts/benchmark_api.py --iterations 200     # More samples per endpoint
+    python scripts/benchmark_api.py --update-baseline    # Store results as the new baseline
+    python scripts/benchmark_api.py --tolerance 0.5      # Allow p95 to grow 50% before failing
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import json
+import logging
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import httpx
+
+from app.core.query_recorder import record_queries
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'benchmark_baseline.json')
+
+BENCH_USER = {
+    "name": "Benchmark Pilot",
+    "username": "bench_user",
+    "password": "bench-password-1",
+    "pin": "246810",
+}
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of the samples."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class BenchContext:
+    """Authenticated client plus the ids scenarios need."""
+
+    def __init__(self, client: httpx.AsyncClient, login: Dict[str, Any]):
+        self.client = client
+        self.user_id = login["user"]["id"]
+        self.guild_id = login["current_guild_id"]
+        self.headers = {"Authorization": f"Bearer {login['access_token']}"}
+        self.objective_id: Optional[str] = None
+        self.task_id: Optional[str] = None
+        self.counter = 0
+
+
+async def seed(client: httpx.AsyncClient) -> BenchContext:
+    """Register (once) and log in the benchmark user, then create an objective and task."""
+    response = await client.post("/api/auth/register", json=BENCH_USER)
+    if response.status_code not in (201, 409):
+        raise RuntimeError(f"Registering benchmark user failed: {response.status_code} {response.text}")
+
+    ctx = BenchContext(client, await _login(client))
+    ctx.objective_id = (await _create_objective(ctx)).json()["id"]
+    ctx.task_id = (await _create_task(ctx)).json()["id"]
+    return ctx
+
+
+async def _login(client: httpx.AsyncClient) -> Dict[str, Any]:
+    response = await client.post("/api/auth/login", json={
+        "username_or_email": BENCH_USER["username"],
+        "password": BENCH_USER["password"],
+    })
+    response.raise_for_status()
+    return response.json()
+
+
+async def _create_objective(ctx: BenchContext) -> httpx.Response:
+    ctx.counter += 1
+    return await ctx.client.post("/api/objectives", headers=ctx.headers, json={
+        "name": f"Benchmark objective {ctx.counter}",
+        "guild_id": ctx.guild_id,
+        "description": {"brief": "Collect 500 SCU Gold", "tactical": "", "classified": "", "metrics": {}},
+    })
+
+
+async def _create_task(ctx: BenchContext) -> httpx.Response:
+    ctx.counter += 1
+    return await ctx.client.post("/api/tasks", headers=ctx.headers, json={
+        "name": f"Benchmark task {ctx.counter}",
+        "objective_id": ctx.objective_id,
+        "guild_id": ctx.guild_id,
+    })
+
+
+def _get(path: str, **params) -> Callable:
+    async def call(ctx: BenchContext) -> httpx.Response:
+        query = {key: value(ctx) if callable(value) else value for key, value in params.items()}
+        return await ctx.client.get(path, headers=ctx.headers, params=query)
+    return call
+
+
+async def _login_scenario(ctx: BenchContext) -> httpx.Response:
+    return await ctx.client.post("/api/auth/login", json={
+        "username_or_email": BENCH_USER["username"],
+        "password": BENCH_USER["password"],
+    })
+
+
+async def _progress(ctx: BenchContext) -> httpx.Response:
+    return await ctx.client.patch(f"/api/objectives/{ctx.objective_id}/progress", headers=ctx.headers, json={
+        "metrics": {"scu_gold": 100},
+    })
+
+
+async def _assign(ctx: BenchContext) -> httpx.Response:
+    return await ctx.client.post("/api/tasks/assign", headers=ctx.headers, json={
+        "task_id": ctx.task_id,
+        "user_id": ctx.user_id,
+    })
+
+
+async def _switch_guild(ctx: BenchContext) -> httpx.Response:
+    return await ctx.client.patch(f"/api/users/{ctx.user_id}/switch-guild", headers=ctx.headers, json={
+        "guild_id": ctx.guild_id,
+    })
+
+
+def _guild(ctx: BenchContext) -> str:
+    return ctx.guild_id
+
+
+SCENARIOS = [
+    ("login", _login_scenario),
+    ("objectives.list", _get("/api/objectives", guild_id=_guild)),
+    ("objectives.create", _create_objective),
+    ("objectives.progress", _progress),
+    ("tasks.list", _get("/api/tasks", guild_id=_guild)),
+    ("tasks.create", _create_task),
+    ("tasks.assign", _assign),
+    ("guilds.switch", _switch_guild),
+    ("admin.users", _get("/api/admin/users", guild_id=_guild)),
+    ("admin.objectives", _get("/api/admin/objectives", guild_id=_guild)),
+    ("admin.ranks", _get("/api/admin/ranks", guild_id=_guild)),
+    ("admin.guild_requests", _get("/api/admin/guild_requests", guild_id=_guild)),
+]
+
+
+async def run_benchmark(iterations: int = 50, warmup: int = 5, only: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    """Run every scenario and return {name: {p50_ms, p95_ms, p99_ms, queries, errors}}."""
+    from app.main import app
+    from app.core.models import dispose_engines, init_database
+
+    # Keep per-request debug output out of the measurements
+    logging.getLogger().setLevel(logging.WARNING)
+    await init_database()
+    results = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            ctx = await seed(client)
+            for name, scenario in SCENARIOS:
+                if only and name not in only:
+                    continue
+                for _ in range(warmup):
+                    await scenario(ctx)
+
+                latencies, queries, errors = [], [], 0
+                for _ in range(iterations):
+                    with record_queries() as recorder:
+                        started = time.perf_counter()
+                        response = await scenario(ctx)
+                        latencies.append((time.perf_counter() - started) * 1000)
+                    queries.append(recorder.count)
+                    if response.status_code >= 400:
+                        errors += 1
+
+                results[name] = {
+                    "p50_ms": round(percentile(latencies, 50), 2),
+                    "p95_ms": round(percentile(latencies, 95), 2),
+                    "p99_ms": round(percentile(latencies, 99), 2),
+                    "queries": max(queries),
+                    "errors": errors,
+                }
+    finally:
+        await dispose_engines()
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], tolerance: float) -> List[str]:
+    """Regressions against the baseline: more queries, new errors, or p95 beyond tolerance."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if current["queries"] > previous["queries"]:
+            regressions.append(f"{name}: {current['queries']} queries per request (baseline {previous['queries']})")
+        if current["errors"] > previous.get("errors", 0):
+            regressions.append(f"{name}: {current['errors']} errors (baseline {previous.get('errors', 0)})")
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {current['p95_ms']}ms (baseline {previous['p95_ms']}ms)")
+    return regressions
+
+
+def print_results(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]):
+    print(f"{'endpoint':<24}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'errors':>8}{'base p95':>10}")
+    print("-" * 81)
+    for name, r in results.items():
+        base = baseline.get(name, {}).get("p95_ms", "-")
+        print(f"{name:<24}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['queries']:>9}{r['errors']:>8}{base:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SphereConnect API endpoints in-process")
+    parser.add_argument("--iterations", type=int, default=50, help="Measured requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests per endpoint")
+    parser.add_argument("--only", nargs="*", help="Scenario names to run (default: all)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results to the baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative p95 growth")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args.iterations, args.warmup, args.only))
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print_results(results, baseline)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  - {line}")
+        sys.exit(1)
+    print("\nNo regressions" if baseline else "\nNo baseline yet; run with --update-baseline to store one")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+"""
+Synthetic Data Generator for SphereConnect
+
+Loads large, realistically skewed datasets for benchmarking and load testing.
+Rows are streamed into PostgreSQL with COPY in batches, so a million-row
+dataset loads in minutes; test_data.py remains the small hand-written fixture.
+
+What gets generated:
+- Shared guilds whose member counts follow a heavy-tailed (Pareto) distribution,
+  each with access levels, ranks, categories, invites and objectives with tasks
+- One user per member slot, each with a personal guild like a real registration
+- Approved guild requests for every membership (some users belong to several
+  guilds), plus pending and denied requests, and login sessions
+
+The same --seed always produces the same rows, so benchmark runs against two
+generated databases are comparable. Every generated user shares one password
+(--password) so load tests can log in as anyone. Membership counters are
+recounted at the end.
+
+Usage:
+    python scripts/generate_data.py --guilds 100 --users-per-guild 25
+    python scripts/generate_data.py --guilds 2000 --users-per-guild 40 --objectives-per-guild 50
+    python scripts/generate_data.py --dry-run                # Print row counts only
+"""
+
+import sys
+import os
+import argparse
+import csv
+import io
+import json
+import random
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+# Column order for each table's COPY; tables are flushed in this (foreign key) order
+TABLES = {
+    "guilds": ("id", "name", "member_limit", "billing_tier", "is_solo", "is_active", "is_deletable", "type"),
+    "access_levels": ("id", "guild_id", "name", "user_actions"),
+    "ranks": ("id", "guild_id", "name", "access_levels", "hierarchy_level"),
+    "users": ("id", "guild_id", "name", "username", "email", "password", "pin", "rank",
+              "current_guild_id", "created_at", "updated_at"),
+    "user_access": ("id", "user_id", "access_level_id", "created_at"),
+    "guild_requests": ("id", "user_id", "guild_id", "status", "created_at", "updated_at"),
+    "invites": ("id", "guild_id", "code", "expires_at", "uses_left", "created_at"),
+    "objective_categories": ("id", "guild_id", "name", "description"),
+    "objectives": ("id", "guild_id", "name", "description", "priority", "allowed_ranks", "progress", "tasks"),
+    "objective_categories_junction": ("objective_id", "category_id"),
+    "tasks": ("id", "objective_id", "guild_id", "name", "status", "priority", "progress"),
+    "user_sessions": ("id", "user_id", "token_hash", "expires_at", "created_at", "ip_address", "user_agent"),
+}
+
+SUPER_ADMIN_ACTIONS = [
+    'view_guilds', 'manage_guilds', 'view_users', 'manage_users', 'manage_user_access', 'manage_rbac',
+    'view_objectives', 'create_objective', 'manage_objectives', 'view_ranks', 'manage_ranks',
+    'view_categories', 'create_category', 'manage_categories',
+]
+MEMBER_ACTIONS = ['view_guilds', 'view_objectives', 'view_ranks', 'view_categories']
+RANKS = ("Commander", "Officer", "Pilot", "Recruit")
+CATEGORIES = ("Mining", "Trading", "Combat", "Exploration", "Salvage", "Logistics", "Medical", "Security")
+PRIORITIES = ("Low", "Medium", "Medium", "High", "Critical")
+OBJECTIVE_STATUSES = ("active",) * 6 + ("completed",) * 3 + ("cancelled",)
+TASK_STATUSES = ("Pending",) * 4 + ("In Progress",) * 3 + ("Completed",) * 2 + ("Failed",)
+RESOURCES = ("Gold", "Quantanium", "Laranite", "Agricium", "Titanium")
+
+
+def _pg(value) -> str:
+    """Render a Python value as COPY CSV text."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, list):
+        return "{" + ",".join(str(v) for v in value) + "}"
+    if isinstance(value, dict):
+        return json.dumps(value)
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return str(value)
+
+
+class Generator:
+    """Builds rows guild by guild into per-table buffers."""
+
+    # Users that later guilds can draw extra members from (reservoir sample)
+    POOL_SIZE = 50000
+
+    def __init__(self, args, password_hash: str, pin_hash: str):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.password_hash = password_hash
+        self.pin_hash = pin_hash
+        self.now = datetime.utcnow()
+        self.rows: Dict[str, List[tuple]] = defaultdict(list)
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.guild_creators: List[tuple] = []
+        self.user_pool: List[uuid.UUID] = []
+        self.user_seq = 0
+
+    def new_id(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def past(self, days: int = 180) -> datetime:
+        return self.now - timedelta(seconds=self.rng.randint(0, days * 86400))
+
+    def add(self, table: str, *values):
+        self.rows[table].append(values)
+        self.counts[table] += 1
+
+    def buffered(self) -> int:
+        return sum(len(rows) for rows in self.rows.values())
+
+    def guild_size(self) -> int:
+        # Pareto(1.5) has mean 3: most guilds are small, a few are huge
+        size = round(self.args.users_per_guild * self.rng.paretovariate(1.5) / 3)
+        return max(2, min(size, self.args.users_per_guild * 50))
+
+    def access_and_ranks(self, guild_id, ranks=RANKS):
+        admin_level, member_level = self.new_id(), self.new_id()
+        self.add("access_levels", admin_level, guild_id, "super_admin", SUPER_ADMIN_ACTIONS)
+        self.add("access_levels", member_level, guild_id, "member", MEMBER_ACTIONS)
+        rank_ids = []
+        for level, name in enumerate(ranks, start=1):
+            rank_id = self.new_id()
+            self.add("ranks", rank_id, guild_id, name, [admin_level if level == 1 else member_level], level)
+            rank_ids.append(rank_id)
+        return admin_level, rank_ids
+
+    def new_user(self, current_guild_id, rank_id) -> uuid.UUID:
+        """A user with their personal guild, as registration creates them."""
+        self.user_seq += 1
+        user_id, personal_id = self.new_id(), self.new_id()
+        username = f"{self.args.prefix}_user{self.user_seq:07d}"
+        created = self.past()
+        self.add("guilds", personal_id, f"{username}'s Personal Guild", 2, "free", True, True, False, "game_star_citizen")
+        personal_admin, _ = self.access_and_ranks(personal_id, RANKS[:1])
+        self.add("users", user_id, personal_id, f"Pilot {self.user_seq}", username, f"{username}@example.test",
+                 self.password_hash, self.pin_hash, rank_id, current_guild_id, created, created)
+        self.add("user_access", self.new_id(), user_id, personal_admin, created)
+        self.add("guild_requests", self.new_id(), user_id, personal_id, "approved", created, created)
+        self.guild_creators.append((personal_id, user_id))
+
+        for _ in range(self.rng.randint(0, self.args.sessions_per_user * 2)):
+            started = self.past(30)
+            address = f"10.{self.rng.randint(0, 255)}.{self.rng.randint(0, 255)}.{self.rng.randint(1, 254)}"
+            agent = "Wingman-AI/1.0" if self.rng.random() < 0.4 else "Mozilla/5.0"
+            self.add("user_sessions", self.new_id(), user_id, "%064x" % self.rng.getrandbits(256),
+                     started + timedelta(days=7), started, address, agent)
+        return user_id
+
+    def remember(self, user_id: uuid.UUID):
+        if len(self.user_pool) < self.POOL_SIZE:
+            self.user_pool.append(user_id)
+        else:
+            slot = self.rng.randrange(self.user_seq)
+            if slot < self.POOL_SIZE:
+                self.user_pool[slot] = user_id
+
+    def shared_guild(self, index: int):
+        guild_id = self.new_id()
+        size = self.guild_size()
+        self.add("guilds", guild_id, f"{self.args.prefix} Fleet {index:06d}", max(size * 2, 10),
+                 "paid" if size > 20 else "free", False, True, True, "game_star_citizen")
+        admin_level, rank_ids = self.access_and_ranks(guild_id)
+
+        # Some member slots go to users who already belong to earlier guilds
+        joiners = sum(self.rng.random() < self.args.multi_guild_ratio for _ in range(size - 1))
+        applicants = self.rng.randint(0, max(1, size // 5))
+        existing = self.rng.sample(self.user_pool, min(len(self.user_pool), joiners + applicants))
+        joining, waiting = existing[:joiners], existing[joiners:]
+
+        for slot in range(size - len(joining)):
+            if slot == 0:
+                rank_id = rank_ids[0]
+            else:
+                rank_id = rank_ids[min(len(rank_ids) - 1, 1 + int(self.rng.expovariate(1.2)))]
+            user_id = self.new_user(guild_id, rank_id)
+            self.add("guild_requests", self.new_id(), user_id, guild_id, "approved", self.past(), self.now)
+            if slot == 0:
+                self.guild_creators.append((guild_id, user_id))
+                self.add("user_access", self.new_id(), user_id, admin_level, self.now)
+            self.remember(user_id)
+
+        for user_id in joining:
+            self.add("guild_requests", self.new_id(), user_id, guild_id, "approved", self.past(), self.now)
+        for user_id in waiting:
+            status = self.rng.choice(("pending", "pending", "denied"))
+            self.add("guild_requests", self.new_id(), user_id, guild_id, status, self.past(), self.now)
+
+        for _ in range(self.rng.randint(0, 3)):
+            self.add("invites", self.new_id(), guild_id, "%012x" % self.rng.getrandbits(48),
+                     self.now + timedelta(days=self.rng.randint(-5, 30)), self.rng.randint(0, 10), self.past(30))
+
+        categories = []
+        category_count = self.rng.randint(1, max(1, min(len(CATEGORIES), self.args.categories_per_guild)))
+        for name in self.rng.sample(CATEGORIES, category_count):
+            category_id = self.new_id()
+            self.add("objective_categories", category_id, guild_id, name, f"{name} operations")
+            categories.append(category_id)
+
+        # Bigger guilds run more objectives
+        scale = size / self.args.users_per_guild * self.rng.uniform(0.5, 1.5)
+        for n in range(max(1, round(self.args.objectives_per_guild * scale))):
+            self.objective(guild_id, n, rank_ids, categories)
+
+    def objective(self, guild_id, n, rank_ids, categories):
+        objective_id = self.new_id()
+        resource = self.rng.choice(RESOURCES)
+        metric = f"scu_{resource.lower()}"
+        target = self.rng.choice((100, 250, 500, 1000))
+        allowed = self.rng.sample(rank_ids, self.rng.randint(1, 2)) if self.rng.random() < 0.4 else []
+
+        task_ids = []
+        for t in range(self.rng.randint(0, self.args.tasks_per_objective * 2)):
+            task_id = self.new_id()
+            task_ids.append(task_id)
+            self.add("tasks", task_id, objective_id, guild_id, f"Haul {resource} leg {t + 1}",
+                     self.rng.choice(TASK_STATUSES), self.rng.choice(PRIORITIES), {})
+
+        description = {"brief": f"Collect {target} SCU {resource}", "tactical": "", "classified": "", "metrics": {metric: target}}
+        progress = {"status": self.rng.choice(OBJECTIVE_STATUSES), metric: self.rng.randint(0, target)}
+        self.add("objectives", objective_id, guild_id, f"Operation {resource} {n + 1}", description,
+                 self.rng.choice(PRIORITIES), allowed, progress, task_ids)
+        for category_id in self.rng.sample(categories, self.rng.randint(0, min(2, len(categories)))):
+            self.add("objective_categories_junction", objective_id, category_id)
+
+
+def copy_rows(cursor, table: str, rows: List[tuple]):
+    # copy_expert is psycopg2's; DATABASE_URL pins that driver
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_pg(value) for value in row])
+    buffer.seek(0)
+    columns = ", ".join(TABLES[table])
+    cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def flush(cursor, generator: Generator):
+    for table in TABLES:
+        rows = generator.rows.pop(table, None)
+        if rows:
+            copy_rows(cursor, table, rows)
+
+
+def finish(cursor, generator: Generator):
+    """Set guild creators and recount membership counters once everything is loaded."""
+    cursor.execute("CREATE TEMP TABLE generated_guild_creators (guild_id uuid, creator_id uuid) ON COMMIT DROP")
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(generator.guild_creators)
+    buffer.seek(0)
+    cursor.copy_expert("COPY generated_guild_creators FROM STDIN WITH (FORMAT csv)", buffer)
+    cursor.execute("""
+        UPDATE guilds g SET creator_id = c.creator_id
+        FROM generated_guild_creators c WHERE g.id = c.guild_id
+    """)
+    cursor.execute("""
+        UPDATE guilds g SET approved_member_count = c.n
+        FROM (SELECT guild_id, COUNT(*) AS n FROM guild_requests WHERE status = 'approved' GROUP BY guild_id) c
+        WHERE g.id = c.guild_id AND g.approved_member_count <> c.n
+    """)
+    cursor.execute("""
+        UPDATE users u SET approved_guild_count = c.n
+        FROM (SELECT user_id, COUNT(*) AS n FROM guild_requests WHERE status = 'approved' GROUP BY user_id) c
+        WHERE u.id = c.user_id AND u.approved_guild_count <> c.n
+    """)
+
+
+def generate(args) -> Dict[str, int]:
+    from app.api.utils import hash_secret
+    from app.core.models import create_tables, get_engine
+
+    generator = Generator(args, hash_secret(args.password), hash_secret(args.pin))
+
+    if args.dry_run:
+        for index in range(args.guilds):
+            generator.shared_guild(index)
+            generator.rows.clear()
+        return dict(generator.counts)
+
+    create_tables()
+    connection = get_engine().raw_connection()
+    try:
+        cursor = connection.cursor()
+        # Bulk loads can run longer than the API's statement_timeout
+        cursor.execute("SET statement_timeout = 0")
+        started = time.time()
+        for index in range(args.guilds):
+            generator.shared_guild(index)
+            if generator.buffered() >= args.batch_size:
+                flush(cursor, generator)
+                print(f"  {index + 1}/{args.guilds} guilds, {sum(generator.counts.values()):,} rows, {time.time() - started:.0f}s")
+        flush(cursor, generator)
+        print("Setting guild creators and membership counters...")
+        finish(cursor, generator)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    return dict(generator.counts)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Generate a large synthetic SphereConnect dataset")
+    parser.add_argument("--guilds", type=int, default=100, help="Shared guilds to create")
+    parser.add_argument("--users-per-guild", type=int, default=25, help="Mean members per guild (heavy-tailed)")
+    parser.add_argument("--objectives-per-guild", type=int, default=20, help="Mean objectives for an average-size guild")
+    parser.add_argument("--tasks-per-objective", type=int, default=3, help="Mean tasks per objective")
+    parser.add_argument("--categories-per-guild", type=int, default=4, help="Maximum categories per guild")
+    parser.add_argument("--sessions-per-user", type=int, default=1, help="Mean login sessions per user")
+    parser.add_argument("--multi-guild-ratio", type=float, default=0.2, help="Share of member slots filled by users of other guilds")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed; the same seed gives the same rows")
+    parser.add_argument("--prefix", default="gen", help="Prefix for generated usernames and guild names")
+    parser.add_argument("--password", default="generated-password", help="Password for every generated user")
+    parser.add_argument("--pin", default="123456", help="PIN for every generated user")
+    parser.add_argument("--batch-size", type=int, default=50000, help="Rows buffered before each COPY")
+    parser.add_argument("--dry-run", action="store_true", help="Count rows without writing anything")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+
+    print("SphereConnect Synthetic Data Generator")
+    print("=" * 50)
+    started = time.time()
+    try:
+        counts = generate(args)
+    except Exception as e:
+        print(f"Data generation failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+    print(f"\n{'Would create' if args.dry_run else 'Created'} in {time.time() - started:.1f}s:")
+    for table in TABLES:
+        print(f"  {table:<32}{counts.get(table, 0):>12,}")
+    print(f"  {'total':<32}{sum(counts.values()):>12,}")
+
+
+if __name__ == "__main__":
+    main()
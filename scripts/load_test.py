@@ -0,0 +1,298 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+"""
+Load Test Harness for SphereConnect
+
+Simulates concurrent Wingman users against a running API server. Each virtual
+user logs in, then runs two loops side by side:
+
+- Voice: the call mix of the wingman-ai/skills/sphereconnect skill
+  (create_objective, report_progress, get_my_tasks, get_guild_status,
+  switch_guild), with an exponential think time between commands
+- Dashboard: the frontend polling /api/objectives and /api/admin/users
+
+Virtual users log in as the users created by scripts/generate_data.py
+(<prefix>_user0000001, ... with the shared password). Users that do not exist
+are registered first, so it also works against an empty database. Virtual
+users start evenly spread over --ramp seconds. The report covers throughput,
+latency percentiles and an error breakdown for each step.
+
+Usage:
+    python scripts/load_test.py --concurrency 50 --ramp 30 --duration 120
+    python scripts/load_test.py --url http://localhost:8000 --think-time 1 --poll-interval 2
+    python scripts/load_test.py --concurrency 200 --json results.json
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import httpx
+
+from benchmark_api import percentile
+
+# Relative frequency of each voice command
+VOICE_MIX = {
+    "create_objective": 1,
+    "report_progress": 3,
+    "get_my_tasks": 3,
+    "get_guild_status": 2,
+    "switch_guild": 1,
+}
+
+RESOURCES = ("Gold", "Quantanium", "Laranite", "Agricium", "Titanium")
+
+
+class StepFailed(Exception):
+    """A step got an error response; ``reason`` is the error bucket it is counted under."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class LoadStats:
+    """Latencies and errors per step, shared by all virtual users."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, step: str, seconds: float, error: Optional[str] = None):
+        self.latencies[step].append(seconds * 1000)
+        if error:
+            self.errors[step][error] += 1
+
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, Any]]:
+        """Per-step {requests, rps, p50_ms, p95_ms, p99_ms, max_ms, errors, error_rate, error_breakdown}."""
+        results = {}
+        for step in sorted(self.latencies):
+            samples = self.latencies[step]
+            errors = sum(self.errors[step].values())
+            results[step] = {
+                "requests": len(samples),
+                "rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+                "p50_ms": round(percentile(samples, 50), 2),
+                "p95_ms": round(percentile(samples, 95), 2),
+                "p99_ms": round(percentile(samples, 99), 2),
+                "max_ms": round(max(samples), 2),
+                "errors": errors,
+                "error_rate": round(errors / len(samples), 4),
+                "error_breakdown": dict(self.errors[step].most_common()),
+            }
+        return results
+
+
+def check(response: httpx.Response) -> httpx.Response:
+    if response.status_code >= 400:
+        raise StepFailed(f"HTTP {response.status_code}")
+    return response
+
+
+class VirtualUser:
+    """One Wingman user with a dashboard open."""
+
+    def __init__(self, client: httpx.AsyncClient, stats: LoadStats, index: int, args, rng: random.Random):
+        self.client = client
+        self.stats = stats
+        self.args = args
+        self.rng = rng
+        self.username = f"{args.prefix}_user{index:07d}"
+        self.headers: Dict[str, str] = {}
+        self.user_id = ""
+        self.guild_id = ""
+        self.objective_ids: List[str] = []
+        self.counter = 0
+
+    async def step(self, name: str, call) -> bool:
+        started = time.perf_counter()
+        error = None
+        try:
+            await call()
+        except StepFailed as e:
+            error = e.reason
+        except httpx.HTTPError as e:
+            error = type(e).__name__
+        self.stats.record(name, time.perf_counter() - started, error)
+        return error is None
+
+    async def login(self):
+        body = {"username_or_email": self.username, "password": self.args.password}
+        response = await self.client.post("/api/auth/login", json=body)
+        if response.status_code == 401:
+            check(await self.client.post("/api/auth/register", json={
+                "name": f"Load Pilot {self.username[-7:]}",
+                "username": self.username,
+                "password": self.args.password,
+                "pin": self.args.pin,
+            }))
+            response = await self.client.post("/api/auth/login", json=body)
+        login = check(response).json()
+        self.headers = {"Authorization": f"Bearer {login['access_token']}"}
+        self.user_id = login["user"]["id"]
+        # Commands run in the personal guild, where the user is super_admin
+        self.guild_id = login["user"]["guild_id"]
+
+    # Voice commands, issued the way the Wingman skill issues them
+
+    async def create_objective(self):
+        self.counter += 1
+        resource = self.rng.choice(RESOURCES)
+        amount = self.rng.choice((100, 250, 500))
+        response = check(await self.client.post("/api/objectives", headers=self.headers, json={
+            "name": f"Load {resource} run {self.counter}",
+            "description": {
+                "brief": f"Collect {amount} SCU {resource}",
+                "tactical": "",
+                "classified": "",
+                "metrics": {f"scu_{resource.lower()}": amount},
+            },
+            "categories": [],
+            "priority": self.rng.choice(("Low", "Medium", "High")),
+            "guild_id": self.guild_id,
+        }))
+        self.objective_ids = (self.objective_ids + [response.json()["id"]])[-20:]
+
+    async def report_progress(self):
+        if not self.objective_ids:
+            # Without an objective id the skill looks up recent objectives instead
+            check(await self.client.get(f"/api/guilds/{self.guild_id}/objectives/recent", headers=self.headers))
+            return
+        objective_id = self.rng.choice(self.objective_ids)
+        check(await self.client.patch(f"/api/objectives/{objective_id}/progress", headers=self.headers, json={
+            "metrics": {f"scu_{self.rng.choice(RESOURCES).lower()}": self.rng.randint(10, 100)},
+        }))
+
+    async def get_my_tasks(self):
+        check(await self.client.get("/api/tasks", headers=self.headers, params={"guild_id": self.guild_id}))
+
+    async def get_guild_status(self):
+        params = {"guild_id": self.guild_id}
+        check(await self.client.get("/api/objectives", headers=self.headers, params=params))
+        check(await self.client.get("/api/tasks", headers=self.headers, params=params))
+
+    async def switch_guild(self):
+        guilds = check(await self.client.get("/api/admin/guilds", headers=self.headers)).json()
+        target = self.rng.choice(guilds)["id"]
+        path = f"/api/users/{self.user_id}/switch-guild"
+        check(await self.client.patch(path, headers=self.headers, json={"guild_id": target}))
+        if target != self.guild_id:
+            check(await self.client.patch(path, headers=self.headers, json={"guild_id": self.guild_id}))
+
+    # Dashboard polling
+
+    async def poll_objectives(self):
+        check(await self.client.get("/api/objectives", headers=self.headers, params={"guild_id": self.guild_id}))
+
+    async def poll_admin_users(self):
+        check(await self.client.get("/api/admin/users", headers=self.headers, params={"guild_id": self.guild_id}))
+
+    async def voice_loop(self, deadline: float):
+        names, weights = zip(*VOICE_MIX.items())
+        while time.monotonic() < deadline:
+            name = self.rng.choices(names, weights)[0]
+            await self.step(f"voice.{name}", getattr(self, name))
+            await asyncio.sleep(min(self.rng.expovariate(1 / self.args.think_time), max(0.0, deadline - time.monotonic())))
+
+    async def dashboard_loop(self, deadline: float):
+        # Tabs are opened at different moments, so polls do not line up
+        await asyncio.sleep(self.rng.uniform(0, self.args.poll_interval))
+        while time.monotonic() < deadline:
+            await self.step("dashboard.objectives", self.poll_objectives)
+            await self.step("dashboard.admin_users", self.poll_admin_users)
+            await asyncio.sleep(self.args.poll_interval)
+
+    async def run(self, start_delay: float, deadline: float):
+        await asyncio.sleep(start_delay)
+        if not await self.step("login", self.login):
+            return
+        await asyncio.gather(self.voice_loop(deadline), self.dashboard_loop(deadline))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Replay Wingman and dashboard traffic against a running server")
+    parser.add_argument("--url", default="http://localhost:8000", help="Server base URL")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users")
+    parser.add_argument("--ramp", type=float, default=10, help="Seconds over which virtual users start")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds at full concurrency after the ramp")
+    parser.add_argument("--think-time", type=float, default=3, help="Mean seconds between voice commands")
+    parser.add_argument("--poll-interval", type=float, default=5, help="Seconds between dashboard polls")
+    parser.add_argument("--timeout", type=float, default=10, help="Per-request timeout in seconds (the skill uses 10)")
+    parser.add_argument("--prefix", default="gen", help="Username prefix, as in generate_data.py")
+    parser.add_argument("--first-user", type=int, default=1, help="Number of the first user to log in as")
+    parser.add_argument("--password", default="generated-password", help="Password of the load-test users")
+    parser.add_argument("--pin", default="123456", help="PIN for users that have to be registered")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the command mix")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    return parser
+
+
+async def run_load_test(args, transport: Optional[httpx.AsyncBaseTransport] = None) -> Dict[str, Any]:
+    """Run the configured load and return {"elapsed_s", "total", "steps"}."""
+    stats = LoadStats()
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits, transport=transport) as client:
+        started = time.monotonic()
+        deadline = started + args.ramp + args.duration
+        users = [
+            VirtualUser(client, stats, args.first_user + i, args, random.Random(args.seed * 100003 + i))
+            for i in range(args.concurrency)
+        ]
+        await asyncio.gather(*(
+            user.run(i * args.ramp / args.concurrency, deadline) for i, user in enumerate(users)
+        ))
+        elapsed = time.monotonic() - started
+
+    steps = stats.summary(elapsed)
+    requests = sum(s["requests"] for s in steps.values())
+    errors = sum(s["errors"] for s in steps.values())
+    return {
+        "elapsed_s": round(elapsed, 1),
+        "total": {"requests": requests, "rps": round(requests / elapsed, 2), "errors": errors},
+        "steps": steps,
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"{'step':<26}{'count':>8}{'rps':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'err %':>7}")
+    print("-" * 85)
+    for name, s in report["steps"].items():
+        print(f"{name:<26}{s['requests']:>8}{s['rps']:>8}{s['p50_ms']:>9}{s['p95_ms']:>9}"
+              f"{s['p99_ms']:>9}{s['max_ms']:>9}{s['error_rate'] * 100:>7.1f}")
+    total = report["total"]
+    print("-" * 85)
+    print(f"{total['requests']} steps in {report['elapsed_s']}s ({total['rps']}/s), {total['errors']} errors")
+
+    failing = {name: s["error_breakdown"] for name, s in report["steps"].items() if s["errors"]}
+    if failing:
+        print("\nErrors:")
+        for name, breakdown in failing.items():
+            print(f"  {name}: " + ", ".join(f"{reason} x{n}" for reason, n in breakdown.items()))
+
+
+def main():
+    args = build_parser().parse_args()
+
+    print(f"Load testing {args.url}: {args.concurrency} users, {args.ramp:g}s ramp, {args.duration:g}s steady")
+    report = asyncio.run(run_load_test(args))
+    print()
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -62,4 +62,14 @@ def test_user_data():
         "id": "user_1",
         "name": "Test Pilot",
         "guild_id": "guild_1"
-    }
\ No newline at end of file
+    }
+
+@pytest.fixture
+def assert_max_queries():
+    """Context manager failing the test if the wrapped block runs more than n SQL statements
+
+    Usage: with assert_max_queries(3): await client.get(...)
+    """
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+    from app.core.query_recorder import assert_max_queries as _assert_max_queries
+    return _assert_max_queries
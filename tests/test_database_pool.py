@@ -0,0 +1,59 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Unit tests for the engine factory and pool metrics
+
+import sys
+import os
+
+import pytest
+from sqlalchemy import exc, text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core import database
+from app.core.config import PoolSettings
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    """Pool settings for a tiny pool, and an empty engine registry"""
+    pool_settings = PoolSettings(db_pool_size=1, db_max_overflow=0, db_pool_timeout=0.05, db_pool_pre_ping=False)
+    monkeypatch.setattr(database, "get_pool_settings", lambda: pool_settings)
+    monkeypatch.setattr(database, "_engines", {})
+    return pool_settings
+
+
+def test_engine_uses_configured_pool(settings):
+    engine = database.create_db_engine("sqlite://", name="test")
+
+    assert isinstance(engine.pool, database.TimedQueuePool)
+    assert engine.pool.size() == 1
+    assert engine.pool.timeout() == 0.05
+
+
+def test_statement_timeout_is_passed_to_the_driver(settings, monkeypatch):
+    captured = {}
+    monkeypatch.setattr(database, "create_engine", lambda url, **kw: captured.update(kw))
+    settings.db_statement_timeout_ms = 5000
+
+    database.create_db_engine("postgresql://localhost/test")
+
+    assert captured["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+
+def test_pool_stats_report_checkouts_and_timeouts(settings):
+    engine = database.create_db_engine("sqlite://", name="test")
+
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+        busy = database.pool_stats()["test"]
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    stats = database.pool_stats()["test"]
+    assert busy["checked_out"] == 1
+    assert stats["checked_out"] == 0 and stats["idle"] == 1
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["max_wait_ms"] >= 50
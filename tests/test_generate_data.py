@@ -0,0 +1,58 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Synthetic data generator (scripts/generate_data.py): row building only, no database.
+
+import sys
+import os
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import generate_data
+
+
+def _generate(seed: int, guilds: int = 30):
+    args = generate_data.build_parser().parse_args(["--seed", str(seed), "--users-per-guild", "10"])
+    generator = generate_data.Generator(args, "password-hash", "pin-hash")
+    for index in range(guilds):
+        generator.shared_guild(index)
+    return generator
+
+
+def test_same_seed_gives_same_rows():
+    first, second = _generate(7), _generate(7)
+
+    for table in generate_data.TABLES:
+        ids = lambda g: [row[0] for row in g.rows[table]]
+        assert ids(first) == ids(second), table
+    assert [row[0] for row in _generate(8).rows["users"]] != [row[0] for row in first.rows["users"]]
+
+
+def test_rows_reference_generated_parents():
+    generator = _generate(3)
+    rows = generator.rows
+    guild_ids = {row[0] for row in rows["guilds"]}
+    user_ids = {row[0] for row in rows["users"]}
+    rank_ids = {row[0] for row in rows["ranks"]}
+
+    assert all(row[1] in guild_ids and row[7] in rank_ids and row[8] in guild_ids for row in rows["users"])
+    assert all(row[1] in user_ids and row[2] in guild_ids for row in rows["guild_requests"])
+    assert all(row[1] in user_ids for row in rows["user_sessions"])
+    assert {creator for _, creator in generator.guild_creators} <= user_ids
+    assert len(generator.guild_creators) == len(guild_ids)
+
+    # One request per user and guild, and every user holds at least their personal membership
+    pairs = [(row[1], row[2]) for row in rows["guild_requests"]]
+    assert len(pairs) == len(set(pairs))
+    approved = {row[1] for row in rows["guild_requests"] if row[3] == "approved"}
+    assert approved == user_ids
+
+
+def test_copy_rendering():
+    member = uuid.UUID(int=1)
+    assert generate_data._pg(None) is None
+    assert generate_data._pg(True) == "t"
+    assert generate_data._pg([member]) == "{" + str(member) + "}"
+    assert generate_data._pg({"metrics": {}}) == '{"metrics": {}}'
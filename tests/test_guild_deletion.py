@@ -0,0 +1,174 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Unit tests for the batched background guild deletion
+
+import sys
+import os
+import uuid
+from unittest.mock import Mock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.core.models import Base
+from app.api.utils import guild_deletion
+
+
+class FakeSession:
+    """Stands in for AsyncSessionLocal(); counts commits and keeps the saved progress"""
+    commits = 0
+    saved = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        FakeSession.saved.append(statement.compile().params)
+        return Mock(rowcount=1)
+
+    async def commit(self):
+        FakeSession.commits += 1
+
+
+def test_steps_delete_children_before_parents():
+    order = [name for name, _, _ in guild_deletion.PURGE_STEPS]
+    # Steps that clear referencing rows other than their own table
+    handled_by = {
+        "objectives": {"objectives", "tasks", "objective_categories_junction"},
+        "users.current_guild": {"users.current_guild_id"},
+        "users.home_guild": {"users.guild_id"},
+        "users.rank": {"users.rank"},
+        "users.squad": {"users.squad_id"},
+    }
+
+    def done_by(table):
+        handled = set()
+        for name in order[:order.index(table) + 1]:
+            handled |= handled_by.get(name, {name})
+        return handled
+
+    for table in (name for name in order if name in Base.metadata.tables):
+        for child in Base.metadata.tables.values():
+            for fk in child.foreign_keys:
+                if fk.column.table.name != table or child.name == table:
+                    continue
+                reference = f"users.{fk.parent.name}" if child.name == "users" else child.name
+                assert reference in done_by(table), f"{reference} must be cleared before {table}"
+
+
+@pytest.mark.asyncio
+async def test_batched_steps_repeat_until_an_empty_batch(monkeypatch):
+    remaining = {"big": 7, "once": 3}
+
+    def consume(name):
+        async def step(db, guild_id, limit):
+            taken = min(limit, remaining[name])
+            remaining[name] -= taken
+            return taken
+        return step
+
+    monkeypatch.setattr(guild_deletion, "AsyncSessionLocal", FakeSession)
+    monkeypatch.setattr(guild_deletion, "PURGE_STEPS", [
+        ("big", consume("big"), True),
+        ("once", consume("once"), False),
+    ])
+    FakeSession.commits = 0
+    FakeSession.saved = []
+
+    deleted = await guild_deletion.purge_guild(uuid.uuid4(), batch_size=3)
+
+    assert deleted == {"big": 7, "once": 3}
+    # 3 + 3 + 1 + 0 for the batched step, one statement for the other
+    assert FakeSession.commits == 5
+
+
+@pytest.mark.asyncio
+async def test_member_batches_only_pick_rows_the_update_changes():
+    executed = []
+
+    class RecordingSession:
+        async def execute(self, statement):
+            executed.append(str(statement.compile(dialect=asyncpg.dialect())))
+            return Mock(rowcount=0)
+
+    await guild_deletion._move_current_members(RecordingSession(), uuid.uuid4(), 10)
+    await guild_deletion._move_home_members(RecordingSession(), uuid.uuid4(), 10)
+
+    # Otherwise a batch of unchanged rows would repeat forever
+    current_batch = executed[0].split("IN (SELECT", 1)[1]
+    assert "users.guild_id !=" in current_batch
+    home_batch = executed[1].split("IN (SELECT", 1)[1].split("LIMIT", 1)[0]
+    assert "guilds.creator_id = users.id" in home_batch
+    assert "guilds.is_solo" in home_batch and "guilds.id !=" in home_batch
+
+
+class CaptureSession:
+    """Records statements instead of running them"""
+
+    def __init__(self):
+        self.info = {}
+        self.statements = []
+
+    async def scalar(self, statement, execution_options=None):
+        self.statements.append(statement)
+        return None
+
+
+@pytest.mark.asyncio
+async def test_deletion_is_one_job_per_guild():
+    db = CaptureSession()
+    guild_id = uuid.uuid4()
+
+    await guild_deletion.start_guild_deletion(db, guild_id, uuid.uuid4())
+
+    upsert, lookup = db.statements
+    params = upsert.compile().params
+    assert params["kind"] == "guild.delete"
+    assert params["key"] == f"guild.delete:{guild_id}"
+    assert params["payload"] == {"guild_id": str(guild_id)}
+    # The key is taken, so the existing job is returned
+    assert lookup.compile().params["key_1"] == f"guild.delete:{guild_id}"
+
+
+@pytest.mark.asyncio
+async def test_deletion_job_reports_rows_deleted(monkeypatch):
+    purged = []
+
+    async def purge(guild_id):
+        purged.append(guild_id)
+        return {"guilds": 1}
+
+    monkeypatch.setattr(guild_deletion, "purge_guild", purge)
+    guild_id = uuid.uuid4()
+
+    assert await guild_deletion._delete_guild_job({"guild_id": str(guild_id)}) == {"guilds": 1}
+    assert purged == [guild_id]
+
+
+@pytest.mark.asyncio
+async def test_progress_is_saved_to_the_job_with_each_batch(monkeypatch):
+    async def step(db, guild_id, limit):
+        return 2
+
+    monkeypatch.setattr(guild_deletion, "AsyncSessionLocal", FakeSession)
+    monkeypatch.setattr(guild_deletion, "PURGE_STEPS", [
+        ("tasks", step, False),
+        ("guilds", step, False),
+    ])
+    FakeSession.saved = []
+    guild_id = uuid.uuid4()
+
+    await guild_deletion.purge_guild(guild_id)
+
+    assert [params["result"] for params in FakeSession.saved] == [
+        {"tasks": 2},
+        {"tasks": 2, "guilds": 2},
+    ]
+    assert all(params["key_1"] == f"guild.delete:{guild_id}" for params in FakeSession.saved)
@@ -0,0 +1,148 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Unit tests for the per-guild Server-Sent Events stream
+
+import sys
+import os
+import json
+import uuid
+from itertools import count
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.api.utils import events
+from app.api.utils.permissions import EffectivePermissions
+from app.core.models import Objective
+
+
+def received(subscription):
+    payloads = []
+    while not subscription.queue.empty():
+        payloads.append(subscription.queue.get_nowait())
+    return payloads
+
+
+def test_events_are_sent_with_one_statement_at_commit():
+    db = Mock(info={})
+    guild_id = uuid.uuid4()
+    objective = Objective(id=uuid.uuid4(), guild_id=guild_id, name="Mine Gold", allowed_ranks=[])
+    events.publish_objective_event(db, "objective.created", objective)
+    events.publish_event(db, guild_id, "task.assigned", {"id": "t1"})
+
+    session = Mock(info=db.info)
+    events._send_pending_events(session)
+
+    session.execute.assert_called_once()
+    payloads = session.execute.call_args.args[1]["payloads"]
+    assert [json.loads(p)["type"] for p in payloads] == ["objective.created", "task.assigned"]
+
+    # Nothing is left for a later commit, and a rollback drops queued events
+    events._send_pending_events(session)
+    assert session.execute.call_count == 1
+    events.publish_event(db, guild_id, "task.assigned", {"id": "t2"})
+    events._discard_pending_events(session)
+    assert events._PENDING_KEY not in db.info
+
+
+@pytest.mark.asyncio
+async def test_subscribers_only_see_objectives_their_rank_allows():
+    hub = events.GuildEventHub()
+    guild_id, captain, pilot = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    members = EffectivePermissions(["view_objectives"])
+
+    def subscribe(rank, permissions=members):
+        subscription = events.Subscription(guild_id, uuid.uuid4(), rank, permissions)
+        hub._subscriptions[subscription.guild_id].add(subscription)
+        return subscription
+
+    captains, pilots, unranked = subscribe(captain), subscribe(pilot), subscribe(None)
+    admin = subscribe(pilot, EffectivePermissions(is_super_admin=True))
+    other_guild = events.Subscription(uuid.uuid4(), uuid.uuid4(), captain, members)
+    hub._subscriptions[other_guild.guild_id].add(other_guild)
+
+    db = Mock(info={})
+    objective = Objective(id=uuid.uuid4(), guild_id=guild_id, name="Op", allowed_ranks=[captain])
+    events.publish_objective_event(db, "objective.updated", objective, previous_allowed_ranks=[pilot])
+    events.publish_event(db, guild_id, "guild_request.created", {"id": "r1"}, requires="manage_users")
+    for payload in db.info[events._PENDING_KEY]:
+        hub.dispatch(events.encode_event(payload))
+
+    assert [p["type"] for p in received(captains)] == ["objective.updated"]
+    # Pilots could see it before the change; they only learn it is gone
+    assert received(pilots) == [{
+        "type": "objective.hidden", "guild_id": str(guild_id),
+        "at": db.info[events._PENDING_KEY][0]["at"], "data": {"id": str(objective.id)},
+    }]
+    assert received(unranked) == []
+    admin_events = received(admin)
+    assert [p["type"] for p in admin_events] == ["objective.updated", "guild_request.created"]
+    assert "allowed_ranks" not in admin_events[0]
+    assert received(other_guild) == []
+
+
+@pytest.mark.asyncio
+async def test_slow_client_is_told_to_resync(monkeypatch):
+    monkeypatch.setattr(events, "GUILD_EVENT_QUEUE_SIZE", 2)
+    hub = events.GuildEventHub()
+    guild_id = uuid.uuid4()
+    subscription = events.Subscription(guild_id, uuid.uuid4(), None, EffectivePermissions())
+    hub._subscriptions[subscription.guild_id].add(subscription)
+
+    for n in range(3):
+        hub.dispatch(json.dumps({"type": "guild_request.approved", "guild_id": str(guild_id), "data": {"id": n}}))
+
+    async def connected():
+        return False
+
+    chunks = [chunk async for chunk in events.event_stream(subscription, connected, hub)]
+
+    assert chunks[0].startswith("retry:")
+    assert chunks[1].startswith("event: resync\n")
+    assert len(chunks) == 2
+    assert not hub._subscriptions
+
+
+@pytest.mark.asyncio
+async def test_stream_follows_access_changes_and_ends_when_access_is_lost(monkeypatch):
+    monkeypatch.setattr(events, "GUILD_EVENT_KEEPALIVE_SECONDS", 0.01)
+    # Every check finds the interval elapsed
+    ticks = count()
+    monkeypatch.setattr(events, "time", SimpleNamespace(monotonic=lambda: next(ticks)))
+    hub = events.GuildEventHub()
+    guild_id, captain = uuid.uuid4(), uuid.uuid4()
+    subscription = events.Subscription(guild_id, uuid.uuid4(), None, EffectivePermissions(["view_objectives"]))
+    hub._subscriptions[subscription.guild_id].add(subscription)
+
+    # Promoted to captain, then removed from the guild
+    answers = [(captain, EffectivePermissions(["view_objectives", "manage_users"])), None]
+    seen_ranks = []
+
+    async def check(checked):
+        seen_ranks.append(checked.rank)
+        return answers.pop(0)
+
+    async def connected():
+        return False
+
+    chunks = [chunk async for chunk in events.event_stream(subscription, connected, hub, check)]
+
+    assert seen_ranks == [None, str(captain)]
+    assert subscription.permissions.allows("manage_users")
+    assert chunks[1] == ": keepalive\n\n"
+    assert chunks[2].startswith("event: access_revoked\n")
+    assert len(chunks) == 3
+    assert not hub._subscriptions
+
+
+def test_oversized_events_keep_only_the_id():
+    payload = {"type": "objective.progress", "guild_id": "g", "data": {"id": "o1", "progress": {"note": "x" * 9000}}}
+
+    encoded = json.loads(events.encode_event(payload))
+
+    assert encoded["data"] == {"id": "o1"}
+    assert encoded["truncated"] is True
@@ -0,0 +1,79 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Guild bootstrap templates: one precompiled statement per template, ids bound per guild.
+
+import sys
+import os
+import uuid
+
+import pytest
+from sqlalchemy.dialects.postgresql import asyncpg
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.api.utils.guild_templates import (
+    DEFAULT_GUILD_TEMPLATE,
+    GuildTemplate,
+    get_guild_template,
+    register_guild_template,
+)
+
+GUILD = {
+    "id": uuid.uuid4(),
+    "name": "Test Guild",
+    "creator_id": None,
+    "member_limit": 2,
+    "billing_tier": "free",
+    "is_solo": False,
+    "is_active": True,
+    "is_deletable": True,
+    "type": "game_star_citizen",
+}
+
+
+def test_default_template_is_one_statement():
+    sql = str(DEFAULT_GUILD_TEMPLATE.statement.compile(dialect=asyncpg.dialect()))
+
+    assert sql.count("INSERT INTO") == 4
+    for table in ("guilds", "access_levels", "ranks", "ai_commanders"):
+        assert f"INSERT INTO {table} " in sql
+    assert "objective_categories" not in sql
+
+
+def test_parameters_bind_fresh_ids_consistently():
+    params, ids = DEFAULT_GUILD_TEMPLATE.parameters(GUILD)
+    _, other_ids = DEFAULT_GUILD_TEMPLATE.parameters(GUILD)
+
+    assert params["guild_id"] == GUILD["id"]
+    assert set(ids["access_levels"]) == {
+        "view_guilds", "manage_guilds", "objectives", "manage_rbac", "view_ranks", "manage_ranks", "super_admin",
+    }
+    assert ids["creator_access"] == ids["access_levels"]["super_admin"]
+    assert ids["creator_rank"] == ids["ranks"]["CO"] == params["rank_0"]
+    assert ids["access_levels"]["super_admin"] not in params["rank_0_access_levels"]
+    assert set(params["rank_0_access_levels"]) < set(ids["access_levels"].values())
+    assert not set(ids["access_levels"].values()) & set(other_ids["access_levels"].values())
+
+    compiled = DEFAULT_GUILD_TEMPLATE.statement.compile(dialect=asyncpg.dialect())
+    assert set(params) <= set(compiled.construct_params(params))
+
+
+def test_guild_type_variants():
+    variant = GuildTemplate(
+        access_levels=[("member", ["view_guilds"]), ("owner", ["manage_guilds"])],
+        ranks=[("Captain", None, 1, ["owner"]), ("Crew", None, 2, ["member"])],
+        categories=[("Racing", "Race events")],
+        creator_access="owner",
+    )
+    register_guild_template("test_racing_league", variant)
+
+    assert get_guild_template("test_racing_league") is variant
+    assert get_guild_template("unknown_type") is DEFAULT_GUILD_TEMPLATE
+    assert "INSERT INTO objective_categories " in str(variant.statement.compile(dialect=asyncpg.dialect()))
+    _, ids = variant.parameters(GUILD)
+    assert ids["creator_rank"] == ids["ranks"]["Captain"]
+    assert ids["ai_commander"] is None
+
+    with pytest.raises(ValueError):
+        GuildTemplate(access_levels=[("member", [])], ranks=[("Crew", None, 1, ["missing"])], creator_access="member")
@@ -0,0 +1,43 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Unit tests for pooled bcrypt hashing
+
+import sys
+import os
+import asyncio
+
+import bcrypt
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.api.utils import hashing
+
+
+def test_hash_uses_configured_cost(monkeypatch):
+    monkeypatch.setattr(hashing, "BCRYPT_ROUNDS", 4)
+    hashed = hashing.hash_secret("123456")
+    assert hashed.startswith("$2b$04$")
+    assert hashing.verify_secret("123456", hashed)
+    assert not hashing.verify_secret("654321", hashed)
+
+
+def test_needs_rehash_only_for_lower_cost(monkeypatch):
+    old = bcrypt.hashpw(b"password123", bcrypt.gensalt(rounds=4)).decode('utf-8')
+    monkeypatch.setattr(hashing, "BCRYPT_ROUNDS", 5)
+    assert hashing.needs_rehash(old)
+    monkeypatch.setattr(hashing, "BCRYPT_ROUNDS", 4)
+    assert not hashing.needs_rehash(old)
+    assert not hashing.needs_rehash("not-a-bcrypt-hash")
+
+
+def test_run_hashing_runs_off_loop_and_tracks_depth(monkeypatch):
+    monkeypatch.setattr(hashing, "BCRYPT_ROUNDS", 4)
+
+    async def main():
+        results = await asyncio.gather(*(hashing.run_hashing(hashing.hash_secret, "pw") for _ in range(3)))
+        return results
+
+    results = asyncio.run(main())
+    assert all(hashing.verify_secret("pw", hashed) for hashed in results)
+    assert hashing.hashing_stats()["in_flight"] == 0
@@ -0,0 +1,99 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Unit tests for the in-process background job runner
+
+import sys
+import os
+import asyncio
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.core import jobs
+
+
+def test_retry_delay_backs_off_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(jobs.random, "uniform", lambda low, high: high)
+    monkeypatch.setattr(jobs, "JOB_RETRY_BASE_DELAY", 5)
+    monkeypatch.setattr(jobs, "JOB_RETRY_MAX_DELAY", 60)
+
+    assert [jobs.retry_delay(n) for n in range(1, 6)] == [5, 10, 20, 40, 60]
+
+
+def test_failed_attempts_retry_until_max_attempts():
+    now = datetime.utcnow()
+
+    retry = jobs.job_outcome(2, 3, "boom", now)
+    assert retry["status"] == jobs.PENDING and retry["run_at"] > now
+    assert jobs.job_outcome(3, 3, "boom", now)["status"] == jobs.FAILED
+    assert jobs.job_outcome(3, 3, None, now)["status"] == jobs.COMPLETED
+
+
+def test_claim_skips_jobs_locked_by_other_workers():
+    sql = str(jobs.claim_statement(datetime.utcnow()).compile(dialect=asyncpg.dialect()))
+
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "RETURNING jobs.id" in sql
+
+
+@pytest.mark.asyncio
+async def test_enqueue_requires_a_registered_handler():
+    with pytest.raises(ValueError):
+        await jobs.enqueue(None, "no.such.job")
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_jobs_and_retries_failures(monkeypatch):
+    queue = [
+        SimpleNamespace(id=uuid.uuid4(), kind="test.flaky", payload={"n": 1}, attempts=0, max_attempts=3, locked_at=None),
+        SimpleNamespace(id=uuid.uuid4(), kind="test.flaky", payload={"n": 2}, attempts=0, max_attempts=3, locked_at=None),
+    ]
+    finished = {}
+    calls = []
+
+    async def claim_job():
+        if not queue:
+            return None
+        job = queue.pop(0)
+        job.attempts += 1
+        return job
+
+    async def finish_job(job, result=None, error=None):
+        outcome = jobs.job_outcome(job.attempts, job.max_attempts, error, datetime.utcnow())
+        if outcome["status"] == jobs.PENDING:
+            queue.append(job)
+        else:
+            finished[job.payload["n"]] = (outcome["status"], result, job.attempts)
+
+    monkeypatch.setattr(jobs, "_handlers", dict(jobs._handlers))
+
+    @jobs.job_handler("test.flaky", max_attempts=3)
+    async def flaky(payload):
+        calls.append(payload["n"])
+        if payload["n"] == 2 and calls.count(2) < 2:
+            raise RuntimeError("lock timeout")
+        return {"n": payload["n"]}
+
+    monkeypatch.setattr(jobs, "claim_job", claim_job)
+    monkeypatch.setattr(jobs, "finish_job", finish_job)
+    monkeypatch.setattr(jobs, "HANDLER_MODULES", ())
+
+    worker = jobs.JobWorker(concurrency=2, poll_interval=0.01)
+    worker.start()
+    for _ in range(100):
+        if len(finished) == 2:
+            break
+        await asyncio.sleep(0.01)
+    await worker.stop()
+
+    assert finished == {
+        1: (jobs.COMPLETED, {"n": 1}, 1),
+        2: (jobs.COMPLETED, {"n": 2}, 2),
+    }
@@ -0,0 +1,37 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Importing the models and the app must not need a database
+
+import sys
+import os
+import subprocess
+
+PROJECT_ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+
+def run_python(code):
+    # Unroutable host: any connection attempt would hang until the timeout
+    env = dict(os.environ, DB_HOST="10.255.255.1", DB_PASS=os.environ.get("DB_PASS", "password"))
+    return subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, env=env,
+        capture_output=True, text=True, timeout=30,
+    )
+
+
+def test_models_import_creates_no_engine():
+    result = run_python(
+        "import app.core.models as m\n"
+        "assert m._engine is None and m._async_engine is None\n"
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_sessions_bind_lazily():
+    result = run_python(
+        "import app.core.models as m\n"
+        "session = m.AsyncSessionLocal()\n"
+        "assert session.bind is m.get_async_engine()\n"
+        "assert m._engine is None\n"
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,75 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Load test harness (scripts/load_test.py): statistics and the virtual user flow
+# against an in-memory transport, so no server is needed.
+
+import sys
+import os
+import json
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import load_test
+
+
+def test_summary_reports_percentiles_and_error_breakdown():
+    stats = load_test.LoadStats()
+    for ms in range(1, 101):
+        stats.record("voice.get_my_tasks", ms / 1000, "HTTP 503" if ms > 98 else None)
+    stats.record("voice.get_my_tasks", 0.5, "ReadTimeout")
+
+    summary = stats.summary(elapsed=10)["voice.get_my_tasks"]
+
+    assert summary["requests"] == 101
+    assert summary["rps"] == 10.1
+    assert summary["p50_ms"] == 51.0
+    assert summary["max_ms"] == 500.0
+    assert summary["errors"] == 3
+    assert summary["error_breakdown"] == {"HTTP 503": 2, "ReadTimeout": 1}
+
+
+@pytest.mark.asyncio
+async def test_virtual_users_register_and_replay_the_mix():
+    registered = set()
+
+    def server(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/api/auth/login":
+            username = json.loads(request.content)["username_or_email"]
+            if username not in registered:
+                return httpx.Response(401, json={"detail": "Invalid credentials"})
+            return httpx.Response(200, json={
+                "access_token": "token",
+                "user": {"id": f"user-{username}", "guild_id": f"guild-{username}"},
+            })
+        if path == "/api/auth/register":
+            registered.add(json.loads(request.content)["username"])
+            return httpx.Response(201, json={})
+        if path == "/api/objectives" and request.method == "POST":
+            return httpx.Response(200, json={"id": "objective-1"})
+        if path == "/api/admin/guilds":
+            return httpx.Response(200, json=[{"id": "guild-other"}])
+        if path == "/api/admin/users":
+            return httpx.Response(503, json={"detail": "busy"})
+        return httpx.Response(200, json=[])
+
+    args = load_test.build_parser().parse_args([
+        "--concurrency", "3", "--ramp", "0.1", "--duration", "0.3",
+        "--think-time", "0.01", "--poll-interval", "0.05",
+    ])
+    report = await load_test.run_load_test(args, transport=httpx.MockTransport(server))
+    steps = report["steps"]
+
+    assert registered == {"gen_user0000001", "gen_user0000002", "gen_user0000003"}
+    assert steps["login"]["requests"] == 3 and steps["login"]["errors"] == 0
+    assert any(name.startswith("voice.") for name in steps)
+    assert steps["dashboard.objectives"]["errors"] == 0
+    assert steps["dashboard.admin_users"]["error_breakdown"] == {
+        "HTTP 503": steps["dashboard.admin_users"]["requests"]
+    }
+    assert report["total"]["requests"] == sum(s["requests"] for s in steps.values())
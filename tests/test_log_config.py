@@ -0,0 +1,48 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Unit tests for logging filters and formatters
+
+import sys
+import os
+import json
+import logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.log_config import DebugRateLimitFilter, JsonFormatter, RequestIdFilter, _parse_levels, request_id_var
+
+
+def make_record(level=logging.DEBUG, name="app.api.routes", msg="Join request start: user_id=%s", args=("u1",)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_debug_records_are_rate_limited_per_logger():
+    limiter = DebugRateLimitFilter(per_second=2)
+    passed = [limiter.filter(make_record()) for _ in range(5)]
+
+    assert passed == [True, True, False, False, False]
+    assert limiter.filter(make_record(name="app.api.middleware"))
+    assert limiter.filter(make_record(level=logging.WARNING))
+    assert limiter.dropped == 3
+
+
+def test_json_formatter_includes_request_id():
+    record = make_record(level=logging.INFO)
+    token = request_id_var.set("req-42")
+    try:
+        RequestIdFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "Join request start: user_id=u1"
+    assert entry["request_id"] == "req-42"
+    assert entry["level"] == "INFO"
+
+
+def test_parse_levels():
+    assert _parse_levels("app.api=debug, sqlalchemy.engine=WARNING,,bad") == {
+        "app.api": "DEBUG",
+        "sqlalchemy.engine": "WARNING",
+    }
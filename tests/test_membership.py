@@ -0,0 +1,129 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Unit tests for the maintained guild/user membership counters
+
+import sys
+import os
+import uuid
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy.orm.attributes import set_committed_value
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.models import GuildRequest
+from app.api.utils import membership
+
+
+@pytest.fixture
+def applied(monkeypatch):
+    """Capture the counter deltas instead of writing them"""
+    calls = []
+    monkeypatch.setattr(membership, "_apply_deltas", lambda session, guilds, users: calls.append((guilds, users)))
+    return calls
+
+
+def loaded_request(status):
+    """A GuildRequest as if read from the database with the given status"""
+    request = GuildRequest()
+    for key, value in (("id", uuid.uuid4()), ("user_id", uuid.uuid4()), ("guild_id", uuid.uuid4()), ("status", status)):
+        set_committed_value(request, key, value)
+    return request
+
+
+def flush(new=(), dirty=(), deleted=()):
+    session = Mock(new=list(new), dirty=list(dirty), deleted=list(deleted))
+    membership._track_membership_changes(session, None)
+
+
+def test_new_approved_request_counts_once(applied):
+    request = GuildRequest(id=uuid.uuid4(), user_id=uuid.uuid4(), guild_id=uuid.uuid4(), status="approved")
+    flush(new=[request])
+    assert applied == [({request.guild_id: 1}, {request.user_id: 1})]
+
+
+def test_pending_request_is_not_counted(applied):
+    flush(new=[GuildRequest(id=uuid.uuid4(), user_id=uuid.uuid4(), guild_id=uuid.uuid4(), status="pending")])
+    assert applied == []
+
+
+def test_approval_and_revocation_adjust_counters(applied):
+    approving = loaded_request("pending")
+    approving.status = "approved"
+    denying = loaded_request("approved")
+    denying.status = "denied"
+
+    flush(dirty=[approving, denying])
+    guilds, users = applied[0]
+    assert guilds == {approving.guild_id: 1, denying.guild_id: -1}
+    assert users == {approving.user_id: 1, denying.user_id: -1}
+
+
+def test_deleting_approved_request_releases_membership(applied):
+    request = loaded_request("approved")
+    flush(deleted=[request, loaded_request("denied")])
+    assert applied == [({request.guild_id: -1}, {request.user_id: -1})]
+
+
+def test_unrelated_update_leaves_counters_alone(applied):
+    request = loaded_request("approved")
+    request.updated_at = None
+    flush(dirty=[request])
+    assert applied == []
+
+
+class KickSession:
+    """Returns the kicked user, then their personal guild, then the given memberships"""
+
+    def __init__(self, user, personal_guild, memberships):
+        self.rows = [user, personal_guild]
+        self.memberships = memberships
+        self.deleted = []
+        self.committed = False
+
+    async def scalar(self, stmt):
+        return self.rows.pop(0)
+
+    async def scalars(self, stmt):
+        return Mock(all=Mock(return_value=self.memberships))
+
+    async def delete(self, row):
+        self.deleted.append(row)
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_kick_only_removes_members_of_the_admins_guild():
+    from fastapi import HTTPException
+    from app.core.models import Guild, User
+    from app.api.admin_routes import kick_user
+
+    admin_guild, other_guild = uuid.uuid4(), uuid.uuid4()
+    admin = User(id=uuid.uuid4(), current_guild_id=admin_guild)
+
+    def target(current_guild_id):
+        user = User(id=uuid.uuid4(), current_guild_id=current_guild_id)
+        return user, Guild(id=uuid.uuid4(), name="Solo", creator_id=user.id, is_solo=True)
+
+    # Not a member of the admin's guild: refused, nothing deleted
+    user, personal = target(other_guild)
+    db = KickSession(user, personal, [])
+    with pytest.raises(HTTPException) as refused:
+        await kick_user(str(user.id), {}, current_user=admin, db=db)
+    assert refused.value.status_code == 403
+    assert db.deleted == [] and not db.committed
+
+    # A member working elsewhere loses the membership but keeps their current guild
+    user, personal = target(other_guild)
+    membership_row = loaded_request("approved")
+    db = KickSession(user, personal, [membership_row])
+    await kick_user(str(user.id), {}, current_user=admin, db=db)
+    assert db.deleted == [membership_row] and db.committed
+    assert user.current_guild_id == other_guild
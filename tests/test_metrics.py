@@ -0,0 +1,65 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Unit tests for request and SQL metrics
+
+import sys
+import os
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core import metrics
+from app.api.middleware import MetricsMiddleware
+
+
+def sample(name, **labels):
+    """Value of one sample line from the rendered metrics"""
+    label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    prefix = f"{name}{{{label_text}}} " if labels else f"{name} "
+    for line in metrics.render_metrics().splitlines():
+        if line.startswith(prefix):
+            return float(line[len(prefix):])
+    return None
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram("test_latency_seconds", "Test.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value, "/x")
+
+    assert sample("test_latency_seconds_bucket", route="/x", le="0.1") == 1
+    assert sample("test_latency_seconds_bucket", route="/x", le="1") == 2
+    assert sample("test_latency_seconds_bucket", route="/x", le="+Inf") == 3
+    assert sample("test_latency_seconds_count", route="/x") == 3
+    assert sample("test_latency_seconds_sum", route="/x") == 5.55
+
+
+@pytest.mark.asyncio
+async def test_requests_are_labelled_by_route_template_with_sql_usage():
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: str):
+        with engine.connect() as conn:
+            conn.execute(text("select 1"))
+            conn.execute(text("select 2"))
+        return {"id": item_id}
+
+    app.add_middleware(MetricsMiddleware)
+    labels = {"method": "GET", "route": "/items/{item_id}"}
+    before = sample("http_request_db_statements_sum", **labels) or 0
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/items/1")).status_code == 200
+        assert (await client.get("/missing")).status_code == 404
+
+    assert sample("http_requests_total", **labels, status="200") >= 1
+    assert sample("http_request_db_statements_sum", **labels) - before == 2
+    assert sample("http_requests_total", method="GET", route="unmatched", status="404") >= 1
+    assert sample("http_requests_in_flight", method="GET") == 0
@@ -0,0 +1,107 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Unit tests for the ASGI guild limit middleware
+
+import sys
+import os
+import json
+import uuid
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.api import middleware
+from app.api.middleware import GuildLimitMiddleware
+
+
+class DownstreamApp:
+    """Records what reaches the application"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, scope, receive, send):
+        message = await receive()
+        self.calls.append((scope["path"], message.get("body", b"")))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def call(app, method, path, body=b""):
+    scope = {"type": "http", "method": method, "path": path, "headers": [], "query_string": b""}
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent[0]["status"], b"".join(m.get("body", b"") for m in sent[1:])
+
+
+class FakeSession:
+    def __init__(self, row=None, scalar=0):
+        self.execute = AsyncMock(return_value=Mock(first=Mock(return_value=row)))
+        self.scalar = AsyncMock(return_value=scalar)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def session(monkeypatch):
+    holder = {"session": FakeSession(), "opened": 0}
+
+    def open_session():
+        holder["opened"] += 1
+        return holder["session"]
+
+    user = Mock(id=uuid.uuid4(), max_guilds=3, approved_guild_count=1)
+    monkeypatch.setattr(middleware, "AsyncSessionLocal", open_session)
+    monkeypatch.setattr(middleware, "get_request_user", AsyncMock(return_value=user))
+    return holder
+
+
+@pytest.mark.asyncio
+async def test_unlimited_routes_pass_through_without_a_session(session):
+    app = DownstreamApp()
+    status, body = await call(GuildLimitMiddleware(app), "GET", "/api/objectives")
+
+    assert status == 200 and body == b"ok"
+    assert session["opened"] == 0
+
+
+@pytest.mark.asyncio
+async def test_join_body_is_replayed_to_the_application(session):
+    session["session"] = FakeSession(row=Mock(found_guild_id=uuid.uuid4(), member_limit=5, approved_member_count=1))
+    app = DownstreamApp()
+    payload = json.dumps({"invite_code": "abc"}).encode()
+
+    status, _ = await call(GuildLimitMiddleware(app), "POST", f"/api/users/{uuid.uuid4()}/join", payload)
+
+    assert status == 200
+    assert app.calls[0][1] == payload
+    assert session["opened"] == 1
+    assert session["session"].execute.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_full_guild_returns_payment_required(session):
+    session["session"] = FakeSession(row=Mock(found_guild_id=uuid.uuid4(), member_limit=2, approved_member_count=2))
+    app = DownstreamApp()
+    payload = json.dumps({"invite_code": "abc"}).encode()
+
+    status, body = await call(GuildLimitMiddleware(app), "POST", f"/api/users/{uuid.uuid4()}/join", payload)
+
+    assert status == 402
+    assert "member limit (2/2)" in json.loads(body)["message"]
+    assert app.calls == []
@@ -0,0 +1,155 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Unit tests for the shared objective query builder, serializers and task cascade
+
+import sys
+import os
+import uuid
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.core.models import AsyncSessionLocal, Guild, Objective, ObjectiveCategory, Rank
+from app.api.utils.objectives import (
+    load_categories,
+    load_objectives,
+    objective_query,
+    serialize_objective,
+    serialize_objective_summary,
+    update_tasks_on_objective_progress,
+)
+
+
+class CountingSession:
+    """Stands in for AsyncSession, returning canned rows and counting round trips"""
+
+    def __init__(self, objectives=(), rank_rows=(), categories=()):
+        self.objectives = list(objectives)
+        self.rank_rows = list(rank_rows)
+        self.categories = list(categories)
+        self.queries = 0
+
+    async def scalars(self, stmt):
+        self.queries += 1
+        rows = self.objectives if stmt.column_descriptions[0]["entity"] is Objective else self.categories
+        return Mock(all=Mock(return_value=rows))
+
+    async def execute(self, stmt):
+        self.queries += 1
+        return iter(self.rank_rows)
+
+
+def make_objectives(count, guild_id, rank_id):
+    category = ObjectiveCategory(id=uuid.uuid4(), guild_id=guild_id, name="Mining")
+    return [
+        Objective(
+            id=uuid.uuid4(),
+            guild_id=guild_id,
+            name=f"Objective {i}",
+            allowed_ranks=[rank_id, uuid.uuid4()],
+            categories=[category],
+        )
+        for i in range(count)
+    ]
+
+
+def test_objective_query_eager_loads_categories():
+    options = objective_query()._with_options
+    assert any("categories" in str(option.path) for option in options)
+
+
+async def seed_objectives(db, count):
+    """Flush a guild with a rank and ``count`` objectives in two categories each"""
+    guild = Guild(id=uuid.uuid4(), name=f"Query count {count}")
+    db.add(guild)
+    await db.flush()
+    rank = Rank(id=uuid.uuid4(), guild_id=guild.id, name="Captain", hierarchy_level=1)
+    categories = [ObjectiveCategory(id=uuid.uuid4(), guild_id=guild.id, name=name) for name in ("Mining", "Combat")]
+    db.add_all([rank, *categories])
+    db.add_all(
+        Objective(id=uuid.uuid4(), guild_id=guild.id, name=f"Objective {i}", allowed_ranks=[rank.id], categories=categories)
+        for i in range(count)
+    )
+    await db.flush()
+    # Nothing may be served from the identity map below
+    db.expunge_all()
+    return guild.id
+
+
+@pytest.mark.asyncio
+async def test_query_count_is_constant_as_results_grow(assert_max_queries):
+    # Runs against the configured PostgreSQL database; nothing is committed
+    counts = []
+    async with AsyncSessionLocal() as db:
+        for size in (1, 25):
+            guild_id = await seed_objectives(db, size)
+            # Objectives, their categories, the rank names
+            with assert_max_queries(3) as recorder:
+                objectives, rank_names = await load_objectives(db, objective_query(Objective.guild_id == guild_id))
+                summaries = [serialize_objective_summary(obj, rank_names) for obj in objectives]
+                records = [serialize_objective(obj) for obj in objectives]
+            assert len(summaries) == len(records) == size
+            assert all(len(summary["categories"]) == 2 for summary in summaries)
+            assert all(summary["allowed_ranks"] == ["Captain"] for summary in summaries)
+            counts.append(recorder.count)
+        await db.rollback()
+
+    assert counts[0] == counts[1]
+
+
+@pytest.mark.asyncio
+async def test_summary_resolves_rank_names_and_drops_missing_ranks():
+    guild_id, rank_id = uuid.uuid4(), uuid.uuid4()
+    db = CountingSession(make_objectives(1, guild_id, rank_id), [(rank_id, "Captain")])
+
+    objectives, rank_names = await load_objectives(db, objective_query())
+    summary = serialize_objective_summary(objectives[0], rank_names)
+
+    assert summary["allowed_ranks"] == ["Captain"]
+    assert summary["allowed_rank_ids"] == [str(rank_id)]
+    assert summary["categories"] == [str(objectives[0].categories[0].id)]
+
+
+@pytest.mark.asyncio
+async def test_categories_resolved_by_id_or_name_in_one_query():
+    guild_id = uuid.uuid4()
+    mining = ObjectiveCategory(id=uuid.uuid4(), guild_id=guild_id, name="Mining")
+    combat = ObjectiveCategory(id=uuid.uuid4(), guild_id=guild_id, name="Combat")
+    db = CountingSession(categories=[mining, combat])
+
+    resolved = await load_categories(db, guild_id, ["Combat", str(mining.id), "Unknown"])
+    assert resolved == [combat, mining]
+    assert db.queries == 1
+
+    obj = Objective(id=uuid.uuid4(), guild_id=guild_id, name="Op", categories=resolved)
+    assert serialize_objective(obj)["categories"] == [str(combat.id), str(mining.id)]
+
+
+@pytest.mark.asyncio
+async def test_task_cascade_is_one_statement():
+    db = Mock(execute=AsyncMock(return_value=Mock(rowcount=300)))
+    objective = Objective(id=uuid.uuid4(), progress={"status": "completed"})
+
+    assert await update_tasks_on_objective_progress(db, objective) == 300
+    assert db.execute.await_count == 1
+    statement = db.execute.await_args.args[0].compile(dialect=asyncpg.dialect())
+    assert str(statement).startswith("UPDATE tasks SET")
+    assert "|| jsonb_build_object" in str(statement)
+    assert statement.params["status"] == "Completed"
+    assert statement.params["objective_id_1"] == objective.id
+
+
+@pytest.mark.asyncio
+async def test_task_cascade_skips_active_objectives():
+    db = Mock(execute=AsyncMock())
+
+    for progress in ({"status": "active"}, {}, None):
+        objective = Objective(id=uuid.uuid4(), progress=progress)
+        assert await update_tasks_on_objective_progress(db, objective) == 0
+    db.execute.assert_not_awaited()
+
@@ -0,0 +1,61 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Unit tests for keyset pagination of list endpoints
+
+import sys
+import os
+import uuid
+from unittest.mock import Mock
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.models import Rank
+from app.api.utils.pagination import (
+    NEXT_CURSOR_HEADER,
+    PageParams,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def test_cursor_round_trip():
+    key = uuid.uuid4()
+    assert decode_cursor(encode_cursor(key)) == key
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        PageParams(cursor="not-a-cursor", limit=10)
+    assert exc.value.status_code == 400
+
+
+def test_apply_continues_after_cursor_with_look_ahead_row():
+    last = uuid.uuid4()
+    page = PageParams(cursor=encode_cursor(last), limit=10)
+
+    stmt = page.apply(select(Rank), Rank.id).compile(dialect=postgresql.dialect())
+    sql = str(stmt)
+    assert "ranks.id >" in sql
+    assert "ORDER BY ranks.id" in sql
+    assert stmt.params["param_1"] == 11
+    assert last in stmt.params.values()
+
+
+def test_finish_sets_next_cursor_only_when_more_rows_exist():
+    rows = [Mock(id=uuid.uuid4()) for _ in range(3)]
+
+    response = Response()
+    page = PageParams(cursor=None, limit=2)
+    assert page.finish(rows, response) == rows[:2]
+    assert decode_cursor(response.headers[NEXT_CURSOR_HEADER]) == rows[1].id
+
+    response = Response()
+    page = PageParams(cursor=None, limit=3)
+    assert page.finish(rows, response) == rows
+    assert NEXT_CURSOR_HEADER not in response.headers
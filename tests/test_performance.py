@@ -1,64 +1,55 @@
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
-
-from api.src.wingman_skill_poc import WingmanSkill
-import time
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
 
-print('Running Wingman-AI Skill Performance Test...')
-print('=' * 50)
+# Endpoint benchmarks (scripts/benchmark_api.py) and their reporting helpers.
+# The benchmark itself needs a seeded PostgreSQL and only runs with RUN_BENCHMARKS=1.
 
-skill = WingmanSkill()
-test_commands = [
-    'Create objective: Collect 500 SCU Gold',
-    'Assign task Scout Route to Pilot X',
-    'Delivered 100 SCU Gold',
-    'Schedule task for 20 minutes now'
-]
-
-latencies = []
-accuracies = []
+import sys
+import os
+import json
 
-for i, command in enumerate(test_commands):
-    print(f'Test {i+1}: {command}')
+import pytest
 
-    start_time = time.time()
-    result = skill.handle_voice_command(command)
-    end_time = time.time()
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
 
-    latency = end_time - start_time
-    latencies.append(latency)
+import benchmark_api
 
-    print('.3f')
 
-    has_response = 'response' in result and result['response']
-    accuracies.append(1 if has_response else 0)
+def test_percentile_uses_nearest_rank():
+    samples = list(range(1, 101))
+    assert benchmark_api.percentile(samples, 50) == 50
+    assert benchmark_api.percentile(samples, 95) == 95
+    assert benchmark_api.percentile(samples, 99) == 99
+    assert benchmark_api.percentile([7.0], 99) == 7.0
 
-    response_text = result.get('response', 'No response')
-    print(f'  Response: {response_text[:50]}...')
-    print()
 
-avg_latency = sum(latencies) / len(latencies)
-max_latency = max(latencies)
-accuracy = (sum(accuracies) / len(accuracies)) * 100
+def test_compare_flags_query_and_latency_regressions():
+    baseline = {
+        "objectives.list": {"p95_ms": 10.0, "queries": 4, "errors": 0},
+        "tasks.list": {"p95_ms": 10.0, "queries": 3, "errors": 0},
+    }
+    results = {
+        "objectives.list": {"p95_ms": 11.0, "queries": 6, "errors": 0},
+        "tasks.list": {"p95_ms": 20.0, "queries": 3, "errors": 0},
+        "admin.users": {"p95_ms": 50.0, "queries": 9, "errors": 0},
+    }
 
-print('Performance Results:')
-print('.3f')
-print('.3f')
-print('.1f')
+    regressions = benchmark_api.compare(results, baseline, tolerance=0.25)
 
-latency_ok = avg_latency < 2.0 and max_latency < 2.0
-accuracy_ok = accuracy >= 90.0
+    assert regressions == [
+        "objectives.list: 6 queries per request (baseline 4)",
+        "tasks.list: p95 20.0ms (baseline 10.0ms)",
+    ]
 
-print('\nRequirements Check:')
-print(f'  Latency < 2s: {"✓" if latency_ok else "✗"}')
-print(f'  Accuracy >= 90%: {"✓" if accuracy_ok else "✗"}')
 
-if latency_ok and accuracy_ok:
-    print('\n🎉 All requirements met!')
-else:
-    print('\n⚠️ Some requirements not met')
+@pytest.mark.skipif(os.getenv("RUN_BENCHMARKS") != "1", reason="set RUN_BENCHMARKS=1 with a seeded database")
+@pytest.mark.asyncio
+async def test_endpoints_within_baseline():
+    results = await benchmark_api.run_benchmark(iterations=int(os.getenv("BENCHMARK_ITERATIONS", "30")))
+    assert all(r["errors"] == 0 for r in results.values()), results
 
-print('\nSample Voice Commands Tested:')
-for cmd in test_commands:
-    print(f'  - "{cmd}"')
+    if os.path.exists(benchmark_api.BASELINE_PATH):
+        with open(benchmark_api.BASELINE_PATH) as f:
+            baseline = json.load(f)
+        assert benchmark_api.compare(results, baseline, tolerance=0.5) == []
@@ -0,0 +1,176 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Unit tests for the shared effective-permission resolver
+
+import sys
+import os
+import uuid
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import delete
+
+from app.api.utils import permissions
+from app.api.utils.permissions import (
+    EffectivePermissions,
+    decode_permission_claims,
+    encode_permission_claims,
+    get_effective_permissions,
+    invalidate_permission_cache,
+    remember_token_claims,
+)
+from app.core.models import Rank, Task, UserAccess
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    invalidate_permission_cache()
+    yield
+    invalidate_permission_cache()
+
+
+@pytest.fixture
+def load_counter(monkeypatch):
+    """Replace the database loader with a counting stub"""
+    calls = []
+
+    async def fake_load(user, db):
+        calls.append(user.id)
+        return EffectivePermissions(["view_objectives"], is_super_admin=False)
+
+    monkeypatch.setattr(permissions, "_load_permissions", fake_load)
+    return calls
+
+
+def test_allows_checks_action_set():
+    perms = EffectivePermissions(["view_objectives", "create_objective"])
+    assert perms.allows("view_objectives")
+    assert not perms.allows("manage_ranks")
+    assert perms.allows_all(["view_objectives", "create_objective"])
+    assert not perms.allows_all(["view_objectives", "manage_ranks"])
+
+
+def test_super_admin_allows_everything_but_grants_nothing_explicitly():
+    perms = EffectivePermissions([], is_super_admin=True)
+    assert perms.allows("manage_ranks")
+    assert perms.allows_all(["manage_ranks", "manage_users"])
+    assert not perms.grants_any(["manage_prompts"])
+
+
+@pytest.mark.asyncio
+async def test_permissions_are_cached_per_user_and_rank(load_counter):
+    user = Mock(id=uuid.uuid4(), rank=uuid.uuid4())
+
+    await get_effective_permissions(user, Mock(info={}))
+    await get_effective_permissions(user, Mock(info={}))
+    assert len(load_counter) == 1
+
+    # A rank change must not reuse the previous grants
+    user.rank = uuid.uuid4()
+    await get_effective_permissions(user, Mock(info={}))
+    assert len(load_counter) == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidation_forces_reload(load_counter):
+    user = Mock(id=uuid.uuid4(), rank=None)
+
+    await get_effective_permissions(user, Mock(info={}))
+    invalidate_permission_cache()
+    await get_effective_permissions(user, Mock(info={}))
+    assert len(load_counter) == 2
+
+
+@pytest.mark.asyncio
+async def test_commit_of_rbac_change_clears_cache(load_counter):
+    user = Mock(id=uuid.uuid4(), rank=None)
+    await get_effective_permissions(user, Mock(info={}))
+
+    session = Mock(info={permissions._PENDING_KEY: True})
+    permissions._invalidate_after_commit(session)
+
+    await get_effective_permissions(user, Mock(info={}))
+    assert len(load_counter) == 2
+
+
+def test_claims_round_trip_including_custom_actions():
+    user = Mock(id=uuid.uuid4(), rank=uuid.uuid4())
+    guild_id = str(uuid.uuid4())
+    perms = EffectivePermissions(["view_objectives", "manage_ranks", "custom_action"], True, {guild_id: 4})
+
+    claims = encode_permission_claims(user, perms)
+    assert claims["x"] == ["custom_action"]
+    assert claims["rk"] == str(user.rank)
+
+    decoded = decode_permission_claims(claims)
+    assert decoded.actions == perms.actions
+    assert decoded.is_super_admin
+    assert decoded.guild_versions == {guild_id: 4}
+
+
+@pytest.mark.asyncio
+async def test_token_claims_used_without_loading_grants(load_counter):
+    user = Mock(id=uuid.uuid4(), rank=None)
+    db = Mock(info={})
+    claims = encode_permission_claims(user, EffectivePermissions(["manage_users"]))
+    remember_token_claims(db, user, {"sub": str(user.id), "perm": claims})
+
+    assert (await get_effective_permissions(user, db)).allows("manage_users")
+    assert load_counter == []
+
+
+@pytest.mark.asyncio
+async def test_token_claims_ignored_after_rank_change(load_counter):
+    user = Mock(id=uuid.uuid4(), rank=uuid.uuid4())
+    db = Mock(info={})
+    claims = encode_permission_claims(user, EffectivePermissions(["manage_users"]))
+    remember_token_claims(db, user, {"sub": str(user.id), "perm": claims})
+
+    user.rank = uuid.uuid4()
+    assert not (await get_effective_permissions(user, db)).allows("manage_users")
+    assert len(load_counter) == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_token_reloads_and_replaces_cached_grants(load_counter):
+    user = Mock(id=uuid.uuid4(), rank=None)
+    guild_id = uuid.uuid4()
+    # Cached by a process that had not yet seen the RBAC change either
+    permissions._permission_cache.set((user.id, user.rank), EffectivePermissions(["manage_users"]))
+    claims = encode_permission_claims(user, EffectivePermissions(["manage_users"], guild_versions={str(guild_id): 1}))
+
+    db = Mock(info={})
+    db.execute = AsyncMock(return_value=Mock(all=Mock(return_value=[(guild_id, 2)])))
+    remember_token_claims(db, user, {"sub": str(user.id), "perm": claims})
+
+    assert not (await get_effective_permissions(user, db)).allows("manage_users")
+    assert len(load_counter) == 1
+    assert not permissions._permission_cache.get((user.id, user.rank)).allows("manage_users")
+
+
+def test_bulk_rbac_statements_bump_the_named_guilds():
+    guild_id = uuid.uuid4()
+
+    def execute(statement, **options):
+        session = Mock(info={})
+        state = Mock(is_update=False, is_delete=True, is_insert=False, session=session,
+                     statement=statement, execution_options=options)
+        permissions._track_bulk_rbac_changes(state)
+        return session
+
+    # ORM and Core statements alike must say which guilds' grants they change
+    for statement in (delete(Rank).where(Rank.guild_id == guild_id), delete(UserAccess.__table__)):
+        with pytest.raises(ValueError):
+            execute(statement)
+
+    session = execute(delete(Rank).where(Rank.guild_id == guild_id), permission_guild_ids=[guild_id])
+    assert session.info[permissions._PENDING_KEY] is True
+    bump = session.connection().execute.call_args.args[0]
+    assert "permission_version" in str(bump)
+
+    # Other tables are left alone
+    assert execute(delete(Task)).info == {}
@@ -0,0 +1,56 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Unit tests for the N+1 query recorder
+
+import sys
+import os
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.query_recorder import fingerprint, record_queries, warn_on_repeats
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("create table items (id integer primary key, name text)"))
+    return engine
+
+
+def test_fingerprint_ignores_values():
+    assert fingerprint("SELECT * FROM items WHERE id = %(id_1)s") == fingerprint("SELECT *  FROM items\nWHERE id = $1")
+    assert fingerprint("SELECT * FROM items WHERE name = 'a' LIMIT 5") == "SELECT * FROM items WHERE name = ? LIMIT ?"
+    assert fingerprint("SELECT * FROM items WHERE id IN ($1, $2, $3)") == "SELECT * FROM items WHERE id IN (...)"
+    assert fingerprint("SELECT id::text FROM items") == "SELECT id::text FROM items"
+
+
+def test_repeated_shapes_are_reported(engine, caplog):
+    with engine.connect() as conn, record_queries() as recorder:
+        for i in range(4):
+            conn.execute(text("select name from items where id = :id"), {"id": i})
+        conn.execute(text("select count(*) from items"))
+
+    assert recorder.count == 5
+    assert recorder.repeated(3) == [("select name from items where id = ?", 4)]
+
+    with caplog.at_level(logging.WARNING):
+        warn_on_repeats(recorder, 3, "GET /items")
+    assert "Possible N+1 in GET /items: statement ran 4 times" in caplog.text
+
+
+def test_assert_max_queries(engine, assert_max_queries):
+    with engine.connect() as conn:
+        with assert_max_queries(2):
+            conn.execute(text("select 1"))
+            conn.execute(text("select 2"))
+
+        with pytest.raises(AssertionError, match="at most 1 queries, got 2"):
+            with assert_max_queries(1):
+                conn.execute(text("select 1"))
+                conn.execute(text("select 1"))
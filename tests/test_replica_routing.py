@@ -0,0 +1,96 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Unit tests for routing reads to the replica with read-your-writes stickiness
+
+import sys
+import os
+import time
+
+import pytest
+from starlette.requests import Request
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.api.middleware import ReadYourWritesMiddleware
+from app.core import models
+
+
+class FakeSessionmaker:
+    def __init__(self, name):
+        self.name = name
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self.name
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    monkeypatch.setattr(models, "REPLICA_ASYNC_DATABASE_URL", "postgresql+asyncpg://replica/test")
+    monkeypatch.setattr(models, "ReplicaSessionLocal", FakeSessionmaker("replica"))
+    monkeypatch.setattr(models, "AsyncSessionLocal", FakeSessionmaker("primary"))
+    monkeypatch.setattr(models, "REPLICA_STICKY_SECONDS", 60)
+
+
+def make_request(method, headers=()):
+    headers = [(name.lower().encode(), value.encode()) for name, value in headers]
+    return Request({"type": "http", "method": method, "path": "/", "headers": headers, "client": ("10.0.0.1", 1)})
+
+
+async def session_for(request):
+    dependency = models.get_async_db(request)
+    db = await dependency.__anext__()
+    await dependency.aclose()
+    return db
+
+
+async def write_response_headers(method="PATCH"):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await ReadYourWritesMiddleware(app)({"type": "http", "method": method}, None, send)
+    return {name.decode(): value.decode() for name, value in sent[0]["headers"]}
+
+
+@pytest.mark.asyncio
+async def test_reads_use_replica_and_writes_use_primary(replica):
+    assert await session_for(make_request("GET")) == "replica"
+    assert await session_for(make_request("POST")) == "primary"
+
+
+@pytest.mark.asyncio
+async def test_reads_stick_to_primary_after_a_write(replica):
+    headers = await write_response_headers()
+    until = headers[models.READ_PRIMARY_HEADER.lower()]
+    assert float(until) > time.time() + 50
+    assert headers["set-cookie"].startswith(f"{models.READ_PRIMARY_COOKIE}={until}; Max-Age=60;")
+
+    # The marker comes back as a cookie (browsers) or header, whichever process serves the read
+    assert await session_for(make_request("GET", [("Cookie", f"{models.READ_PRIMARY_COOKIE}={until}")])) == "primary"
+    assert await session_for(make_request("GET", [(models.READ_PRIMARY_HEADER, until)])) == "primary"
+    assert await session_for(make_request("GET")) == "replica"
+
+
+@pytest.mark.asyncio
+async def test_expired_or_malformed_markers_read_from_replica(replica):
+    assert await session_for(make_request("GET", [(models.READ_PRIMARY_HEADER, str(time.time() - 1))])) == "replica"
+    assert await session_for(make_request("GET", [(models.READ_PRIMARY_HEADER, "soon")])) == "replica"
+    assert await write_response_headers("GET") == {}
+
+
+@pytest.mark.asyncio
+async def test_without_replica_everything_uses_primary(replica, monkeypatch):
+    monkeypatch.setattr(models, "REPLICA_ASYNC_DATABASE_URL", None)
+    assert await session_for(make_request("GET")) == "primary"
+    assert await write_response_headers() == {}
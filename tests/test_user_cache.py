@@ -0,0 +1,96 @@
+# Copyright 2025 Federico Arce. All Rights Reserved.
+# Confidential - Do Not Distribute Without Permission.
+
+# Unit tests for the authenticated-user row cache
+
+import sys
+import os
+import uuid
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.api.utils import user_cache
+from app.api.utils.user_cache import invalidate_user_cache, load_user_row
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    invalidate_user_cache()
+    yield
+    invalidate_user_cache()
+
+
+def make_db(user):
+    db = Mock()
+    db.scalar = AsyncMock(return_value=user)
+    return db
+
+
+def make_user():
+    user = Mock()
+    for key in user_cache._USER_COLUMNS + tuple(user_cache._SECRET_COLUMNS):
+        setattr(user, key, None)
+    user.id = uuid.uuid4()
+    user.max_guilds = 3
+    return user
+
+
+@pytest.mark.asyncio
+async def test_row_is_loaded_once():
+    user = make_user()
+    db = make_db(user)
+
+    first = await load_user_row(db, user.id)
+    second = await load_user_row(db, user.id)
+    assert first == second
+    assert first["max_guilds"] == 3
+    assert db.scalar.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_secrets_are_never_cached():
+    user = make_user()
+    user.password, user.pin, user.totp_secret = "$2b$hash", "$2b$pin", "BASE32SECRET"
+
+    row = await load_user_row(make_db(user), user.id)
+    assert not user_cache._SECRET_COLUMNS & row.keys()
+
+
+@pytest.mark.asyncio
+async def test_rows_expire_so_other_processes_writes_are_seen(monkeypatch):
+    monkeypatch.setattr(user_cache, "_user_cache", user_cache.TTLCache(ttl=0))
+    user = make_user()
+    db = make_db(user)
+
+    await load_user_row(db, user.id)
+    await load_user_row(db, user.id)
+    assert db.scalar.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_commit_of_changed_user_drops_row():
+    user = make_user()
+    db = make_db(user)
+    await load_user_row(db, user.id)
+
+    session = Mock(info={user_cache._CHANGED_KEY: {user.id}})
+    user_cache._invalidate_users_after_commit(session)
+
+    await load_user_row(db, user.id)
+    assert db.scalar.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_user_update_clears_everything():
+    user = make_user()
+    db = make_db(user)
+    await load_user_row(db, user.id)
+
+    session = Mock(info={user_cache._CHANGED_KEY: None})
+    user_cache._invalidate_users_after_commit(session)
+
+    await load_user_row(db, user.id)
+    assert db.scalar.await_count == 2
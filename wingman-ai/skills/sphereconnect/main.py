@@ -14,6 +14,11 @@ from skills.skill_base import Skill
 if TYPE_CHECKING:
     from wingmen.open_ai_wingman import OpenAiWingman
 
+# Set by SphereConnect list endpoints when another page follows
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+# Set on responses to writes; echoed so our reads stay on the primary database
+READ_PRIMARY_HEADER = "X-Read-Primary-Until"
+
 
 class SphereConnect(Skill):
     """Skill for Star Citizen guild coordination via SphereConnect API."""
@@ -29,6 +34,7 @@ class SphereConnect(Skill):
         self.max_retries = 3
         self.retry_delay = 2
         self.default_guild_id = "00000000-0000-0000-0000-000000000000"
+        self.read_primary_until = None
 
         super().__init__(config=config, settings=settings, wingman=wingman)
 
@@ -450,6 +456,9 @@ class SphereConnect(Skill):
                         "Content-Type": "application/json",
                         "Accept": "application/json",
                     }
+                    # Read our own writes: each request opens a new session, so no cookie carries this
+                    if self.read_primary_until:
+                        headers[READ_PRIMARY_HEADER] = self.read_primary_until
 
                     # Debug logging for request details
                     if self.settings.debug_mode:
@@ -474,6 +483,9 @@ class SphereConnect(Skill):
 
                         response.raise_for_status()
 
+                        if READ_PRIMARY_HEADER in response.headers:
+                            self.read_primary_until = response.headers[READ_PRIMARY_HEADER]
+
                         response_text = await response.text()
 
                         if self.settings.debug_mode:
@@ -482,6 +494,11 @@ class SphereConnect(Skill):
                                 color=LogType.INFO,
                             )
 
+                        # List endpoints are paged; collect every page
+                        next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+                        if method == "GET" and next_cursor:
+                            return await self._fetch_remaining_pages(session, url, headers, response_text, next_cursor)
+
                         if response.headers.get("Content-Type", "").startswith("application/json"):
                             return response_text
                         else:
@@ -500,6 +517,23 @@ class SphereConnect(Skill):
             except Exception as e:
                 return f"Error: Unexpected error with SphereConnect API request: {e}"
 
+    async def _fetch_remaining_pages(
+        self, session: aiohttp.ClientSession, url: str, headers: Dict[str, str], first_page: str, cursor: str
+    ) -> str:
+        """Follow X-Next-Cursor until the last page and return all items as one JSON array."""
+        items = json.loads(first_page)
+        separator = "&" if "?" in url else "?"
+        while cursor:
+            async with session.get(
+                f"{url}{separator}cursor={cursor}",
+                headers=headers,
+                timeout=self.request_timeout,
+            ) as response:
+                response.raise_for_status()
+                items.extend(await response.json())
+                cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        return json.dumps(items)
+
     async def execute_tool(
         self, tool_name: str, parameters: Dict[str, Any], benchmark: Benchmark
     ) -> Tuple[str, str]: